@@ -0,0 +1,275 @@
+"""
+OpenAI istek hız sınırlayıcı ve yeniden deneme zamanlayıcısı
+Dakikadaki istek (RPM) ve token (TPM) sınırları iki token kovasıyla izlenir;
+istekler gönderilmeden önce kovadan pay alır, böylece toplu çalışmada 429
+fırtınası oluşmaz. Bekleyen istekler öncelik sırasıyla geçer: etkileşimli
+istekler toplu isteklerin önüne geçer.
+
+429, zaman aşımı, bağlantı ve 5xx hatalarında istek Retry-After başlığına uyularak,
+yoksa rastgele (jitter) üstel bekleme ile tekrar denenir. Retry-After gelirse
+sınırlayıcı tüm istekler için o süre durdurulur.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import olcum
+
+T = TypeVar('T')
+
+# gpt-4o-mini için varsayılan sınırlar (OPENAI_RPM / OPENAI_TPM ile değiştirilebilir)
+DEFAULT_RPM = 500
+DEFAULT_TPM = 200000
+
+# Küçük değer önce geçer
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+DEFAULT_MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+# Kuyruğun başında olmayan async bekleyicilerin yoklama aralığı (saniye)
+_QUEUE_POLL = 0.05
+
+RETRY_STATUS = {408, 409, 429}
+
+
+class TokenBucket:
+    """Dakikada rate_per_minute birim dolan, en fazla capacity birim tutan kova (kilitsiz; RateLimiter kilitler)"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """amount birim alınabilmesi için beklenmesi gereken süre (saniye)"""
+        self._refill(now)
+        # Kapasiteden büyük istekler kova dolunca geçer
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        """
+        Args:
+            rpm: Dakikadaki en fazla istek (varsayılan: OPENAI_RPM veya 500)
+            tpm: Dakikadaki en fazla token, istem + max_tokens (varsayılan: OPENAI_TPM veya 200000)
+        """
+        self.rpm = float(rpm or os.getenv('OPENAI_RPM') or DEFAULT_RPM)
+        self.tpm = float(tpm or os.getenv('OPENAI_TPM') or DEFAULT_TPM)
+        self.requests = TokenBucket(self.rpm)
+        self.tokens = TokenBucket(self.tpm)
+        self.paused_until = 0.0
+        self.waited = 0.0
+        self.retries = 0
+        self._queue = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+
+    def _delay(self, tokens: float) -> float:
+        now = time.monotonic()
+        return max(self.paused_until - now, self.requests.delay(1, now), self.tokens.delay(tokens, now))
+
+    def _try_take(self, ticket, tokens: float) -> Optional[float]:
+        """Sıra bu biletteyse ve kovalar yeterliyse payı alır (None); değilse beklenecek süre"""
+        if self._queue[0] != ticket:
+            return _QUEUE_POLL
+        delay = self._delay(tokens)
+        if delay <= 0:
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            return None
+        return delay
+
+    def _leave(self, ticket):
+        self._queue.remove(ticket)
+        heapq.heapify(self._queue)
+        self._cond.notify_all()
+
+    def acquire(self, tokens: float, priority: int = PRIORITY_INTERACTIVE):
+        """
+        İstek için RPM ve TPM payı alınana kadar bekler
+
+        Args:
+            tokens: İsteğin tahmini token sayısı
+            priority: Küçük değer önce geçer (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+        """
+        started = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._order))
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    delay = self._try_take(ticket, tokens)
+                    if delay is None:
+                        break
+                    # Sıra başka biletteyse o çıkınca notify_all ile uyanılır
+                    self._cond.wait(delay if self._queue[0] == ticket else None)
+            finally:
+                self._leave(ticket)
+                self.waited += time.monotonic() - started
+
+    async def acquire_async(self, tokens: float, priority: int = PRIORITY_INTERACTIVE):
+        """acquire'ın event loop'u bloklamayan sürümü (aynı kuyruğu paylaşır)"""
+        started = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._order))
+            heapq.heappush(self._queue, ticket)
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_take(ticket, tokens)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+        finally:
+            with self._cond:
+                self._leave(ticket)
+                self.waited += time.monotonic() - started
+
+    def pause(self, seconds: float):
+        """Tüm istekleri en az seconds saniye durdurur (Retry-After)"""
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def record_retry(self):
+        with self._cond:
+            self.retries += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Sınırlar, kuyrukta bekleme süresi ve tekrar deneme sayısı"""
+        with self._cond:
+            return {
+                'rpm': self.rpm,
+                'tpm': self.tpm,
+                'waited_seconds': round(self.waited, 3),
+                'retries': self.retries,
+            }
+
+
+_shared_lock = threading.Lock()
+_shared: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Süreç genelinde paylaşılan sınırlayıcı (tüm analizciler aynı API sınırını paylaşır)"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = RateLimiter()
+    return _shared
+
+
+def is_retryable(error: Exception) -> bool:
+    """429, zaman aşımı, bağlantı ve sunucu hataları tekrar denenir; 400/401 gibi hatalar denenmez"""
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status in RETRY_STATUS or status >= 500
+    return type(error).__name__ in ('APITimeoutError', 'APIConnectionError', 'TimeoutError', 'ConnectionError')
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Hatadaki Retry-After (veya retry-after-ms) başlığı, saniye"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        # HTTP tarihi biçimi desteklenmez; üstel bekleme kullanılır
+        return None
+    return None
+
+
+def retry_delay(attempt: int, after: Optional[float] = None,
+                base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """
+    Tekrar denemeden önce beklenecek süre
+
+    Args:
+        attempt: Kaçıncı tekrar (0'dan başlar)
+        after: Sunucunun Retry-After değeri
+        base: Üstel beklemenin taban süresi
+        cap: En uzun bekleme
+
+    Returns:
+        Retry-After varsa ona küçük bir jitter eklenmiş süre, yoksa 0..min(cap, base*2^attempt)
+        arasında rastgele süre (full jitter)
+    """
+    if after is not None:
+        return min(cap, after) + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def call_with_retry(send: Callable[[], T], limiter: RateLimiter, tokens: float,
+                    priority: int = PRIORITY_INTERACTIVE, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                    log: Callable[[str], None] = print) -> T:
+    """
+    send'i sınırlayıcıdan pay alarak çağırır; geçici hatalarda tekrar dener
+
+    Raises:
+        Son denemenin hatası veya tekrar denenemeyen hata
+    """
+    # En az bir deneme yapılır (0 veya negatif değer None döndürmesin)
+    max_attempts = max(1, max_attempts)
+    for attempt in range(max_attempts):
+        limiter.acquire(tokens, priority)
+        try:
+            return send()
+        except Exception as e:
+            delay = _before_retry(e, attempt, max_attempts, limiter, log)
+        time.sleep(delay)
+
+
+async def call_with_retry_async(send: Callable[[], Awaitable[T]], limiter: RateLimiter, tokens: float,
+                                priority: int = PRIORITY_INTERACTIVE, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                                log: Callable[[str], None] = print) -> T:
+    """call_with_retry'ın asyncio sürümü"""
+    max_attempts = max(1, max_attempts)
+    for attempt in range(max_attempts):
+        await limiter.acquire_async(tokens, priority)
+        try:
+            return await send()
+        except Exception as e:
+            delay = _before_retry(e, attempt, max_attempts, limiter, log)
+        await asyncio.sleep(delay)
+
+
+def _before_retry(error: Exception, attempt: int, max_attempts: int, limiter: RateLimiter,
+                  log: Callable[[str], None]) -> float:
+    """Hata tekrar denenebilirse bekleme süresini döndürür, değilse hatayı yeniden fırlatır"""
+    if not is_retryable(error) or attempt + 1 >= max_attempts:
+        raise error
+
+    after = retry_after(error)
+    if after is not None:
+        limiter.pause(after)
+    delay = retry_delay(attempt, after)
+    limiter.record_retry()
+    olcum.count('ai_request', retries=1)
+    log(f"🔁 OpenAI isteği tekrar denenecek ({attempt + 1}/{max_attempts - 1}, {delay:.1f} sn): {error}")
+    return delay
@@ -0,0 +1,92 @@
+"""
+Güven kapılı AI analizi (kademeli mod)
+Yerel duygu motoru her video için zaten çalışır. Sonucu net olan videolarda
+(polarite karar eşiklerinden uzak, subjektivite düşük) OpenAI çağrısı yapılmaz;
+AI yalnızca yerel puanın belirsiz olduğu videolara gönderilir:
+
+- polarite classify_sentiment eşiklerine (±0.1 / ±0.3) margin kadar yakınsa
+- subjektivite max_subjectivity veya üzerindeyse
+- metin transkript değil başlık/açıklama yedeğiyse
+"""
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional, Sequence
+
+# classify_sentiment'in etiket sınırları
+DECISION_THRESHOLDS = (-0.3, -0.1, 0.1, 0.3)
+
+DEFAULT_MARGIN = 0.05
+DEFAULT_MAX_SUBJECTIVITY = 0.8
+
+# Kapı kararlarının nedenleri
+REASON_FALLBACK = 'fallback'
+REASON_THRESHOLD = 'threshold'
+REASON_SUBJECTIVE = 'subjective'
+
+
+class AIGate:
+    def __init__(self, margin: float = DEFAULT_MARGIN, max_subjectivity: float = DEFAULT_MAX_SUBJECTIVITY,
+                 thresholds: Sequence[float] = DECISION_THRESHOLDS, fallback: bool = True):
+        """
+        Args:
+            margin: Polarite bir eşiğe bu kadar yakınsa AI çağrılır
+            max_subjectivity: Subjektivite bu değer veya üzerindeyse AI çağrılır
+            thresholds: Karar eşikleri (varsayılan: classify_sentiment sınırları)
+            fallback: Başlık/açıklama yedeği kullanılan videolarda her zaman AI çağır
+        """
+        self.margin = margin
+        self.max_subjectivity = max_subjectivity
+        self.thresholds = tuple(thresholds)
+        self.fallback = fallback
+        self.called = 0
+        self.skipped = 0
+        self.reasons = Counter()
+        self._lock = threading.Lock()
+
+    def reason(self, sentiment: Dict[str, Any], is_fallback: bool = False) -> Optional[str]:
+        """
+        Yerel sonucun neden belirsiz sayıldığını döndürür
+
+        Args:
+            sentiment: analyze_sentiment sonucu (polarity, subjectivity)
+            is_fallback: Metin transkript yerine başlık/açıklama mı
+
+        Returns:
+            'fallback', 'threshold', 'subjective' veya sonuç netse None
+        """
+        if is_fallback and self.fallback:
+            return REASON_FALLBACK
+        polarity = sentiment['polarity']
+        if any(abs(polarity - threshold) <= self.margin for threshold in self.thresholds):
+            return REASON_THRESHOLD
+        if sentiment['subjectivity'] >= self.max_subjectivity:
+            return REASON_SUBJECTIVE
+        return None
+
+    def check(self, sentiment: Dict[str, Any], is_fallback: bool = False) -> Dict[str, Any]:
+        """
+        Kararı verir ve sayaçları günceller
+
+        Returns:
+            call (AI çağrılacak mı) ve reason alanları
+        """
+        reason = self.reason(sentiment, is_fallback)
+        with self._lock:
+            if reason is None:
+                self.skipped += 1
+            else:
+                self.called += 1
+                self.reasons[reason] += 1
+        return {'call': reason is not None, 'reason': reason}
+
+    def stats(self) -> Dict[str, Any]:
+        """Çağrılan/atlanan video sayıları ve çağrı nedenleri"""
+        with self._lock:
+            called, skipped, reasons = self.called, self.skipped, dict(self.reasons)
+        total = called + skipped
+        return {
+            'called': called,
+            'skipped': skipped,
+            'skip_rate': round(skipped / total, 3) if total else 0.0,
+            'reasons': reasons,
+        }
@@ -0,0 +1,89 @@
+"""
+OpenAI cevap önbelleği
+Aynı metin (tekrar çalıştırma, yeniden yüklenen video, ortak açıklamalar veya
+parçalanmış transkriptlerde aynı parça) tekrar gönderildiğinde API çağrısı
+yapılmaz. Anahtar; model, istem şablonu sürümü, sıcaklık ve normalize edilmiş
+metnin SHA-256 özetidir, bu yüzden istem değişince eski cevaplar kullanılmaz.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Optional
+
+from disk_cache import DiskCache
+from transcript_cache import DEFAULT_CACHE_DIR
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Unicode biçimini (NFC) ve boşlukları standartlaştırır"""
+    return _SPACE_RE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class AIResponseCache:
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 20000,
+                 max_bytes: int = 100 * 1024 * 1024, ttl: Optional[float] = 30 * 24 * 3600):
+        """
+        Args:
+            cache_dir: Önbellek klasörü (varsayılan: VIDEO_CACHE_DIR veya ~/.cache/video_duygu_analizi)
+            max_entries: En fazla cevap sayısı (aşılınca en eski kullanılanlar silinir)
+            max_bytes: Toplam boyut sınırı (byte)
+            ttl: Cevapların geçerlilik süresi (saniye)
+        """
+        self.cache_dir = cache_dir or os.getenv('VIDEO_CACHE_DIR') or DEFAULT_CACHE_DIR
+        self.store = DiskCache(
+            os.path.join(self.cache_dir, 'ai_responses.sqlite3'),
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl=ttl,
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, prompt_version: str, temperature: Optional[float], text: str) -> str:
+        """
+        İstek için önbellek anahtarı
+
+        Args:
+            model: OpenAI model adı
+            prompt_version: İstem şablonunun sürümü (şablon değişince artırılır)
+            temperature: Örnekleme sıcaklığı
+            text: Modele gönderilen metin (normalize edilir)
+
+        Returns:
+            SHA-256 özeti (hex)
+        """
+        payload = json.dumps([model, prompt_version, temperature, normalize_text(text)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Önbellekteki cevabı döndürür ve isabet/ıska sayaçlarını günceller"""
+        value = self.store.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Ayrıştırılmış cevabı önbelleğe yazar"""
+        self.store.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """İsabet, ıska, isabet oranı ve kayıt sayısı"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 3) if total else 0.0,
+            'entries': len(self.store),
+        }
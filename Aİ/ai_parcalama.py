@@ -0,0 +1,175 @@
+"""
+AI analizi için transkript parçalama
+Uzun transkriptler token bütçesine göre parçalara bölünür. Alt yazı varsa parça
+sınırları alt yazı parçalarının sınırlarına denk gelir (cümle ortasından kesilmez);
+yoksa cümle sonlarından bölünür. tiktoken kuruluysa token sayısı onunla, değilse
+karakter sayısından tahmin edilir.
+"""
+import math
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from transcript import Transcript
+
+# tiktoken yoksa kaba tahmin: İngilizce/Türkçe metinde token başına ~4 karakter
+CHARS_PER_TOKEN = 4
+
+# Parça başına hedef token sayısı (istem ve cevap için bağlamda yer kalır)
+DEFAULT_CHUNK_TOKENS = 2500
+# Çok uzun yayınlarda istek sayısını sınırlamak için parça bütçesi büyütülür
+DEFAULT_MAX_CHUNKS = 32
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?…])\s+')
+
+TokenCounter = Callable[[str], int]
+
+
+class TextChunk(NamedTuple):
+    """AI'a tek istekte gönderilecek metin parçası; zamanlar alt yazı yoksa None"""
+    text: str
+    tokens: int
+    start_ms: Optional[int]
+    end_ms: Optional[int]
+
+
+@lru_cache(maxsize=8)
+def token_counter(model: str) -> TokenCounter:
+    """
+    Model için token sayma fonksiyonu döndürür
+
+    Args:
+        model: OpenAI model adı
+
+    Returns:
+        Metnin token sayısını veren fonksiyon (tiktoken yoksa tahmini)
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return _estimate_tokens
+
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding('cl100k_base')
+    return lambda text: len(encoding.encode_ordinary(text))
+
+
+def _estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _split_long(text: str, max_tokens: int, count_tokens: TokenCounter) -> Iterator[str]:
+    """Bütçeden uzun tek bir birimi kelime sınırlarından böler"""
+    words = text.split()
+    # Kelime başına ortalama token ile parça uzunluğunu tahmin et
+    per_word = max(1, math.ceil(count_tokens(text) / max(1, len(words))))
+    step = max(1, max_tokens // per_word)
+    for start in range(0, len(words), step):
+        yield ' '.join(words[start:start + step])
+
+
+def _pack(units: Iterable[Tuple[str, Optional[int], Optional[int]]], max_tokens: int,
+          count_tokens: TokenCounter) -> List[TextChunk]:
+    """Birimleri (metin, başlangıç, bitiş) sırayla bütçeyi aşmayacak şekilde gruplar"""
+    chunks = []
+    parts: List[str] = []
+    tokens = 0
+    start = end = None
+
+    def flush():
+        nonlocal parts, tokens, start, end
+        if parts:
+            chunks.append(TextChunk(' '.join(parts), tokens, start, end))
+        parts, tokens, start, end = [], 0, None, None
+
+    for text, unit_start, unit_end in units:
+        unit_tokens = count_tokens(text)
+        if unit_tokens > max_tokens:
+            flush()
+            for piece in _split_long(text, max_tokens, count_tokens):
+                chunks.append(TextChunk(piece, count_tokens(piece), unit_start, unit_end))
+            continue
+
+        if parts and tokens + unit_tokens > max_tokens:
+            flush()
+        if not parts:
+            start = unit_start
+        parts.append(text)
+        tokens += unit_tokens
+        end = unit_end if unit_end is not None else end
+
+    flush()
+    return chunks
+
+
+def chunk_segments(segments: Transcript, max_tokens: int = DEFAULT_CHUNK_TOKENS,
+                   count_tokens: TokenCounter = _estimate_tokens) -> List[TextChunk]:
+    """Zaman damgalı transkripti alt yazı parçası sınırlarından böler"""
+    return _pack(((text, start, end) for start, end, text in segments), max_tokens, count_tokens)
+
+
+def chunk_text(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS,
+               count_tokens: TokenCounter = _estimate_tokens) -> List[TextChunk]:
+    """Düz metni cümle sonlarından böler"""
+    sentences = (sentence for sentence in _SENTENCE_RE.split(text) if sentence.strip())
+    return _pack(((sentence, None, None) for sentence in sentences), max_tokens, count_tokens)
+
+
+def plan_chunks(text: str, segments: Optional[Transcript] = None, model: str = 'gpt-3.5-turbo',
+                max_tokens: int = DEFAULT_CHUNK_TOKENS, max_chunks: int = DEFAULT_MAX_CHUNKS) -> List[TextChunk]:
+    """
+    Metni AI isteklerine bölünecek parçalara ayırır
+
+    Args:
+        text: Transkript metni
+        segments: Zaman damgalı transkript (varsa parça sınırları buna göre seçilir)
+        model: Token sayımı için model adı
+        max_tokens: Parça başına token bütçesi
+        max_chunks: En fazla parça sayısı; aşılırsa bütçe büyütülür
+
+    Returns:
+        Sıralı TextChunk listesi (kısa metinlerde tek parça)
+    """
+    count_tokens = token_counter(model)
+    total = count_tokens(text)
+    if total <= max_tokens:
+        start = segments.start_ms if segments else None
+        end = segments.end_ms if segments else None
+        return [TextChunk(text, total, start, end)]
+
+    budget = max(max_tokens, math.ceil(total / max(1, max_chunks)))
+    if segments:
+        return chunk_segments(segments, budget, count_tokens)
+    return chunk_text(text, budget, count_tokens)
+
+
+def group_by_tokens(texts: Sequence[str], max_tokens: int, max_items: int,
+                    model: str = 'gpt-3.5-turbo') -> List[List[int]]:
+    """
+    Metinleri çoklu isteklere sığacak şekilde gruplar
+
+    Args:
+        texts: Metinler
+        max_tokens: Bir istekteki metinlerin toplam token bütçesi
+        max_items: Bir istekte en fazla metin sayısı
+        model: Token sayımı için model adı
+
+    Returns:
+        Metin indekslerinden oluşan gruplar (bütçeden uzun metin tek başına kalır)
+    """
+    count_tokens = token_counter(model)
+    groups: List[List[int]] = []
+    current: List[int] = []
+    tokens = 0
+    for index, text in enumerate(texts):
+        text_tokens = count_tokens(text)
+        if current and (tokens + text_tokens > max_tokens or len(current) >= max_items):
+            groups.append(current)
+            current, tokens = [], 0
+        current.append(index)
+        tokens += text_tokens
+    if current:
+        groups.append(current)
+    return groups
@@ -3,10 +3,8 @@ AI ile soru çözme modülü
 """
 import os
 from typing import Optional
-from openai import OpenAI
-from dotenv import load_dotenv
 
-load_dotenv()
+from bagimliliklar import load_env
 
 
 class AISolver:
@@ -15,10 +13,12 @@ class AISolver:
         Args:
             api_key: OpenAI API anahtarı (opsiyonel, .env'den de alınabilir)
         """
+        load_env()
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API anahtarı bulunamadı. .env dosyasına OPENAI_API_KEY ekleyin veya parametre olarak verin.")
         
+        from openai import OpenAI
         self.client = OpenAI(api_key=self.api_key)
         self.book_content = None
     
@@ -0,0 +1,185 @@
+"""
+Yapılandırılmış AI duygu sonucu
+Model cevabı serbest metin yerine JSON şemasıyla (response_format=json_schema)
+sınırlandırılır ve AISentimentResult ile doğrulanır. Alan eksik ya da geçersizse
+sessizce "Bilinmiyor" yazılmaz, AIResultError fırlatılır.
+Çoklu mod: birden fazla metin (transkript veya parça) tek istekte, id ile
+eşleştirilerek puanlanır.
+"""
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DUYGU_VALUES = ('Pozitif', 'Negatif', 'Nötr')
+MIN_YOGUNLUK = 1
+MAX_YOGUNLUK = 10
+
+_DUYGU_ALIASES = {value.lower(): value for value in DUYGU_VALUES}
+_DUYGU_ALIASES.update({'notr': 'Nötr', 'positive': 'Pozitif', 'negative': 'Negatif', 'neutral': 'Nötr'})
+
+
+class AIResultError(ValueError):
+    """Model cevabı şemaya uymuyor"""
+
+
+@dataclass
+class AISentimentResult:
+    ruh_hali: str
+    duygu: str
+    yogunluk: int
+    aciklama: str
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'AISentimentResult':
+        """
+        Şemaya göre doğrulanmış sonuç oluşturur
+
+        Args:
+            data: Modelin JSON cevabından gelen nesne
+
+        Returns:
+            AISentimentResult
+
+        Raises:
+            AIResultError: Alan eksik veya geçersizse
+        """
+        if not isinstance(data, dict):
+            raise AIResultError(f"Sonuç nesne değil: {data!r}")
+
+        ruh_hali = data.get('ruh_hali')
+        if not isinstance(ruh_hali, str) or not ruh_hali.strip():
+            raise AIResultError(f"Geçersiz ruh_hali: {ruh_hali!r}")
+
+        duygu = _DUYGU_ALIASES.get(str(data.get('duygu', '')).strip().lower())
+        if duygu is None:
+            raise AIResultError(f"Geçersiz duygu: {data.get('duygu')!r}")
+
+        yogunluk = data.get('yogunluk')
+        if isinstance(yogunluk, bool) or not isinstance(yogunluk, (int, float)):
+            raise AIResultError(f"Geçersiz yogunluk: {yogunluk!r}")
+        yogunluk = min(MAX_YOGUNLUK, max(MIN_YOGUNLUK, int(round(yogunluk))))
+
+        aciklama = data.get('aciklama')
+        if not isinstance(aciklama, str):
+            raise AIResultError(f"Geçersiz aciklama: {aciklama!r}")
+
+        return cls(ruh_hali.strip(), duygu, yogunluk, aciklama.strip())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mevcut sonuç sözlüğü biçimi (ruh_hali, duygu, yoğunluk, aciklama)"""
+        data = asdict(self)
+        data['yoğunluk'] = data.pop('yogunluk')
+        return data
+
+
+_RESULT_PROPERTIES = {
+    'ruh_hali': {'type': 'string', 'description': "Ruh hali (Mutlu, Üzgün, Kızgın, Nötr, Korkulu, Şaşkın, vb.)"},
+    'duygu': {'type': 'string', 'enum': list(DUYGU_VALUES)},
+    'yogunluk': {'type': 'integer', 'description': "Duygu yoğunluğu, 1-10 arası"},
+    'aciklama': {'type': 'string', 'description': "Kısa açıklama"},
+}
+
+RESULT_SCHEMA = {
+    'type': 'object',
+    'properties': _RESULT_PROPERTIES,
+    'required': list(_RESULT_PROPERTIES),
+    'additionalProperties': False,
+}
+
+ITEMS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'items': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {'id': {'type': 'integer'}, **_RESULT_PROPERTIES},
+                'required': ['id'] + list(_RESULT_PROPERTIES),
+                'additionalProperties': False,
+            },
+        },
+    },
+    'required': ['items'],
+    'additionalProperties': False,
+}
+
+
+def response_format(multi: bool = False) -> Dict[str, Any]:
+    """chat.completions.create için response_format parametresi"""
+    return {
+        'type': 'json_schema',
+        'json_schema': {
+            'name': 'duygu_sonuclari' if multi else 'duygu_sonucu',
+            'strict': True,
+            'schema': ITEMS_SCHEMA if multi else RESULT_SCHEMA,
+        },
+    }
+
+
+def _load(content: Optional[str]) -> Any:
+    if not content:
+        raise AIResultError("Boş cevap")
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        raise AIResultError(f"JSON ayrıştırılamadı: {e}") from e
+
+
+def parse_result(content: Optional[str]) -> AISentimentResult:
+    """Tek sonuçlu cevabı doğrular"""
+    return AISentimentResult.from_dict(_load(content))
+
+
+def parse_items(content: Optional[str], count: int) -> List[Optional[AISentimentResult]]:
+    """
+    Çoklu cevabı id'lere göre sıralar
+
+    Args:
+        content: Modelin JSON cevabı
+        count: Gönderilen metin sayısı (id'ler 0..count-1)
+
+    Returns:
+        Her metin için sonuç; eksik veya geçersiz öğeler None
+    """
+    data = _load(content)
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise AIResultError("items listesi yok")
+
+    results: List[Optional[AISentimentResult]] = [None] * count
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        index = item.get('id')
+        if not isinstance(index, int) or not 0 <= index < count or results[index] is not None:
+            continue
+        try:
+            results[index] = AISentimentResult.from_dict(item)
+        except AIResultError:
+            continue
+    return results
+
+
+def combine_results(parts: Sequence[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Parça sonuçlarını token ağırlıklı olarak yerelde birleştirir
+
+    Args:
+        parts: (token sayısı, sonuç sözlüğü) çiftleri, metindeki sırayla
+
+    Returns:
+        En ağır ruh hali ve duygu, ağırlıklı ortalama yoğunluk ve ilk açıklamalar
+    """
+    weights = Counter()
+    moods = Counter()
+    for tokens, result in parts:
+        weights[result['duygu']] += tokens
+        moods[result['ruh_hali']] += tokens
+    total = sum(tokens for tokens, _ in parts) or 1
+    return {
+        'ruh_hali': moods.most_common(1)[0][0],
+        'duygu': weights.most_common(1)[0][0],
+        'yoğunluk': round(sum(result['yoğunluk'] * tokens for tokens, result in parts) / total),
+        'aciklama': ' '.join(result['aciklama'] for _, result in parts[:3]),
+    }
@@ -0,0 +1,357 @@
+"""
+OpenAI Batch API ile toplu AI analizi
+Gece çalışan, on binlerce videoluk işlerde senkron chat.completions en pahalı ve en
+yavaş yoldur. Toplu modda toplu_analiz AI isteklerini göndermek yerine bir JSONL
+dosyasına yazar (her satır bir custom_id ve chat.completions gövdesi). Dosya Batch
+işi olarak gönderilir, tamamlanması beklenir ve cevaplar custom_id ile NDJSON
+sonuçlarındaki ve/veya SQLite sonuç deposundaki ai_sentiment alanlarına yazılır.
+
+Parça sonuçları reduce isteği yerine yerelde token ağırlıklı birleştirilir; her
+parça sonucu AI önbelleğine de yazılır.
+
+Kullanım:
+    python toplu_analiz.py urls.txt --ai --bulk istekler.jsonl -o sonuclar.ndjson
+    python ai_toplu_is.py run istekler.jsonl sonuclar.ndjson
+    python ai_toplu_is.py merge istekler.jsonl --store
+"""
+import io
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from ai_onbellek import AIResponseCache
+from ai_sonuc import AIResultError, combine_results, parse_items, parse_result
+from bagimliliklar import load_env
+from sonuc_deposu import ResultStore, default_db_path
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+COMPLETION_WINDOW = '24h'
+# Batch API sınırları: dosya başına 50.000 istek ve 200 MB
+MAX_BATCH_REQUESTS = 50000
+MAX_BATCH_BYTES = 190 * 1024 * 1024
+
+DEFAULT_POLL_SECONDS = 30
+FINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+
+def manifest_path(path: str) -> str:
+    """İstek dosyasının yanındaki eşleme dosyası"""
+    return path + '.manifest.json'
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    with open(manifest_path(path), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    # Parça numarası -> Batch kimliği; eski eşleme dosyalarında parçalar sırayla gönderilmiştir
+    manifest.setdefault('submitted', {str(number): batch_id for number, batch_id in enumerate(manifest['batches'])})
+    return manifest
+
+
+def save_manifest(path: str, manifest: Dict[str, Any]):
+    target = manifest_path(path)
+    with open(target + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(target + '.tmp', target)
+
+
+class BulkRequestWriter:
+    """
+    AI isteklerini JSONL dosyasına yazar (toplu_analiz iş parçacıkları paylaşır)
+
+    Eşleme dosyası her video için parça token sayılarını, önbellekten gelen parça
+    sonuçlarını, hangi custom_id'nin hangi parçaları içerdiğini ve sonuç deposundaki
+    analiz sürümünü tutar.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Yazılacak JSONL dosyası (eşleme dosyası path + '.manifest.json')
+        """
+        self.path = path
+        self.manifest = {'requests': os.path.basename(path), 'batches': [], 'submitted': {}, 'videos': {}}
+        self.requests = 0
+        self.cached = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def add(self, key: str, plan: Dict[str, Any]) -> int:
+        """
+        Videonun isteklerini yazar
+
+        Args:
+            key: Video kimliği (sonuç kaydındaki video_id, yoksa URL)
+            plan: VideoDuyguAnalizi.ai_bulk_plan çıktısı
+
+        Returns:
+            Yazılan istek sayısı (tüm parçalar önbellekteyse 0)
+        """
+        with self._lock:
+            if key in self.manifest['videos']:
+                return 0
+
+            requests = {}
+            for number, (indices, body) in enumerate(plan['requests']):
+                custom_id = f"{key}#{number}"
+                line = {'custom_id': custom_id, 'method': 'POST', 'url': BATCH_ENDPOINT, 'body': body}
+                self._file.write(json.dumps(line, ensure_ascii=False) + '\n')
+                requests[custom_id] = indices
+
+            self.manifest['videos'][key] = {
+                'tokens': plan['tokens'],
+                'results': plan['results'],
+                'keys': plan['keys'],
+                'requests': requests,
+                'analysis_version': plan.get('analysis_version'),
+            }
+            self.requests += len(requests)
+            if not requests:
+                self.cached += 1
+            return len(requests)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            save_manifest(self.path, self.manifest)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'path': self.path,
+                'videos': len(self.manifest['videos']),
+                'requests': self.requests,
+                'fully_cached': self.cached,
+            }
+
+
+def _split_requests(path: str) -> Iterator[bytes]:
+    """İstek dosyasını Batch API sınırlarına sığan parçalara böler"""
+    lines: List[bytes] = []
+    size = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if lines and (len(lines) >= MAX_BATCH_REQUESTS or size + len(line) > MAX_BATCH_BYTES):
+                yield b''.join(lines)
+                lines, size = [], 0
+            lines.append(line)
+            size += len(line)
+    if lines:
+        yield b''.join(lines)
+
+
+def unsubmitted_chunks(path: str, manifest: Optional[Dict[str, Any]] = None) -> List[int]:
+    """Henüz Batch işi başlatılmamış parça numaraları"""
+    manifest = manifest or load_manifest(path)
+    return [number for number, _ in enumerate(_split_requests(path)) if str(number) not in manifest['submitted']]
+
+
+def submit(client, path: str, log=print) -> List[str]:
+    """
+    İstek dosyasını yükler ve Batch işlerini başlatır
+
+    Gönderilen her parça eşleme dosyasına yazılır; yarıda kesilen gönderim tekrar
+    çalıştırılınca yalnızca gönderilmemiş parçalar gönderilir.
+
+    Returns:
+        Batch kimlikleri (eşleme dosyasına da yazılır)
+    """
+    manifest = load_manifest(path)
+    for number, payload in enumerate(_split_requests(path)):
+        if str(number) in manifest['submitted']:
+            continue
+        name = f"{os.path.splitext(os.path.basename(path))[0]}-{number}.jsonl"
+        uploaded = client.files.create(file=(name, io.BytesIO(payload)), purpose='batch')
+        batch = client.batches.create(input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT,
+                                      completion_window=COMPLETION_WINDOW)
+        manifest['batches'].append(batch.id)
+        manifest['submitted'][str(number)] = batch.id
+        # Her iş başlatıldıkça kaydet; yarıda kesilirse gönderilen işler kaybolmaz
+        save_manifest(path, manifest)
+        count = payload.count(b'\n')
+        log(f"📤 Batch işi başlatıldı: {batch.id} ({count} istek)")
+    return manifest['batches']
+
+
+def wait(client, batch_ids: List[str], poll: float = DEFAULT_POLL_SECONDS, log=print) -> List[Any]:
+    """Tüm Batch işleri bitene kadar bekler"""
+    batches = {}
+    while True:
+        for batch_id in batch_ids:
+            if batch_id not in batches or batches[batch_id].status not in FINAL_STATUSES:
+                batches[batch_id] = client.batches.retrieve(batch_id)
+
+        pending = [batch for batch in batches.values() if batch.status not in FINAL_STATUSES]
+        counts = [batch.request_counts for batch in batches.values() if batch.request_counts]
+        done = sum(count.completed + count.failed for count in counts)
+        total = sum(count.total for count in counts)
+        log(f"⏳ Batch: {len(batch_ids) - len(pending)}/{len(batch_ids)} iş bitti, {done}/{total} istek")
+        if not pending:
+            return [batches[batch_id] for batch_id in batch_ids]
+        time.sleep(poll)
+
+
+def download(client, batches: List[Any], log=print) -> Dict[str, Optional[str]]:
+    """
+    Tamamlanan işlerin cevaplarını indirir
+
+    Returns:
+        custom_id -> model cevabı (hatalı isteklerde None)
+    """
+    outputs: Dict[str, Optional[str]] = {}
+    for batch in batches:
+        if batch.status != 'completed':
+            log(f"⚠️  Batch işi {batch.id} tamamlanmadı: {batch.status}")
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get('response') or {}
+                content = None
+                if response.get('status_code') == 200:
+                    content = response['body']['choices'][0]['message']['content']
+                outputs[item['custom_id']] = content
+    return outputs
+
+
+def _parse(content: Optional[str], count: int) -> List[Optional[Dict[str, Any]]]:
+    if content is None:
+        return [None] * count
+    try:
+        results = [parse_result(content)] if count == 1 else parse_items(content, count)
+    except AIResultError:
+        return [None] * count
+    return [result.to_dict() if result else None for result in results]
+
+
+def collect(manifest: Dict[str, Any], outputs: Dict[str, Optional[str]],
+            cache: Optional[AIResponseCache] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Cevapları video bazında birleştirir
+
+    Args:
+        manifest: Eşleme dosyası
+        outputs: download çıktısı
+        cache: Verilirse parça sonuçları AI önbelleğine yazılır
+
+    Returns:
+        Video kimliği -> ai_sentiment (hiç parça sonucu yoksa None)
+    """
+    merged = {}
+    for key, video in manifest['videos'].items():
+        results = list(video['results'])
+        for custom_id, indices in video['requests'].items():
+            for index, value in zip(indices, _parse(outputs.get(custom_id), len(indices))):
+                results[index] = value
+                if value is not None and cache and video['keys']:
+                    cache.set(video['keys'][index], value)
+
+        parts = [(tokens, result) for tokens, result in zip(video['tokens'], results) if result]
+        if not parts:
+            merged[key] = None
+        elif len(video['tokens']) == 1:
+            merged[key] = parts[0][1]
+        else:
+            merged[key] = {**combine_results(parts), 'parca_sayisi': len(parts)}
+    return merged
+
+
+def merge_into_results(results_path: str, merged: Dict[str, Optional[Dict[str, Any]]]) -> int:
+    """
+    NDJSON sonuç dosyasındaki ai_sentiment alanlarını günceller (dosya atomik olarak değiştirilir)
+
+    Returns:
+        Güncellenen kayıt sayısı
+    """
+    updated = 0
+    temp_path = results_path + '.tmp'
+    with open(results_path, 'r', encoding='utf-8') as source, open(temp_path, 'w', encoding='utf-8') as target:
+        for line in source:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            key = record.get('video_id') or record.get('url')
+            if record.get('status') == 'ok' and merged.get(key) is not None:
+                record['result']['ai_sentiment'] = merged[key]
+                updated += 1
+            target.write(json.dumps(record, ensure_ascii=False) + '\n')
+    os.replace(temp_path, results_path)
+    return updated
+
+
+def merge_into_store(store: ResultStore, manifest: Dict[str, Any],
+                     merged: Dict[str, Optional[Dict[str, Any]]]) -> int:
+    """
+    Sonuç deposundaki ai_sentiment alanlarını (video_id, analysis_version) ile tek işlemde günceller
+
+    Returns:
+        Güncellenen kayıt sayısı
+    """
+    return store.update_ai((key, manifest['videos'][key].get('analysis_version'), value)
+                           for key, value in merged.items() if value is not None)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    from openai import OpenAI
+
+    parser = argparse.ArgumentParser(description="OpenAI Batch API ile toplu AI duygu analizi")
+    parser.add_argument('command', choices=['submit', 'wait', 'merge', 'run'],
+                        help="submit: gönder, wait: bekle, merge: sonuçlara yaz, run: hepsi")
+    parser.add_argument('requests', help="toplu_analiz --bulk ile yazılan JSONL dosyası")
+    parser.add_argument('results', nargs='?', help="Güncellenecek NDJSON sonuç dosyası (merge/run)")
+    parser.add_argument('--store', nargs='?', const='', metavar='DB',
+                        help="ai_sentiment'i SQLite sonuç deposuna da yaz (varsayılan dosya: önbellek klasöründe results.sqlite3)")
+    parser.add_argument('--poll', type=float, default=DEFAULT_POLL_SECONDS,
+                        help=f"Durum sorgulama aralığı, saniye (varsayılan: {DEFAULT_POLL_SECONDS})")
+    parser.add_argument('--cache-dir', help="AI önbellek klasörü")
+    parser.add_argument('--no-cache', action='store_true', help="Parça sonuçlarını AI önbelleğine yazma")
+    args = parser.parse_args(argv)
+
+    if args.command in ('merge', 'run') and not args.results and args.store is None:
+        parser.error("merge/run için sonuç dosyası veya --store gerekli")
+
+    # OPENAI_API_KEY yalnızca .env dosyasında olabilir
+    load_env()
+    client = OpenAI(max_retries=5)
+    if args.command in ('submit', 'run'):
+        batch_ids = submit(client, args.requests)
+        if args.command == 'submit':
+            return 0
+    else:
+        # wait/merge yeni iş başlatmaz (ücretli); yalnızca gönderilmiş işleri okur
+        missing_chunks = unsubmitted_chunks(args.requests)
+        if missing_chunks:
+            print(f"❌ {len(missing_chunks)} parça henüz gönderilmedi; önce: python ai_toplu_is.py submit "
+                  f"{args.requests}", file=sys.stderr)
+            return 1
+        batch_ids = load_manifest(args.requests)['batches']
+    if not batch_ids:
+        print("✅ Gönderilecek istek yok (tüm parçalar önbellekte)")
+
+    batches = wait(client, batch_ids, poll=args.poll)
+    if args.command == 'wait':
+        return 0 if all(batch.status == 'completed' for batch in batches) else 1
+
+    cache = None if args.no_cache else AIResponseCache(args.cache_dir)
+    manifest = load_manifest(args.requests)
+    merged = collect(manifest, download(client, batches), cache)
+    missing = sum(1 for value in merged.values() if value is None)
+    if args.results:
+        updated = merge_into_results(args.results, merged)
+        print(f"✅ {updated} kaydın ai_sentiment alanı güncellendi ({missing} video sonuçsuz)")
+    if args.store is not None:
+        with ResultStore(args.store or default_db_path()) as store:
+            updated = merge_into_store(store, manifest, merged)
+        print(f"✅ Sonuç deposunda {updated} kaydın ai_sentiment alanı güncellendi ({missing} video sonuçsuz)")
+    return 0 if missing == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,427 @@
+"""
+Akış (streaming) alt yazı ayrıştırıcı
+json3, srv3 ve VTT alt yazılarını parça parça okur; biçimi ilk byte'lardan
+belirler ve metin parçalarını geldikçe üretir. Tüm gövde hiçbir zaman belleğe
+alınmaz, bu yüzden saatlerce süren canlı yayın alt yazılarında da bellek sabit kalır.
+
+YouTube otomatik VTT alt yazılarında her satır birkaç kayan (rolling) cue'da tekrar
+eder; RollingCaptionMerger bu tekrarları tek geçişte birleştirir, her kelime ilk
+göründüğü cue'nun zamanını korur.
+
+Tekrar temizliği ölçümü:
+    python altyazi_parser.py fixtures/rolling_en.vtt fixtures/rolling_tr.vtt
+"""
+import codecs
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+from html import unescape
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+FORMAT_JSON3 = 'json3'
+FORMAT_SRV3 = 'srv3'
+FORMAT_VTT = 'vtt'
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_VTT_TIMING_RE = re.compile(r'(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})\s*-->\s*(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})')
+_DIGITS_RE = re.compile(r'^\d+$')
+_SPACE_RE = re.compile(r'\s+')
+_EVENTS_KEY = '"events"'
+
+# Kayan tekrar birleştirme: karşılaştırma için tutulan son kelime sayısı ve tam tekrar
+# olmayan örtüşmelerde en az kaç kelime örtüşmeli ("the" / "the" gibi doğal tekrarlar korunur)
+ROLLING_TAIL_WORDS = 64
+ROLLING_MIN_PARTIAL_OVERLAP = 3
+
+_json_decoder = json.JSONDecoder()
+
+
+class CaptionSegment(NamedTuple):
+    """Tek alt yazı parçası; zamanlar milisaniye cinsinden"""
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+def clean_caption_text(text: str) -> str:
+    """Etiketleri ve özel karakterleri temizler, boşlukları sadeleştirir"""
+    text = _TAG_RE.sub('', text)
+    text = text.replace('>>', '').replace('<<', '')
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def _suffix_prefix_overlap(tail: Sequence[str], words: Sequence[str]) -> int:
+    """
+    tail'in sonu ile words'ün başı arasındaki en uzun örtüşme (KMP, O(len(words)))
+
+    Returns:
+        Örtüşen kelime sayısı
+    """
+    n = min(len(tail), len(words))
+    if n == 0:
+        return 0
+
+    # words[:n] için önek fonksiyonu
+    prefix = [0] * n
+    k = 0
+    for i in range(1, n):
+        while k and words[i] != words[k]:
+            k = prefix[k - 1]
+        if words[i] == words[k]:
+            k += 1
+        prefix[i] = k
+
+    # tail'in son n kelimesi üzerinde eşleşme; sonda kalan k, en uzun sonek = önek
+    k = 0
+    for word in tail[len(tail) - n:]:
+        while k and word != words[k]:
+            k = prefix[k - 1]
+        if word == words[k]:
+            k += 1
+    return k
+
+
+class RollingCaptionMerger:
+    """
+    Kayan otomatik alt yazı tekrarlarını birleştirir
+
+    YouTube VTT'sinde her cue bir önceki satırı tekrar edip yeni satırı ekler; ayrıca
+    10 ms'lik geçiş cue'ları tamamlanan satırı bir kez daha yazar. Her parçanın başı,
+    şimdiye kadar üretilen metnin sonuyla karşılaştırılır ve örtüşen kelimeler atılır.
+    Karşılaştırma yalnızca son ROLLING_TAIL_WORDS kelimeye bakar, toplam süre kelime
+    sayısıyla doğrusaldır.
+    """
+
+    def __init__(self, tail_words: int = ROLLING_TAIL_WORDS, min_partial_overlap: int = ROLLING_MIN_PARTIAL_OVERLAP):
+        self.tail_words = tail_words
+        self.min_partial_overlap = min_partial_overlap
+        self._tail: List[str] = []
+        self.segments_before = 0
+        self.segments_after = 0
+        self.chars_before = 0
+        self.chars_after = 0
+
+    def merge(self, segment: CaptionSegment) -> Optional[CaptionSegment]:
+        """
+        Parçanın yeni kısmını döndürür
+
+        Returns:
+            Tekrar edilmeyen kelimelerle parça (zamanları korunur) veya tamamen tekrarsa None
+        """
+        self.segments_before += 1
+        self.chars_before += len(segment.text)
+
+        words = segment.text.split(' ')
+        keys = [word.casefold() for word in words]
+        overlap = _suffix_prefix_overlap(self._tail, keys)
+        if overlap < len(words) and overlap < self.min_partial_overlap:
+            overlap = 0
+        if overlap == len(words):
+            return None
+
+        self._tail.extend(keys[overlap:])
+        if len(self._tail) > 2 * self.tail_words:
+            del self._tail[:-self.tail_words]
+
+        if overlap:
+            segment = segment._replace(text=' '.join(words[overlap:]))
+        self.segments_after += 1
+        self.chars_after += len(segment.text)
+        return segment
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'segments_before': self.segments_before,
+            'segments_after': self.segments_after,
+            'chars_before': self.chars_before,
+            'chars_after': self.chars_after,
+        }
+
+
+class CaptionStreamParser:
+    """
+    Parça parça beslenen alt yazı ayrıştırıcı
+
+    Kullanım:
+        parser = CaptionStreamParser()
+        for chunk in response.iter_content(65536):
+            segments.extend(parser.feed(chunk))
+        segments.extend(parser.close())
+    """
+
+    def __init__(self, merge_rolling: bool = True):
+        """
+        Args:
+            merge_rolling: VTT'deki kayan otomatik alt yazı tekrarlarını birleştir
+        """
+        self.format: Optional[str] = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._buffer = ''
+
+        # json3 durumu
+        self._in_events = False
+        self._events_done = False
+
+        # srv3 durumu
+        self._xml: Optional[ET.XMLPullParser] = None
+        self._xml_parents: List[ET.Element] = []
+
+        # VTT durumu
+        self._vtt_header = True
+        self._vtt_cue = (0, 0)
+        self.rolling = RollingCaptionMerger() if merge_rolling else None
+
+    def feed(self, chunk: bytes) -> List[CaptionSegment]:
+        """Yeni bir parça işler ve tamamlanan alt yazı parçalarını döndürür"""
+        text = self._decoder.decode(chunk)
+        if not text:
+            return []
+
+        if self.format is None:
+            self._buffer += text
+            if not self._detect_format():
+                return []
+            text, self._buffer = self._buffer, ''
+
+        return self._dispatch(text, final=False)
+
+    def close(self) -> List[CaptionSegment]:
+        """Akışın sonu; tamponda kalanları işler"""
+        text = self._decoder.decode(b'', final=True)
+        if self.format is None:
+            self._buffer += text
+            if not self._buffer.strip():
+                return []
+            self._detect_format(force=True)
+            text, self._buffer = self._buffer, ''
+        return self._dispatch(text, final=True)
+
+    def stats(self) -> Optional[Dict[str, int]]:
+        """Kayan tekrar birleştirmenin önce/sonra boyutları (VTT değilse veya kapalıysa None)"""
+        if self.format != FORMAT_VTT or not self.rolling:
+            return None
+        return self.rolling.stats()
+
+    def _detect_format(self, force: bool = False) -> bool:
+        """İlk boşluk olmayan karakterlere bakarak biçimi belirler"""
+        head = self._buffer.lstrip('\ufeff \t\r\n')
+        if not head:
+            return False
+
+        if head[0] == '{':
+            self.format = FORMAT_JSON3
+        elif head[0] == '<':
+            self.format = FORMAT_SRV3
+            self._xml = ET.XMLPullParser(events=('start', 'end'))
+        elif head.startswith('WEBVTT') or force or len(head) >= 6:
+            self.format = FORMAT_VTT
+        else:
+            return False
+
+        self._buffer = head
+        return True
+
+    def _dispatch(self, text: str, final: bool) -> List[CaptionSegment]:
+        if self.format == FORMAT_JSON3:
+            return self._feed_json3(text, final)
+        if self.format == FORMAT_SRV3:
+            return self._feed_srv3(text, final)
+        return self._feed_vtt(text, final)
+
+    # ------------------------------------------------------------------
+    # json3: {"wireMagic": "pb3", ..., "events": [{...}, {...}]}
+    # ------------------------------------------------------------------
+
+    def _feed_json3(self, text: str, final: bool) -> List[CaptionSegment]:
+        if self._events_done:
+            return []
+
+        buffer = self._buffer + text
+        segments = []
+        pos = 0
+
+        if not self._in_events:
+            key = buffer.find(_EVENTS_KEY)
+            if key < 0:
+                # Anahtar iki parçaya bölünmüş olabilir; sonunu sakla
+                self._buffer = buffer[-len(_EVENTS_KEY):]
+                return []
+            bracket = buffer.find('[', key + len(_EVENTS_KEY))
+            if bracket < 0:
+                self._buffer = buffer[key:]
+                return []
+            self._in_events = True
+            pos = bracket + 1
+
+        length = len(buffer)
+        while pos < length:
+            char = buffer[pos]
+            if char in ' \t\r\n,':
+                pos += 1
+                continue
+            if char == ']':
+                self._events_done = True
+                pos = length
+                break
+
+            try:
+                event, end = _json_decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Olay henüz tamamlanmadı, sonraki parçayı bekle
+                break
+
+            pos = end
+            segment = self._json3_event_segment(event)
+            if segment:
+                segments.append(segment)
+
+        self._buffer = '' if final else buffer[pos:]
+        return segments
+
+    def _json3_event_segment(self, event) -> Optional[CaptionSegment]:
+        if not isinstance(event, dict):
+            return None
+        parts = []
+        for seg in event.get('segs') or ():
+            text = seg.get('utf8')
+            if not text:
+                continue
+            text = text.strip().replace('>>', '').replace('<<', '')
+            if text:
+                parts.append(text)
+        if not parts:
+            return None
+
+        start = int(event.get('tStartMs') or 0)
+        duration = int(event.get('dDurationMs') or 0)
+        return CaptionSegment(start, start + duration, ' '.join(parts))
+
+    # ------------------------------------------------------------------
+    # srv3: <timedtext><body><p t="0" d="1000"><s>...</s></p></body></timedtext>
+    # (srv1 <text start="" dur=""> öğeleri de desteklenir)
+    # ------------------------------------------------------------------
+
+    def _feed_srv3(self, text: str, final: bool) -> List[CaptionSegment]:
+        segments = []
+        try:
+            self._xml.feed(text)
+            if final:
+                self._xml.close()
+        except ET.ParseError:
+            return segments
+
+        for event, elem in self._xml.read_events():
+            if event == 'start':
+                self._xml_parents.append(elem)
+                continue
+
+            self._xml_parents.pop()
+            if elem.tag not in ('p', 'text'):
+                continue
+
+            text = clean_caption_text(unescape(''.join(elem.itertext())))
+            if text:
+                start, end = self._srv_timing(elem)
+                segments.append(CaptionSegment(start, end, text))
+
+            # İşlenen öğeyi ağaçtan çıkar ki bellek büyümesin
+            if self._xml_parents:
+                self._xml_parents[-1].remove(elem)
+
+        return segments
+
+    def _srv_timing(self, elem: ET.Element):
+        """srv3 <p t d> milisaniye, srv1 <text start dur> saniye kullanır"""
+        try:
+            if elem.tag == 'p':
+                start = int(elem.get('t') or 0)
+                return start, start + int(elem.get('d') or 0)
+            start = float(elem.get('start') or 0)
+            return int(start * 1000), int((start + float(elem.get('dur') or 0)) * 1000)
+        except ValueError:
+            return 0, 0
+
+    # ------------------------------------------------------------------
+    # VTT
+    # ------------------------------------------------------------------
+
+    def _feed_vtt(self, text: str, final: bool) -> List[CaptionSegment]:
+        buffer = self._buffer + text
+        lines = buffer.split('\n')
+        self._buffer = '' if final else lines.pop()
+
+        segments = []
+        for line in lines:
+            line = line.strip()
+
+            # Başlık bloğu (WEBVTT, Kind:, Language:) ilk boş satıra kadar sürer
+            if self._vtt_header:
+                if not line:
+                    self._vtt_header = False
+                elif not line.startswith('WEBVTT') and '-->' in line:
+                    self._vtt_header = False
+                else:
+                    continue
+
+            if '-->' in line:
+                timing = _VTT_TIMING_RE.search(line)
+                if timing:
+                    self._vtt_cue = _vtt_ms(timing.groups()[:4]), _vtt_ms(timing.groups()[4:])
+                continue
+
+            # VTT sıra numaralarını, notları ve HTML etiketlerini atla
+            if (not line or line.startswith('<') or _DIGITS_RE.match(line)
+                    or line.startswith('WEBVTT') or line.startswith('NOTE')):
+                continue
+
+            line = clean_caption_text(line)
+            if len(line) > 1:
+                segment = CaptionSegment(self._vtt_cue[0], self._vtt_cue[1], line)
+                if self.rolling:
+                    segment = self.rolling.merge(segment)
+                if segment:
+                    segments.append(segment)
+
+        return segments
+
+
+def _vtt_ms(groups) -> int:
+    hours, minutes, seconds, millis = groups
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis)
+
+
+def parse_caption_chunks(chunks: Iterable[bytes], parser: Optional[CaptionStreamParser] = None) -> List[CaptionSegment]:
+    """Byte parçalarından tüm alt yazı parçalarını çıkarır"""
+    parser = parser or CaptionStreamParser()
+    segments = []
+    for chunk in chunks:
+        segments.extend(parser.feed(chunk))
+    segments.extend(parser.close())
+    return segments
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Alt yazı dosyalarındaki kayan tekrar temizliğini ölçer")
+    parser.add_argument('files', nargs='+', help="VTT, json3 veya srv3 dosyaları")
+    args = parser.parse_args(argv)
+
+    for path in args.files:
+        caption_parser = CaptionStreamParser()
+        with open(path, 'rb') as f:
+            segments = parse_caption_chunks(iter(lambda: f.read(64 * 1024), b''), caption_parser)
+        stats = caption_parser.stats()
+        if stats is None:
+            print(f"📄 {path}: {caption_parser.format}, {len(segments)} parça (kayan tekrar temizliği yalnızca VTT)")
+            continue
+        before, after = stats['chars_before'], stats['chars_after']
+        ratio = before / after if after else 0.0
+        print(f"📄 {path}: {stats['segments_before']} → {stats['segments_after']} parça, "
+              f"{before} → {after} karakter ({ratio:.2f}x küçüldü)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,435 @@
+"""
+HTTP analiz servisi
+VideoDuyguAnalizi'ni diğer servislerin çağırabilmesi için asyncio tabanlı küçük bir
+HTTP/1.1 sunucusu (yalnızca standart kütüphane). Tek bir analizör süreç boyunca
+açık kalır: yt-dlp örnekleri, httpx ve AsyncOpenAI istemcileri başlangıçta
+hazırlanır ve tüm isteklerde tekrar kullanılır.
+
+Aynı video için aynı anda gelen istekler tek bir analizi paylaşır (video ID,
+AI ve zaman çizelgesi seçeneklerine göre). Biten başarılı sonuçlar kısa bir süre
+(--result-ttl) bellekte tutulur; gündemdeki bir video için gelen istek dalgası
+tek analizle karşılanır.
+
+Uç noktalar:
+    POST /analyze        {"url": "...", "ai": false, "timeline": false, "transcript": false}
+    POST /analyze/batch  {"urls": ["...", "..."], "ai": false, ...}
+    GET  /health         Durum ve sayaçlar
+    GET  /metrics        Aşama süreleri ve sayaçlar (Prometheus metin biçimi)
+
+Cevaplar cli.py kayıtlarıyla aynı biçimdedir (url, video_id, status, result/error,
+elapsed) ve 'served_from' alanı (analysis, in_flight, recent) içerir.
+
+Kullanım:
+    python analiz_sunucusu.py --port 8080 --timeout 120
+    curl -s localhost:8080/analyze -d '{"url": "https://youtu.be/VIDEO_ID"}'
+"""
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from duygu_motoru import BACKENDS, DEFAULT_BACKEND
+import olcum
+from youtube_url import extract_video_id
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+# Başarılı sonuçların bellekte tutulma süresi (saniye) ve en fazla kayıt sayısı
+DEFAULT_RESULT_TTL = 60.0
+MAX_RECENT_RESULTS = 1024
+MAX_BATCH_URLS = 100
+MAX_BODY_BYTES = 1024 * 1024
+# Boşta bekleyen keep-alive bağlantıları bu süre sonra kapatılır (saniye)
+KEEPALIVE_SECONDS = 30.0
+
+# Kayıt durumu -> /analyze HTTP durum kodu
+STATUS_CODES = {'ok': 200, 'error': 422, 'timeout': 504}
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class HTTPError(Exception):
+    """İstemciye durum koduyla dönülecek hata"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class RecentResults:
+    """Biten başarılı kayıtları kısa süre tutan LRU (iş parçacığı değil, tek event loop kullanır)"""
+
+    def __init__(self, ttl: float = DEFAULT_RESULT_TTL, max_entries: int = MAX_RECENT_RESULTS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        stored, record = item
+        if time.monotonic() - stored > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return record
+
+    def set(self, key: Tuple, record: Dict[str, Any]):
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic(), record)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AnalysisService:
+    """
+    Analizörü paylaştıran, aynı video için eşzamanlı istekleri birleştiren servis katmanı
+
+    Analiz görevi isteği yapan istemciden bağımsızdır: istemci zaman aşımına uğrasa
+    veya bağlantıyı kapatsa da analiz sürer ve bekleyen diğer istemcilere döner.
+    """
+
+    def __init__(self, analyzer, timeout: Optional[float] = None, result_ttl: float = DEFAULT_RESULT_TTL,
+                 metrics: Optional[olcum.PrometheusSink] = None):
+        """
+        Args:
+            analyzer: VideoDuyguAnalizi örneği (süreç boyunca açık kalır)
+            timeout: İstek başına bekleme sınırı, saniye (None: sınırsız)
+            result_ttl: Başarılı sonuçların bellekte tutulma süresi (0: kapalı)
+            metrics: /metrics için aşama ölçümlerini toplayan sink (olcum.add_sink ile kayıtlı olmalı)
+        """
+        self.analyzer = analyzer
+        self.metrics = metrics
+        self.timeout = timeout
+        self.recent = RecentResults(result_ttl)
+        self.started = time.time()
+        self._in_flight: Dict[Tuple, asyncio.Task] = {}
+        self._connections = set()
+        self.counters = {'requests': 0, 'analyses': 0, 'in_flight_hits': 0, 'recent_hits': 0,
+                         'ok': 0, 'failed': 0, 'timeouts': 0}
+
+    async def warm_up(self):
+        """yt-dlp'yi executor'da, httpx ve AsyncOpenAI istemcilerini bu event loop'ta hazırlar"""
+        await asyncio.get_running_loop().run_in_executor(None, self.analyzer.warm_up)
+        self.analyzer._async_clients()
+
+    async def _run(self, key: Tuple, url: str, use_ai: bool, timeline: bool) -> Dict[str, Any]:
+        """Tek analiz; sonuç kaydı üretir, hatalar dışarı sızmaz"""
+        started = time.time()
+        record = {'url': url, 'video_id': key[0]}
+        try:
+            result = await self.analyzer.analyze_video_async(url, use_ai=use_ai, timeline=timeline)
+        except Exception as e:
+            record.update(status='error', error=str(e) or type(e).__name__)
+        else:
+            if 'error' in result:
+                record.update(status='error', error=result['error'])
+            else:
+                record.update(status='ok', result=result)
+                self.recent.set(key, record)
+        finally:
+            self._in_flight.pop(key, None)
+
+        record['elapsed'] = round(time.time() - started, 3)
+        self.counters['ok' if record['status'] == 'ok' else 'failed'] += 1
+        return record
+
+    async def analyze(self, url: str, use_ai: bool = False, timeline: bool = False) -> Dict[str, Any]:
+        """
+        Videoyu analiz eder (devam eden veya yeni biten analiz varsa onu kullanır)
+
+        Returns:
+            Sonuç kaydı ('served_from': analysis, in_flight veya recent)
+        """
+        self.counters['requests'] += 1
+        video_id = extract_video_id(url)
+        if video_id is None:
+            self.counters['failed'] += 1
+            return {'url': url, 'video_id': None, 'status': 'error', 'error': "Geçersiz YouTube URL'si",
+                    'elapsed': 0.0, 'served_from': 'analysis'}
+
+        key = (video_id, bool(use_ai), bool(timeline))
+        record = self.recent.get(key)
+        if record is not None:
+            self.counters['recent_hits'] += 1
+            return {**record, 'url': url, 'served_from': 'recent'}
+
+        task = self._in_flight.get(key)
+        if task is None:
+            served_from = 'analysis'
+            self.counters['analyses'] += 1
+            task = asyncio.ensure_future(self._run(key, url, use_ai, timeline))
+            self._in_flight[key] = task
+        else:
+            served_from = 'in_flight'
+            self.counters['in_flight_hits'] += 1
+
+        started = time.time()
+        try:
+            # shield: bu istemcinin zaman aşımı veya iptali paylaşılan analizi durdurmaz
+            record = await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            self.counters['timeouts'] += 1
+            return {'url': url, 'video_id': video_id, 'status': 'timeout',
+                    'error': f"Zaman aşımı ({self.timeout:g} sn)", 'elapsed': round(time.time() - started, 3),
+                    'served_from': served_from}
+        return {**record, 'url': url, 'served_from': served_from}
+
+    async def analyze_many(self, urls: List[str], use_ai: bool = False, timeline: bool = False) -> List[Dict[str, Any]]:
+        """URL'leri aynı anda analiz eder; kayıtlar girdi sırasında döner"""
+        return list(await asyncio.gather(*(self.analyze(url, use_ai, timeline) for url in urls)))
+
+    async def close_connections(self):
+        """Açık keep-alive bağlantılarını kapatır (kapanışta bekleyen okumalar iptal edilmeden biter)"""
+        for writer in list(self._connections):
+            writer.close()
+        while self._connections:
+            await asyncio.sleep(0.01)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'in_flight': len(self._in_flight),
+            'connections': len(self._connections),
+            'recent_results': len(self.recent),
+            **self.counters,
+        }
+        if getattr(self.analyzer, 'ai_cache', None):
+            stats['ai_cache'] = self.analyzer.ai_cache.stats()
+        return stats
+
+    def metrics_text(self) -> str:
+        """Aşama ölçümleri ve servis sayaçları, Prometheus metin biçiminde"""
+        prefix = self.metrics.prefix if self.metrics else olcum.METRIC_PREFIX
+        lines = [self.metrics.render().rstrip('\n')] if self.metrics else []
+        for name in ('in_flight', 'connections'):
+            lines.append(f"# TYPE {prefix}_server_{name} gauge")
+            lines.append(f"{prefix}_server_{name} {len(getattr(self, '_' + name))}")
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {prefix}_server_{name}_total counter")
+            lines.append(f"{prefix}_server_{name}_total {value}")
+        return '\n'.join(line for line in lines if line) + '\n'
+
+
+def _public_record(record: Dict[str, Any], include_transcript: bool) -> Dict[str, Any]:
+    """Transkript istenmediyse sonuçtan çıkarır (paylaşılan kayıt değiştirilmez)"""
+    if include_transcript or record.get('status') != 'ok':
+        return record
+    result = {key: value for key, value in record['result'].items() if key != 'transcript'}
+    return {**record, 'result': result}
+
+
+def _parse_json(body: bytes) -> Dict[str, Any]:
+    try:
+        payload = json.loads(body or b'{}')
+    except ValueError:
+        raise HTTPError(400, "Gövde geçerli JSON değil")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Gövde bir JSON nesnesi olmalı")
+    return payload
+
+
+async def handle_request(service: AnalysisService, method: str, path: str,
+                         body: bytes) -> Tuple[int, Union[Dict[str, Any], str]]:
+    """
+    İsteği yönlendirir
+
+    Returns:
+        (HTTP durum kodu, JSON cevap veya /metrics için metin)
+    """
+    path = path.split('?', 1)[0].rstrip('/') or '/'
+
+    if path == '/health':
+        if method not in ('GET', 'HEAD'):
+            raise HTTPError(405, "Sadece GET desteklenir")
+        return 200, service.stats()
+
+    if path == '/metrics':
+        if method not in ('GET', 'HEAD'):
+            raise HTTPError(405, "Sadece GET desteklenir")
+        return 200, service.metrics_text()
+
+    if path not in ('/analyze', '/analyze/batch'):
+        raise HTTPError(404, f"Bilinmeyen yol: {path}")
+    if method != 'POST':
+        raise HTTPError(405, "Sadece POST desteklenir")
+
+    payload = _parse_json(body)
+    use_ai = bool(payload.get('ai', False))
+    timeline = bool(payload.get('timeline', False))
+    include_transcript = bool(payload.get('transcript', False))
+
+    if path == '/analyze':
+        url = payload.get('url')
+        if not isinstance(url, str) or not url.strip():
+            raise HTTPError(400, "'url' alanı gerekli")
+        record = await service.analyze(url.strip(), use_ai, timeline)
+        return STATUS_CODES.get(record['status'], 500), _public_record(record, include_transcript)
+
+    urls = payload.get('urls')
+    if not isinstance(urls, list) or not urls or not all(isinstance(url, str) for url in urls):
+        raise HTTPError(400, "'urls' boş olmayan bir metin listesi olmalı")
+    if len(urls) > MAX_BATCH_URLS:
+        raise HTTPError(413, f"Bir istekte en fazla {MAX_BATCH_URLS} URL gönderilebilir")
+    records = await service.analyze_many([url.strip() for url in urls], use_ai, timeline)
+    summary = {status: sum(1 for record in records if record['status'] == status) for status in STATUS_CODES}
+    return 200, {'results': [_public_record(record, include_transcript) for record in records],
+                 'summary': {'total': len(records), **summary}}
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    """HTTP/1.1 isteğini okur (bağlantı kapandıysa None)"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, "Geçersiz istek satırı")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HTTPError(411, "Content-Length gerekli")
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HTTPError(400, "Geçersiz Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "Gövde çok büyük")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, version, headers, body
+
+
+def _response(status: int, payload: Union[Dict[str, Any], str], keep_alive: bool, head: bool = False) -> bytes:
+    if isinstance(payload, str):
+        body, content_type = payload.encode('utf-8'), PROMETHEUS_CONTENT_TYPE
+    else:
+        body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8'
+    lines = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (b'' if head else body)
+
+
+async def handle_connection(service: AnalysisService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Bağlantıdaki istekleri sırayla işler (keep-alive)"""
+    service._connections.add(writer)
+    try:
+        while True:
+            try:
+                request = await asyncio.wait_for(_read_request(reader), KEEPALIVE_SECONDS)
+            except HTTPError as e:
+                writer.write(_response(e.status, {'error': str(e)}, keep_alive=False))
+                await writer.drain()
+                break
+            if request is None:
+                break
+
+            method, target, version, headers, body = request
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+            try:
+                status, payload = await handle_request(service, method, target, body)
+            except HTTPError as e:
+                status, payload = e.status, {'error': str(e)}
+            except Exception as e:
+                status, payload = 500, {'error': str(e) or type(e).__name__}
+
+            writer.write(_response(status, payload, keep_alive, head=method == 'HEAD'))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        service._connections.discard(writer)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def start_server(service: AnalysisService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+    """
+    Servisi hazırlar ve dinlemeye başlar
+
+    Args:
+        service: AnalysisService
+        host: Dinlenecek adres
+        port: Dinlenecek port (0: boş port seçilir)
+
+    Returns:
+        asyncio sunucusu (adres: server.sockets[0].getsockname())
+    """
+    await service.warm_up()
+    return await asyncio.start_server(lambda reader, writer: handle_connection(service, reader, writer), host, port)
+
+
+async def serve(host: str, port: int, **options):
+    from video_duygu_analizi import VideoDuyguAnalizi
+
+    timeout = options.pop('timeout', None)
+    result_ttl = options.pop('result_ttl', DEFAULT_RESULT_TTL)
+    analyzer = VideoDuyguAnalizi(verbose=False, **options)
+    metrics = olcum.PrometheusSink()
+    olcum.add_sink(metrics)
+    service = AnalysisService(analyzer, timeout=timeout, result_ttl=result_ttl, metrics=metrics)
+    server = await start_server(service, host, port)
+    address = server.sockets[0].getsockname()
+    print(f"🌐 Analiz servisi: http://{address[0]}:{address[1]} (Ctrl+C ile durdurun)", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        olcum.remove_sink(metrics)
+        await service.close_connections()
+        await analyzer.aclose()
+        analyzer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Video duygu analizi HTTP servisi")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Dinlenecek adres (varsayılan: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (varsayılan: {DEFAULT_PORT})")
+    parser.add_argument('--timeout', type=float, help="İstek başına bekleme sınırı, saniye (analiz arka planda sürer)")
+    parser.add_argument('--result-ttl', type=float, default=DEFAULT_RESULT_TTL,
+                        help=f"Başarılı sonuçları bellekte tutma süresi, saniye (0: kapalı, varsayılan: {DEFAULT_RESULT_TTL:g})")
+    parser.add_argument('--extraction', type=int, default=8, help="Aynı anda yt-dlp çıkarımı (varsayılan: 8)")
+    parser.add_argument('--cache-dir', help="Önbellek klasörü (varsayılan: VIDEO_CACHE_DIR veya ~/.cache/video_duygu_analizi)")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help=f"Duygu motoru (varsayılan: {DEFAULT_BACKEND})")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, timeout=args.timeout, result_ttl=args.result_ttl,
+                          cache_dir=args.cache_dir, sentiment_backend=args.backend,
+                          async_limits={'extraction': args.extraction}))
+    except KeyboardInterrupt:
+        print("\n👋 Servis durduruldu", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
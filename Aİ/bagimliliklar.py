@@ -0,0 +1,64 @@
+"""
+Bağımlılık kontrolü ve tembel yükleme yardımcıları
+Paketlerin kurulu olup olmadığı importlib.util.find_spec ile kontrol edilir; bu
+paketi içe aktarmaz, sadece bulur. yt-dlp, openai ve textblob gibi ağır paketler
+ilk kullanıldıkları yerde içe aktarılır, böylece önbellekten dönen çalışmalar
+başlangıçta onların yükleme süresini ödemez.
+"""
+import importlib.util
+import sys
+import threading
+from typing import Dict, List
+
+# Modül adı -> pip paket adı
+REQUIRED_PACKAGES = {
+    'yt_dlp': 'yt-dlp',
+    'openai': 'openai',
+    'textblob': 'textblob',
+    'dotenv': 'python-dotenv',
+}
+
+_env_lock = threading.Lock()
+_env_loaded = False
+
+
+def missing_packages(packages: Dict[str, str] = REQUIRED_PACKAGES) -> List[str]:
+    """
+    Kurulu olmayan paketleri bulur (hiçbir paketi içe aktarmaz)
+
+    Args:
+        packages: Modül adı -> pip paket adı
+
+    Returns:
+        Eksik pip paket adları
+    """
+    return [package for module, package in packages.items() if importlib.util.find_spec(module) is None]
+
+
+def check_dependencies(packages: Dict[str, str] = REQUIRED_PACKAGES):
+    """Eksik paket varsa kurulum komutunu gösterip çıkar (kod 1)"""
+    missing = missing_packages(packages)
+    if missing:
+        print("❌ Gerekli paketler yüklü değil!", file=sys.stderr)
+        print(f"Eksik paketler: {', '.join(missing)}", file=sys.stderr)
+        print("Lütfen şu komutu çalıştırın: pip install -r requirements.txt", file=sys.stderr)
+        # cron ve boru hatlarında girdi beklenmez
+        if sys.stdin is not None and sys.stdin.isatty():
+            input("Enter'a basın...")
+        sys.exit(1)
+
+
+def load_env():
+    """.env dosyasını ilk ihtiyaçta bir kez yükler (python-dotenv yoksa sessizce geçer)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            try:
+                from dotenv import load_dotenv
+            except ImportError:
+                pass
+            else:
+                load_dotenv()
+            _env_loaded = True
@@ -0,0 +1,117 @@
+"""
+Başlangıç süresi kontrolü
+Modülleri ayrı bir yorumlayıcıda `python -X importtime` ile içe aktarır, toplam
+içe aktarma süresini bütçeyle karşılaştırır ve ağır paketlerin (yt-dlp, openai,
+textblob, nltk, numpy, requests, dotenv) içe aktarma sırasında yüklenmediğini
+doğrular. Bütçe aşılırsa veya ağır paket yüklenirse 1 ile çıkar; CI'da
+gerilemeyi yakalamak için kullanılır.
+
+Kullanım:
+    python baslangic_suresi.py
+    python baslangic_suresi.py --budget-ms 200 --runs 5 video_duygu_analizi toplu_analiz
+"""
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Modül -> içe aktarma bütçesi (ms, kümülatif); komut satırı giriş modülleri dahil
+DEFAULT_BUDGETS_MS = {
+    'video_duygu_analizi': 250,
+    'ai_solver': 100,
+    'cli': 250,
+    'toplu_analiz': 250,
+    'kanal_izleme': 250,
+    'analiz_sunucusu': 250,
+    'ai_toplu_is': 100,
+    'sonuc_deposu': 50,
+}
+
+# İçe aktarma sırasında yüklenmemesi gereken paketler (ilk kullanımda yüklenir)
+HEAVY_MODULES = ('yt_dlp', 'openai', 'textblob', 'nltk', 'numpy', 'requests', 'dotenv')
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Modülü yeni bir yorumlayıcıda içe aktarır
+
+    Args:
+        module: İçe aktarılacak modül (bu klasörden)
+
+    Returns:
+        (modülün kümülatif süresi µs, üst düzey paket -> kümülatif süre µs)
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=here, capture_output=True, text=True, check=True,
+    )
+
+    # Çocuklar ebeveynden önce yazılır; üst düzey satıra kadar biriken satırlar o modülün ağacıdır
+    # (site gibi yorumlayıcı başlangıcına ait ağaçlar atlanır)
+    subtree: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        top = name.split('.')[0]
+        subtree[top] = max(subtree.get(top, 0), cumulative)
+        if depth == 1:
+            if name == module:
+                return cumulative, subtree
+            subtree = {}
+    return 0, {}
+
+
+def check(module: str, budget_ms: float, runs: int = 3) -> List[str]:
+    """
+    Bütçe ve ağır paket kontrolü
+
+    Returns:
+        Hata mesajları (boşsa kontrol geçti)
+    """
+    # Disk önbelleği ve .pyc etkisini azaltmak için en iyi ölçüm alınır
+    samples = [measure(module) for _ in range(max(1, runs))]
+    total, packages = min(samples, key=lambda sample: sample[0])
+    slowest = sorted(((time, name) for name, time in packages.items() if name != module), reverse=True)[:5]
+
+    print(f"⏱️  {module}: {total / 1000:.1f} ms (bütçe {budget_ms:.0f} ms)")
+    for time, name in slowest:
+        print(f"     {name:<28} {time / 1000:7.1f} ms")
+
+    errors = []
+    if total / 1000 > budget_ms:
+        errors.append(f"{module} içe aktarma süresi bütçeyi aştı: {total / 1000:.1f} ms > {budget_ms:.0f} ms")
+    heavy = [name for name in HEAVY_MODULES if name in packages]
+    if heavy:
+        errors.append(f"{module} içe aktarılırken ağır paketler yüklendi: {', '.join(heavy)}")
+    return errors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="İçe aktarma süresi bütçesini kontrol eder (python -X importtime)")
+    parser.add_argument('modules', nargs='*', help="Kontrol edilecek modüller (varsayılan: DEFAULT_BUDGETS_MS'teki tüm modüller)")
+    parser.add_argument('--budget-ms', type=float, help="Tüm modüller için bütçe (ms)")
+    parser.add_argument('--runs', type=int, default=3, help="Ölçüm tekrarı; en iyisi alınır (varsayılan: 3)")
+    args = parser.parse_args(argv)
+
+    errors = []
+    for module in args.modules or list(DEFAULT_BUDGETS_MS):
+        budget = args.budget_ms or DEFAULT_BUDGETS_MS.get(module, 250)
+        errors.extend(check(module, budget, args.runs))
+
+    for error in errors:
+        print(f"❌ {error}")
+    if not errors:
+        print("✅ Başlangıç süresi bütçe içinde")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Komut satırı arayüzü
+Etkileşimsiz çalışır: URL'ler argüman olarak veya standart girdiden (her satırda
+bir URL) alınır ve hiçbir adımda input() ile girdi beklenmez; cron ve boru
+hatlarında kullanılabilir. Videolar analyze_video_async ile en fazla --jobs
+tanesi aynı anda analiz edilir.
+
+Çıktı terminale gidiyorsa sonuçlar okunabilir biçimde gösterilir; aksi halde her
+video bitince bir NDJSON satırı yazılır (--format json: girdi sırasında tek JSON
+dizisi). İlerleme ve özet standart hataya yazılır.
+
+Çıkış kodları:
+    0    Tüm videolar analiz edildi (veya girdi boş)
+    1    En az bir video başarısız oldu veya zaman aşımına uğradı
+    2    Kullanım hatası (geçersiz argüman, URL verilmedi)
+    130  Ctrl+C ile durduruldu
+
+Kullanım:
+    python cli.py "https://youtu.be/VIDEO_ID" --ai
+    cat urls.txt | python cli.py --jobs 8 --timeout 120 > sonuclar.ndjson
+    python cli.py --format json --cache-dir /tmp/onbellek URL1 URL2
+    python cli.py --metrics-log olcumler.jsonl --metrics-prom /var/lib/node_exporter/video.prom URL1
+    python cli.py --profile analiz.prof "https://youtu.be/VIDEO_ID"
+    cat urls.txt | python cli.py --store -q > /dev/null    # sonuçları SQLite deposuna da yaz
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from duygu_motoru import BACKENDS, DEFAULT_BACKEND
+import olcum
+from youtube_url import extract_video_id
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+DEFAULT_JOBS = 4
+FORMATS = ('text', 'ndjson', 'json')
+
+
+def read_urls(lines: Iterable[str]) -> List[str]:
+    """
+    Satırlardaki URL'leri okur
+
+    Args:
+        lines: URL satırları (boş satırlar ve # yorumları atlanır)
+
+    Returns:
+        URL'ler (aynı video bir kez döner)
+    """
+    urls = []
+    seen = set()
+    for line in lines:
+        url = line.strip()
+        if not url or url.startswith('#'):
+            continue
+        key = extract_video_id(url) or url
+        if key not in seen:
+            seen.add(key)
+            urls.append(url)
+    return urls
+
+
+async def _analyze_one(analyzer, url: str, slots: asyncio.Semaphore, use_ai: bool,
+                       timeout: Optional[float], timeline: bool) -> Dict[str, Any]:
+    """Tek videoyu analiz eder; hatalar ve zaman aşımı kayda yazılır, dışarı sızmaz"""
+    async with slots:
+        # Süre sınırı sıra beklerken değil, analiz başladığında işlemeye başlar
+        started = time.time()
+        record = {'url': url, 'video_id': extract_video_id(url)}
+
+        if record['video_id'] is None:
+            record.update(status='error', error="Geçersiz YouTube URL'si")
+        else:
+            try:
+                result = await asyncio.wait_for(analyzer.analyze_video_async(url, use_ai=use_ai, timeline=timeline),
+                                                timeout)
+            except asyncio.TimeoutError:
+                record.update(status='timeout', error=f"Zaman aşımı ({timeout:g} sn)")
+            except Exception as e:
+                record.update(status='error', error=str(e) or type(e).__name__)
+            else:
+                if 'error' in result:
+                    record.update(status='error', error=result['error'])
+                else:
+                    record.update(status='ok', result=result)
+
+        record['elapsed'] = round(time.time() - started, 3)
+        return record
+
+
+class ResultWriter:
+    """Kayıtları seçilen biçimde yazar (text, ndjson veya json)"""
+
+    def __init__(self, output_format: str, stream, include_transcript: bool = False):
+        """
+        Args:
+            output_format: 'text' (okunabilir), 'ndjson' (video bitince bir satır) veya 'json' (sonda tek dizi)
+            stream: Yazılabilir metin akışı
+            include_transcript: Transkript metnini çıktıya ekle
+        """
+        self.format = output_format
+        self.stream = stream
+        self.include_transcript = include_transcript
+        self._records: List[Tuple[int, Dict[str, Any]]] = []
+
+    def _machine_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        if self.include_transcript or record.get('status') != 'ok':
+            return record
+        result = {key: value for key, value in record['result'].items() if key != 'transcript'}
+        return {**record, 'result': result}
+
+    def write(self, index: int, record: Dict[str, Any]):
+        """
+        Args:
+            index: Kaydın girdideki sırası (json biçiminde sıralama için)
+            record: Video kaydı
+        """
+        if self.format == 'json':
+            self._records.append((index, self._machine_record(record)))
+        elif self.format == 'ndjson':
+            self.stream.write(json.dumps(self._machine_record(record), ensure_ascii=False) + '\n')
+            self.stream.flush()
+        else:
+            from video_duygu_analizi import print_results
+
+            print(f"\n🎥 {record['url']}", file=self.stream)
+            if record['status'] == 'ok':
+                print_results(record['result'], show_transcript=self.include_transcript, file=self.stream)
+            else:
+                print(f"❌ {record['error']}", file=self.stream)
+            self.stream.flush()
+
+    def close(self):
+        if self.format == 'json':
+            records = [record for _, record in sorted(self._records, key=lambda item: item[0])]
+            json.dump(records, self.stream, ensure_ascii=False, indent=2)
+            self.stream.write('\n')
+            self.stream.flush()
+
+
+async def run(urls: List[str], writer: ResultWriter, jobs: int = DEFAULT_JOBS, use_ai: bool = False,
+              timeout: Optional[float] = None, timeline: bool = False, cache_dir: Optional[str] = None,
+              use_cache: bool = True, sentiment_backend: str = DEFAULT_BACKEND,
+              quiet: bool = False, store=None) -> Dict[str, Any]:
+    """
+    URL'leri analiz eder ve her video bitince kaydını yazar
+
+    Args:
+        urls: Video URL'leri
+        writer: Çıktı yazıcısı
+        jobs: Aynı anda analiz edilecek video sayısı
+        use_ai: OpenAI ile detaylı analiz yap
+        timeout: Video başına süre sınırı, saniye (None: sınırsız)
+        timeline: Duygu zaman çizelgesi çıkar
+        cache_dir: Transkript ve AI önbelleği klasörü
+        use_cache: Önbellekleri kullan
+        sentiment_backend: Duygu motoru ('textblob' veya 'lexicon')
+        quiet: İlerleme satırlarını standart hataya yazma
+        store: Verilirse başarılı sonuçlar bu sonuc_deposu.ResultStore'a da yazılır
+
+    Returns:
+        Çalışma özeti (total, ok, failed, timeout, elapsed_seconds)
+    """
+    from video_duygu_analizi import VideoDuyguAnalizi
+
+    analyzer = VideoDuyguAnalizi(cache_dir=cache_dir, use_cache=use_cache, verbose=False,
+                                 sentiment_backend=sentiment_backend, async_limits={'extraction': jobs})
+    slots = asyncio.Semaphore(max(1, jobs))
+    summary = {'total': 0, 'ok': 0, 'failed': 0, 'timeout': 0}
+    started = time.time()
+
+    async def indexed(index: int, url: str) -> Tuple[int, Dict[str, Any]]:
+        return index, await _analyze_one(analyzer, url, slots, use_ai, timeout, timeline)
+
+    tasks = [asyncio.ensure_future(indexed(index, url)) for index, url in enumerate(urls)]
+    try:
+        for future in asyncio.as_completed(tasks):
+            index, record = await future
+            summary['total'] += 1
+            if record['status'] == 'ok':
+                summary['ok'] += 1
+            else:
+                summary['failed'] += 1
+                summary['timeout'] += record['status'] == 'timeout'
+            writer.write(index, record)
+            if store is not None and record['status'] == 'ok':
+                store.add(record['result'], url=record['url'])
+
+            if not quiet:
+                mark = '✅' if record['status'] == 'ok' else '⏱️ ' if record['status'] == 'timeout' else '❌'
+                print(f"{mark} [{summary['total']}/{len(urls)}] {record['url']} ({record['elapsed']}s)",
+                      file=sys.stderr)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await analyzer.aclose()
+        analyzer.close()
+
+    summary['elapsed_seconds'] = round(time.time() - started, 2)
+    return summary
+
+
+def run_profiled(urls: List[str], writer: ResultWriter, path: str, use_ai: bool = False, timeline: bool = False,
+                 cache_dir: Optional[str] = None, use_cache: bool = True,
+                 sentiment_backend: str = DEFAULT_BACKEND, quiet: bool = False, store=None) -> Dict[str, Any]:
+    """
+    URL'leri ana iş parçacığında sırayla analiz eder ve cProfile ile ölçer
+
+    cProfile yalnızca çağıran iş parçacığını izlediği için asyncio ve executor
+    kullanılmaz; --jobs ve --timeout bu modda geçersizdir.
+
+    Args:
+        path: Ham profil istatistiklerinin yazılacağı dosya
+
+    Returns:
+        Çalışma özeti (total, ok, failed, timeout, elapsed_seconds)
+    """
+    from video_duygu_analizi import VideoDuyguAnalizi
+
+    analyzer = VideoDuyguAnalizi(cache_dir=cache_dir, use_cache=use_cache, verbose=False,
+                                 sentiment_backend=sentiment_backend)
+    summary = {'total': 0, 'ok': 0, 'failed': 0, 'timeout': 0}
+    started = time.time()
+    try:
+        with olcum.profiled(path):
+            for index, url in enumerate(urls):
+                video_started = time.time()
+                record = {'url': url, 'video_id': extract_video_id(url)}
+                if record['video_id'] is None:
+                    record.update(status='error', error="Geçersiz YouTube URL'si")
+                else:
+                    try:
+                        result = analyzer.analyze_video(url, use_ai=use_ai, timeline=timeline)
+                    except Exception as e:
+                        record.update(status='error', error=str(e) or type(e).__name__)
+                    else:
+                        if 'error' in result:
+                            record.update(status='error', error=result['error'])
+                        else:
+                            record.update(status='ok', result=result)
+                record['elapsed'] = round(time.time() - video_started, 3)
+
+                summary['total'] += 1
+                summary['ok' if record['status'] == 'ok' else 'failed'] += 1
+                writer.write(index, record)
+                if store is not None and record['status'] == 'ok':
+                    store.add(record['result'], url=url)
+                if not quiet:
+                    mark = '✅' if record['status'] == 'ok' else '❌'
+                    print(f"{mark} [{summary['total']}/{len(urls)}] {url} ({record['elapsed']}s)", file=sys.stderr)
+    finally:
+        analyzer.close()
+
+    summary['elapsed_seconds'] = round(time.time() - started, 2)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="YouTube videolarını etkileşimsiz olarak duygu analizinden geçirir",
+        epilog="Çıkış kodları: 0 başarılı, 1 başarısız video var, 2 kullanım hatası, 130 durduruldu",
+    )
+    parser.add_argument('urls', nargs='*',
+                        help="Video URL'leri (verilmezse veya '-' ise standart girdiden, her satırda bir URL)")
+    parser.add_argument('-j', '--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f"Aynı anda analiz edilecek video sayısı (varsayılan: {DEFAULT_JOBS})")
+    parser.add_argument('--ai', action='store_true', help="OpenAI ile detaylı analiz yap")
+    parser.add_argument('--cache-dir', help="Önbellek klasörü (varsayılan: VIDEO_CACHE_DIR veya ~/.cache/video_duygu_analizi)")
+    parser.add_argument('--no-cache', action='store_true', help="Transkript ve AI önbelleklerini kullanma")
+    parser.add_argument('--timeout', type=float, help="Video başına süre sınırı, saniye (varsayılan: sınırsız)")
+    parser.add_argument('-f', '--format', choices=FORMATS,
+                        help="Çıktı biçimi (varsayılan: terminalde text, değilse ndjson)")
+    parser.add_argument('--transcript', action='store_true', help="Transkript metnini çıktıya ekle")
+    parser.add_argument('--timeline', action='store_true', help="Duygu zaman çizelgesini çıktıya ekle")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help=f"Duygu motoru (varsayılan: {DEFAULT_BACKEND})")
+    parser.add_argument('-q', '--quiet', action='store_true', help="İlerleme ve özeti standart hataya yazma")
+    parser.add_argument('--metrics-log', metavar='DOSYA',
+                        help="Aşama ölçümlerini satır başına bir JSON olarak yaz ('-': standart hata)")
+    parser.add_argument('--metrics-prom', metavar='DOSYA',
+                        help="Bitişte Prometheus metin biçiminde ölçümleri yaz (textfile collector)")
+    parser.add_argument('--store', nargs='?', const='', metavar='DB',
+                        help="Başarılı sonuçları SQLite sonuç deposuna yaz (varsayılan dosya: önbellek klasöründe results.sqlite3)")
+    parser.add_argument('--profile', metavar='DOSYA',
+                        help="cProfile ile ölç ve istatistikleri yaz (videolar ana iş parçacığında sırayla analiz edilir)")
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs en az 1 olmalı")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout pozitif olmalı")
+
+    lines = [url for url in args.urls if url != '-']
+    if not args.urls or '-' in args.urls:
+        if sys.stdin is None or sys.stdin.isatty():
+            parser.error("URL verilmedi (argüman olarak veya standart girdiden verin)")
+        lines.extend(sys.stdin)
+    urls = read_urls(lines)
+
+    sinks = []
+    if args.metrics_log:
+        sinks.append(olcum.JSONLogSink(args.metrics_log))
+    if args.metrics_prom:
+        sinks.append(olcum.PrometheusSink())
+    for sink in sinks:
+        olcum.add_sink(sink)
+
+    store = None
+    if args.store is not None:
+        from sonuc_deposu import ResultStore, default_db_path
+        store = ResultStore(args.store or default_db_path(args.cache_dir))
+
+    output_format = args.format or ('text' if sys.stdout.isatty() else 'ndjson')
+    writer = ResultWriter(output_format, sys.stdout, include_transcript=args.transcript)
+    try:
+        if args.profile:
+            summary = run_profiled(urls, writer, args.profile, use_ai=args.ai, timeline=args.timeline,
+                                   cache_dir=args.cache_dir, use_cache=not args.no_cache,
+                                   sentiment_backend=args.backend, quiet=args.quiet, store=store)
+        else:
+            summary = asyncio.run(run(urls, writer, jobs=args.jobs, use_ai=args.ai, timeout=args.timeout,
+                                      timeline=args.timeline, cache_dir=args.cache_dir, use_cache=not args.no_cache,
+                                      sentiment_backend=args.backend, quiet=args.quiet, store=store))
+    except KeyboardInterrupt:
+        print("\n⚠️  Kullanıcı tarafından durduruldu", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    finally:
+        writer.close()
+        if store is not None:
+            store.close()
+        for sink in sinks:
+            olcum.remove_sink(sink)
+            if isinstance(sink, olcum.PrometheusSink):
+                sink.write(args.metrics_prom)
+            else:
+                sink.close()
+
+    if not args.quiet:
+        print("📊 Özet: " + json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return EXIT_OK if summary['failed'] == 0 else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+SQLite tabanlı disk önbelleği
+TTL, boyut sınırı ve LRU çıkarma destekler; birden fazla süreç aynı dosyayı
+güvenle kullanabilir (WAL modu + kilitli yazma işlemleri).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+class DiskCache:
+    def __init__(self, path: str, max_entries: int = 10000,
+                 max_bytes: int = 200 * 1024 * 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            path: SQLite dosyasının yolu
+            max_entries: En fazla kayıt sayısı
+            max_bytes: Kayıtların toplam boyut sınırı (byte)
+            ttl: Kayıtların geçerlilik süresi (saniye), None ise süresiz
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _transaction(self) -> '_Transaction':
+        """Her iş parçacığı kendi bağlantısını kullanır"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return _Transaction(conn)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Kaydı döndürür; yoksa veya süresi dolmuşsa None"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        """Kaydı yazar ve gerekirse en eski kullanılan kayıtları çıkarır"""
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode('utf-8'))
+        now = time.time()
+
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, data, size, now, now)
+            )
+            self._evict(conn, now)
+
+    def delete(self, key: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        with self._transaction() as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Süresi dolmuş kayıtları siler, sonra sınırlar aşılıyorsa LRU sırasıyla çıkarır"""
+        if self.ttl is not None:
+            conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        # En eski erişilen kayıttan başlayarak sınırların altına inene kadar sil
+        to_delete = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", to_delete)
+
+
+class _Transaction:
+    """sqlite3 bağlantısını 'BEGIN IMMEDIATE' ile açılan bir işlem bağlamına sarar"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
@@ -0,0 +1,176 @@
+"""
+Süreç havuzunda duygu puanlama
+Duygu puanlama CPU'ya bağlıdır ve GIL'i tutar; iş parçacıklı toplu çalışma en fazla
+bir çekirdek kullanır. ProcessSentimentPool puanlamayı ayrı süreçlere dağıtır.
+Her işçi süreç sözlüğü başlangıçta bir kez yükler. Parçalar Python str listesi
+olarak değil, tek bir UTF-8 tampon ve ofset dizisi (array('i')) olarak gönderilir;
+sonuçlar da array('d') tamponu olarak döner.
+
+Ölçekleme kontrolü:
+    python duygu_havuzu.py fixtures/duygu_korpusu.txt --repeat 2000 --processes 1 2 4
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from duygu_motoru import DEFAULT_BACKEND, Score, SentimentBackend, get_sentiment_backend
+
+# Tek işte gönderilen parça sayısı; küçük olursa gidiş-dönüş, büyük olursa dengesizlik artar
+DEFAULT_CHUNK_SEGMENTS = 2000
+
+# İşçi süreçteki motor (_init_worker tarafından bir kez yüklenir)
+_worker_backend: Optional[SentimentBackend] = None
+
+
+def pack_texts(texts: Sequence[str]) -> Tuple[bytes, bytes]:
+    """Metinleri tek UTF-8 tampon ve karakter ofsetleri (n+1 eleman) olarak paketler"""
+    offsets = array('i', [0])
+    total = 0
+    for text in texts:
+        total += len(text)
+        offsets.append(total)
+    return ''.join(texts).encode('utf-8'), offsets.tobytes()
+
+
+def unpack_texts(data: bytes, offsets_data: bytes) -> List[str]:
+    """pack_texts çıktısını metin listesine geri dönüştürür"""
+    text = data.decode('utf-8')
+    offsets = array('i')
+    offsets.frombytes(offsets_data)
+    return [text[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def _init_worker(backend_name: str):
+    """İşçi süreç başlangıcı: sözlük/TextBlob korpusu burada bir kez yüklenir"""
+    global _worker_backend
+    _worker_backend = get_sentiment_backend(backend_name)
+    # Tembel yüklenen sözlüğü ilk görevden önce hazırla
+    _worker_backend.score('good')
+
+
+def _score_packed(data: bytes, offsets_data: bytes) -> bytes:
+    """Paketlenmiş parçaları puanlar; (polarity, subjectivity) çiftleri array('d') olarak döner"""
+    scores = _worker_backend.score_batch(unpack_texts(data, offsets_data))
+    result = array('d')
+    for polarity, subjectivity in scores:
+        result.append(polarity)
+        result.append(subjectivity)
+    return result.tobytes()
+
+
+def _score_text(data: bytes) -> Score:
+    return _worker_backend.score(data.decode('utf-8'))
+
+
+class ProcessSentimentPool(SentimentBackend):
+    """
+    SentimentBackend arayüzünü süreç havuzu üzerinden sunan motor
+
+    VideoDuyguAnalizi(sentiment_processes=N) ile kullanılır. İş parçacıkları aynı
+    havuzu paylaşabilir; puanlama beklenirken GIL serbest kalır, bu yüzden toplu
+    çalışmada her video farklı bir çekirdekte puanlanır.
+    """
+
+    def __init__(self, backend: str = DEFAULT_BACKEND, processes: Optional[int] = None,
+                 chunk_segments: int = DEFAULT_CHUNK_SEGMENTS):
+        """
+        Args:
+            backend: İşçilerde kullanılacak motor ('textblob' veya 'lexicon')
+            processes: İşçi süreç sayısı (varsayılan: çekirdek sayısı)
+            chunk_segments: Bir işte gönderilecek en fazla parça sayısı
+        """
+        self.name = backend
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.chunk_segments = max(1, chunk_segments)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Havuzu ilk kullanımda başlatır"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: iş parçacıklı süreçte fork güvenli değil, Windows ile de aynı davranış
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker,
+                        initargs=(self.name,),
+                    )
+        return self._executor
+
+    def score(self, text: str) -> Score:
+        return self._pool().submit(_score_text, text.encode('utf-8')).result()
+
+    def score_batch(self, texts: Sequence[str]) -> List[Score]:
+        if not texts:
+            return []
+
+        pool = self._pool()
+        futures = []
+        for start in range(0, len(texts), self.chunk_segments):
+            chunk = texts[start:start + self.chunk_segments]
+            futures.append(pool.submit(_score_packed, *pack_texts(chunk)))
+
+        scores = []
+        for future in futures:
+            values = array('d')
+            values.frombytes(future.result())
+            scores.extend(zip(values[0::2], values[1::2]))
+        return scores
+
+    def close(self):
+        """İşçi süreçleri kapatır; sonraki kullanımda havuz yeniden başlatılır"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Süreç havuzuyla duygu puanlamanın ölçeklenmesini ölçer")
+    parser.add_argument('corpus', help="Her satırı bir parça olan metin dosyası")
+    parser.add_argument('--repeat', type=int, default=1000, help="Korpusu çoğalt (varsayılan: 1000)")
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, help="Duygu motoru (varsayılan: textblob)")
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4], help="Denenecek süreç sayıları")
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, 'r', encoding='utf-8') as f:
+        texts = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    texts = texts * max(1, args.repeat)
+
+    expected = None
+    baseline = None
+    for processes in args.processes:
+        pool = ProcessSentimentPool(args.backend, processes)
+        try:
+            # Isınma: süreç başlatma ve sözlük yükleme ölçüme girmesin
+            pool.score_batch(texts[:processes * pool.chunk_segments])
+
+            started = time.perf_counter()
+            scores = pool.score_batch(texts)
+            elapsed = time.perf_counter() - started
+        finally:
+            pool.close()
+
+        if expected is None:
+            expected = scores
+        elif scores != expected:
+            print(f"❌ {processes} süreçte sonuçlar farklı")
+            return 1
+
+        rate = len(texts) / elapsed
+        baseline = baseline or rate
+        print(f"⏱️  {processes} süreç: {rate:,.0f} parça/s ({rate / baseline:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
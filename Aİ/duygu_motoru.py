@@ -0,0 +1,431 @@
+"""
+Duygu analizi motorları
+TextBlob'un pattern çözümleyicisi saf Python'dur ve her kelime için sözlük
+nesneleri oluşturur; önbellekli çalışmada CPU'nun çoğunu o harcar. LexiconBackend
+aynı polarite/subjektivite sözlüğünü bir kez hash indeksine ve NumPy dizilerine
+derler, metni tek geçişte kelimelere ayırır ve bir grup parçayı vektörel olarak
+puanlar. Yoğunlaştırıcı ("very good") ve olumsuzlama ("not good") kuralları
+pattern ile aynıdır.
+
+Eşlik ve hız kontrolü:
+    python duygu_motoru.py fixtures/duygu_korpusu.txt
+"""
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (polarity, subjectivity)
+Score = Tuple[float, float]
+
+DEFAULT_BACKEND = 'textblob'
+
+# Pattern'in olumsuzlama kelimeleri ve ünlem çarpanı
+NEGATIONS = ('no', 'not', "n't", 'never')
+EXCLAMATION_BOOST = 1.25
+
+# "(!)" ironi işareti: polarite 0, subjektivite 1
+IRONY = '(!)'
+
+
+def classify_sentiment(polarity: float, subjectivity: float) -> Dict[str, any]:
+    """
+    Polarite değerini ruh hali etiketlerine dönüştürür
+
+    Args:
+        polarity: -1 (negatif) ile 1 (pozitif) arası
+        subjectivity: 0 (objektif) ile 1 (subjektif) arası
+
+    Returns:
+        ruh_hali, duygu, polarity, subjectivity ve yuzde alanları
+    """
+    if polarity > 0.3:
+        ruh_hali = "Mutlu 😊"
+        duygu = "Pozitif"
+    elif polarity > 0.1:
+        ruh_hali = "İyi 👍"
+        duygu = "Hafif Pozitif"
+    elif polarity > -0.1:
+        ruh_hali = "Nötr 😐"
+        duygu = "Nötr"
+    elif polarity > -0.3:
+        ruh_hali = "Üzgün 😔"
+        duygu = "Hafif Negatif"
+    else:
+        ruh_hali = "Çok Üzgün/Kızgın 😢"
+        duygu = "Negatif"
+
+    return {
+        'ruh_hali': ruh_hali,
+        'duygu': duygu,
+        'polarity': polarity,
+        'subjectivity': subjectivity,
+        'yuzde': round((polarity + 1) * 50, 1)  # 0-100 arası yüzde
+    }
+
+
+class SentimentBackend:
+    """Duygu motorlarının ortak arayüzü"""
+
+    name = ''
+
+    def score(self, text: str) -> Score:
+        """Tek metnin (polarity, subjectivity) değeri"""
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts: Sequence[str]) -> List[Score]:
+        """Metinleri toplu puanlar; duygu_zaman_cizelgesi.BatchScorer ile uyumludur"""
+        raise NotImplementedError
+
+
+class TextBlobBackend(SentimentBackend):
+    """Mevcut davranış: her metin için TextBlob(text).sentiment"""
+
+    name = 'textblob'
+
+    def __init__(self):
+        from textblob import TextBlob
+        self._blob = TextBlob
+
+    def score_batch(self, texts: Sequence[str]) -> List[Score]:
+        scores = []
+        for text in texts:
+            sentiment = self._blob(text).sentiment
+            scores.append((sentiment.polarity, sentiment.subjectivity))
+        return scores
+
+
+class _Tokenizer:
+    """textblob._text.find_tokens ile aynı kelimeleri üreten, cümle bölmeyen hızlı sürüm"""
+
+    def __init__(self):
+        from textblob._text import (ABBREVIATIONS, PUNCTUATION, RE_ABBR1, RE_ABBR2, RE_ABBR3,
+                                    RE_EMOTICONS, RE_SARCASM)
+
+        self._lead = tuple(PUNCTUATION.replace('.', ''))
+        self._trail = self._lead + ('.',)
+        self._lead_chars = frozenset(self._lead)
+        self._trail_chars = frozenset(self._trail)
+        self._abbreviations = ABBREVIATIONS
+        self._abbr_res = (RE_ABBR1, RE_ABBR2, RE_ABBR3)
+        self._sarcasm = RE_SARCASM
+        self._emoticons = RE_EMOTICONS
+        # Tırnaklar ayrı kelime olur ("don't" -> "do n ' t")
+        self._quotes = str.maketrans({quote: f' {quote} ' for quote in '“”‘’\'"'})
+
+    def tokenize(self, text: str) -> List[str]:
+        text = text.replace("n't", " n't").translate(self._quotes)
+        tokens = []
+        for token in text.split():
+            if token[0] in self._lead_chars or token[-1] in self._trail_chars:
+                self._split_punctuation(token, tokens)
+            else:
+                tokens.append(token)
+
+        # "( ! )" ve ": )" gibi ayrılmış ifadeleri yeniden birleştir, sonra küçük harfe çevir
+        text = self._sarcasm.sub('(!)', ' '.join(tokens))
+        text = self._emoticons.sub(lambda match: match.group(1).replace(' ', '') + match.group(2), text)
+        return text.lower().split()
+
+    def _split_punctuation(self, token: str, tokens: List[str]):
+        """Baştaki ve sondaki noktalama işaretlerini ayırır (kısaltmalar korunur)"""
+        while token.startswith(self._lead):
+            tokens.append(token[0])
+            token = token[1:]
+
+        tail = []
+        while token.endswith(self._trail):
+            if token.endswith(self._lead):
+                tail.append(token[-1])
+                token = token[:-1]
+            if token.endswith('...'):
+                tail.append('...')
+                token = token[:-3].rstrip('.')
+            if token.endswith('.'):
+                if token in self._abbreviations or any(regex.match(token) for regex in self._abbr_res):
+                    break
+                tail.append('.')
+                token = token[:-1]
+
+        if token:
+            tokens.append(token)
+        tokens.extend(reversed(tail))
+
+
+class LexiconBackend(SentimentBackend):
+    """
+    TextBlob sözlüğünü NumPy dizilerine derleyen vektörel motor
+
+    Her kelime bir tamsayı kimliğine çevrilir; sözlükte olmayan kelimeler yalnızca
+    uzunluklarına göre üç sınıftan birine düşer (pattern'in kuralları uzunluğa
+    bakar). Bir gruptaki tüm parçalar tek dizide, araya ayraç kelime konarak
+    puanlanır.
+    """
+
+    name = 'lexicon'
+
+    def __init__(self):
+        import numpy as np
+        from textblob._text import EMOTICONS, PUNCTUATION
+        from textblob.en import sentiment as lexicon
+
+        self._np = np
+        self._tokenizer = _Tokenizer()
+
+        words = [word for word in lexicon.keys() if None in lexicon[word]]
+        self._index = {word: i for i, word in enumerate(words)}
+
+        # Sözlük dışında değerlendirilen kelimeler: olumsuzlamalar, ünlem, ironi ve ifadeler
+        specials = {word: (0.0, 0.0) for word in NEGATIONS + ('!',)}
+        specials[IRONY] = (0.0, 1.0)
+        for (_, polarity), emoticons in EMOTICONS.items():
+            for emoticon in emoticons:
+                emoticon = emoticon.lower()
+                # pattern yalnızca harf olmayan, en fazla 5 karakterlik ifadelere bakar
+                if not emoticon.isalpha() and len(emoticon) <= 5 and emoticon not in PUNCTUATION:
+                    specials.setdefault(emoticon, (polarity, 1.0))
+        for word in specials:
+            self._index.setdefault(word, len(self._index))
+
+        # Sözlük dışı kelime sınıfları (1, 2 ve 3+ karakter); parça ayracı 3+ sınıfını kullanır
+        self._unknown = (len(self._index), len(self._index) + 1, len(self._index) + 2)
+        self._separator = self._unknown[2]
+        size = len(self._index) + 3
+
+        self._polarity = np.zeros(size)
+        self._subjectivity = np.zeros(size)
+        self._intensity = np.ones(size)
+        self._known = np.zeros(size, dtype=bool)
+        self._modifier = np.zeros(size, dtype=bool)
+        self._ly = np.zeros(size, dtype=bool)
+        for word in words:
+            i = self._index[word]
+            entry = lexicon[word]
+            self._polarity[i], self._subjectivity[i], self._intensity[i] = entry[None]
+            self._known[i] = True
+            self._modifier[i] = any(pos in entry for pos in lexicon.modifiers)
+            self._ly[i] = lexicon.modifier(word)
+
+        # İroni ve ifadeler sözlük kelimesi olmadan kendi değerlendirmelerini ekler
+        self._assessed = self._known.copy()
+        self._negation = np.zeros(size, dtype=bool)
+        self._long_negation = np.zeros(size, dtype=bool)
+        self._exclamation = np.zeros(size, dtype=bool)
+        for word, (polarity, subjectivity) in specials.items():
+            i = self._index[word]
+            if word in NEGATIONS:
+                self._negation[i] = True
+                self._long_negation[i] = len(word) > 2
+            elif word == '!':
+                self._exclamation[i] = True
+            else:
+                self._polarity[i], self._subjectivity[i] = polarity, subjectivity
+                self._assessed[i] = True
+
+        # Olumsuzlamayı bozan (2+ karakter) ve yoğunlaştırıcıyı bozan (3+ karakter) sözlük dışı kelimeler
+        self._clears_negation = np.zeros(size, dtype=bool)
+        self._clears_modifier = np.zeros(size, dtype=bool)
+        self._clears_negation[list(self._unknown[1:])] = True
+        self._clears_modifier[self._unknown[2]] = True
+        for word in specials:
+            if word not in NEGATIONS:
+                self._clears_negation[self._index[word]] = len(word.strip("'")) > 1
+                self._clears_modifier[self._index[word]] = len(word) > 2
+
+    def _token_ids(self, texts: Sequence[str]):
+        """Metinleri tek bir kimlik dizisine çevirir; her metnin önüne ayraç konur"""
+        get = self._index.get
+        unknown = self._unknown
+        tokenize = self._tokenizer.tokenize
+
+        ids = []
+        counts = []
+        for text in texts:
+            tokens = tokenize(text)
+            ids.append(self._separator)
+            ids.extend([get(token, unknown[2] if len(token) > 2 else unknown[len(token) - 1])
+                        for token in tokens])
+            counts.append(len(tokens) + 1)
+        return ids, counts
+
+    def score_batch(self, texts: Sequence[str]) -> List[Score]:
+        np = self._np
+        if not texts:
+            return []
+
+        ids, counts = self._token_ids(texts)
+        ids = np.asarray(ids, dtype=np.intp)
+        segment = np.repeat(np.arange(len(texts)), counts)
+        positions = np.arange(len(ids))
+
+        def previous(mask):
+            """Her konumdan önceki son True konumu (yoksa -1)"""
+            marked = np.where(mask, positions, -1)
+            latest = np.maximum.accumulate(marked)
+            return np.concatenate(([-1], latest[:-1]))
+
+        known = self._known[ids]
+        negation = self._negation[ids]
+        modifier = self._modifier[ids] & known
+        ly = self._ly[ids]
+        long_negation = np.cumsum(self._long_negation[ids])
+
+        # Yoğunlaştırıcı: önceki sözlük kelimesi / 3+ karakterlik kelime. "-ly" ile bitmeyen
+        # yoğunlaştırıcıları araya giren "not"/"never" bozar; "-ly" olanlarla birleşir ("really not good").
+        last_modifier = previous(known | self._clears_modifier[ids])
+        has_last = last_modifier >= 0
+        q = np.where(has_last, last_modifier, 0)
+        active = has_last & modifier[q]
+        fused = negation & active & ly[q]
+        modified = known & active & (ly[q] | (long_negation == long_negation[q]))
+
+        # Olumsuzlama: son anlamlı kelime birleşmemiş bir olumsuzlama kelimesiyse
+        last_negation = previous(known | negation | self._clears_negation[ids])
+        j = np.where(last_negation >= 0, last_negation, 0)
+        negated = known & (last_negation >= 0) & negation[j] & ~fused[j]
+
+        # Değerlendirme grupları: yoğunlaştırıcısız her sözlük kelimesi (ve ifade) yeni grup başlatır
+        assessed = self._assessed[ids]
+        starts = assessed & ~modified
+        group_count = int(starts.sum())
+        if group_count == 0:
+            return [(0.0, 0.0)] * len(texts)
+        group_of = np.cumsum(starts) - 1
+
+        members = np.flatnonzero(assessed)
+        member_groups = group_of[members]
+        last = members[np.append(member_groups[1:] != member_groups[:-1], True)]
+        start_positions = np.flatnonzero(starts)
+
+        intensity = self._intensity[ids]
+        intensity = np.where(negated, 1.0 / intensity, intensity)
+
+        # Grubun puanı son kelimeden gelir; çarpan gruptaki bir önceki kelimenin yoğunluğudur
+        polarity = self._polarity[ids[last]]
+        subjectivity = self._subjectivity[ids[last]]
+        previous_member = previous(assessed)[last]
+        multiplier = np.where(starts[last], 1.0, intensity[np.maximum(previous_member, 0)])
+        polarity = np.clip(polarity * multiplier, -1.0, 1.0)
+        subjectivity = np.clip(subjectivity * multiplier, -1.0, 1.0)
+
+        # Ünlem, grubun son kelimesinden sonra geliyorsa polariteyi artırır
+        exclamations = np.flatnonzero(self._exclamation[ids])
+        if len(exclamations):
+            groups = group_of[exclamations]
+            valid = groups >= 0
+            groups_safe = np.where(valid, groups, 0)
+            valid &= (segment[start_positions[groups_safe]] == segment[exclamations])
+            valid &= exclamations > last[groups_safe]
+            boosts = np.bincount(groups_safe[valid], minlength=group_count)
+            polarity = np.clip(polarity * EXCLAMATION_BOOST ** boosts, -1.0, 1.0)
+
+        group_negated = np.bincount(group_of[negated | fused], minlength=group_count) > 0
+        polarity = np.where(group_negated, polarity * -0.5, polarity)
+
+        group_segment = segment[start_positions]
+        totals = np.bincount(group_segment, minlength=len(texts))
+        divisor = np.maximum(totals, 1)
+        polarities = np.bincount(group_segment, weights=polarity, minlength=len(texts)) / divisor
+        subjectivities = np.bincount(group_segment, weights=subjectivity, minlength=len(texts)) / divisor
+        return list(zip(polarities.tolist(), subjectivities.tolist()))
+
+
+BACKENDS = {
+    TextBlobBackend.name: TextBlobBackend,
+    LexiconBackend.name: LexiconBackend,
+}
+
+_backends: Dict[str, SentimentBackend] = {}
+_lock = threading.Lock()
+
+
+def get_sentiment_backend(name: Optional[str] = None) -> SentimentBackend:
+    """
+    Adı verilen motoru döndürür; sözlük süreç başına bir kez yüklenir
+
+    Args:
+        name: 'textblob' veya 'lexicon' (varsayılan: DEFAULT_BACKEND)
+
+    Returns:
+        Paylaşılan SentimentBackend örneği
+    """
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen duygu motoru: {name} (seçenekler: {', '.join(BACKENDS)})")
+
+    backend = _backends.get(name)
+    if backend is None:
+        with _lock:
+            backend = _backends.get(name)
+            if backend is None:
+                backend = _backends[name] = BACKENDS[name]()
+    return backend
+
+
+def compare_backends(texts: Sequence[str], tolerance: float = 1e-9) -> Dict[str, any]:
+    """
+    İki motoru aynı metinlerde karşılaştırır: eşlik (parity) ve hız
+
+    Args:
+        texts: Metinler (ör. alt yazı parçaları)
+        tolerance: İzin verilen mutlak fark
+
+    Returns:
+        Uyuşmayan metinler, en büyük fark ve her motor için parça/saniye
+    """
+    reference = get_sentiment_backend('textblob')
+    candidate = get_sentiment_backend('lexicon')
+
+    started = time.perf_counter()
+    expected = reference.score_batch(texts)
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = candidate.score_batch(texts)
+    candidate_seconds = time.perf_counter() - started
+
+    mismatches = []
+    max_diff = 0.0
+    for text, want, got in zip(texts, expected, actual):
+        diff = max(abs(want[0] - got[0]), abs(want[1] - got[1]))
+        max_diff = max(max_diff, diff)
+        if diff > tolerance:
+            mismatches.append({'text': text, 'textblob': want, 'lexicon': got})
+
+    return {
+        'texts': len(texts),
+        'mismatches': mismatches,
+        'max_diff': max_diff,
+        'textblob_per_second': round(len(texts) / reference_seconds, 1) if reference_seconds else None,
+        'lexicon_per_second': round(len(texts) / candidate_seconds, 1) if candidate_seconds else None,
+        'speedup': round(reference_seconds / candidate_seconds, 2) if candidate_seconds else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sözlük motorunu TextBlob ile karşılaştırır (eşlik ve hız)")
+    parser.add_argument('corpus', help="Her satırı bir parça olan metin dosyası")
+    parser.add_argument('--repeat', type=int, default=1, help="Hız ölçümü için korpusu çoğalt")
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, 'r', encoding='utf-8') as f:
+        texts = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    # Isınma: sözlük yükleme süresi ölçüme girmesin
+    get_sentiment_backend('textblob').score('good')
+    get_sentiment_backend('lexicon').score('good')
+
+    report = compare_backends(texts * max(1, args.repeat))
+    for mismatch in report['mismatches'][:20]:
+        print(f"❌ {mismatch['text']!r}: textblob={mismatch['textblob']} lexicon={mismatch['lexicon']}")
+
+    print(f"📊 {report['texts']} parça, {len(report['mismatches'])} uyuşmazlık, en büyük fark {report['max_diff']:.2e}")
+    print(f"⏱️  textblob: {report['textblob_per_second']} parça/s, lexicon: {report['lexicon_per_second']} parça/s "
+          f"({report['speedup']}x)")
+    return 0 if not report['mismatches'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
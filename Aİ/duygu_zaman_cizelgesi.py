@@ -0,0 +1,175 @@
+"""
+Duygu zaman çizelgesi
+Her alt yazı parçası bir kez puanlanır; kayan pencerelerdeki ortalama polarite ve
+subjektivite önek toplamlarıyla hesaplanır. Böylece her pencere boyutu parça
+sayısına göre doğrusal sürede biter ve birden fazla pencere aynı puanları paylaşır.
+"""
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from transcript import Transcript
+
+# Varsayılan pencere boyutları (saniye)
+DEFAULT_WINDOWS = (30, 60)
+
+# Her pencere için raporlanan tepe/dip sayısı ve her tepe için gösterilen parça sayısı
+DEFAULT_TOP_K = 3
+DRIVER_SEGMENTS = 3
+
+# texts -> [(polarity, subjectivity), ...]
+BatchScorer = Callable[[Sequence[str]], List[Tuple[float, float]]]
+
+
+def textblob_scorer(texts: Sequence[str]) -> List[Tuple[float, float]]:
+    """TextBlob ile parça parça puanlama"""
+    from textblob import TextBlob
+
+    scores = []
+    for text in texts:
+        sentiment = TextBlob(text).sentiment
+        scores.append((sentiment.polarity, sentiment.subjectivity))
+    return scores
+
+
+class _SegmentScores:
+    """Parça puanları ve önek toplamları (ağırlık = kelime sayısı)"""
+
+    def __init__(self, segments: Transcript, scorer: BatchScorer):
+        texts = segments.texts()
+        scores = scorer(texts)
+
+        self.polarity = array('d', (score[0] for score in scores))
+        self.subjectivity = array('d', (score[1] for score in scores))
+        self.weight = array('d', (max(1, len(text.split())) for text in texts))
+
+        # prefix[i] = ilk i parçanın ağırlıklı toplamı
+        self.prefix_pol = array('d', [0.0])
+        self.prefix_subj = array('d', [0.0])
+        self.prefix_weight = array('d', [0.0])
+        for pol, subj, weight in zip(self.polarity, self.subjectivity, self.weight):
+            self.prefix_pol.append(self.prefix_pol[-1] + pol * weight)
+            self.prefix_subj.append(self.prefix_subj[-1] + subj * weight)
+            self.prefix_weight.append(self.prefix_weight[-1] + weight)
+
+    def mean(self, lo: int, hi: int) -> Tuple[float, float]:
+        """[lo, hi) parçalarının ağırlıklı ortalaması, O(1)"""
+        weight = self.prefix_weight[hi] - self.prefix_weight[lo]
+        if weight <= 0:
+            return 0.0, 0.0
+        return ((self.prefix_pol[hi] - self.prefix_pol[lo]) / weight,
+                (self.prefix_subj[hi] - self.prefix_subj[lo]) / weight)
+
+
+def _window_curve(segments: Transcript, scores: _SegmentScores, window_ms: int, step_ms: int) -> List[Dict]:
+    """Pencereyi step_ms adımlarla kaydırır; iki işaretçi sayesinde toplam O(n + adım)"""
+    starts = segments.starts
+    count = len(starts)
+    end_ms = segments.end_ms
+
+    points = []
+    lo = hi = 0
+    position = 0
+    while position < max(end_ms, 1):
+        window_end = position + window_ms
+        # Başlangıcı [position, window_end) aralığında olan parçalar
+        while lo < count and starts[lo] < position:
+            lo += 1
+        if hi < lo:
+            hi = lo
+        while hi < count and starts[hi] < window_end:
+            hi += 1
+
+        if hi > lo:
+            polarity, subjectivity = scores.mean(lo, hi)
+            points.append({
+                'start': position / 1000,
+                'end': window_end / 1000,
+                'polarity': round(polarity, 4),
+                'subjectivity': round(subjectivity, 4),
+                'segments': hi - lo,
+                '_range': (lo, hi),
+            })
+        position += step_ms
+    return points
+
+
+def _extremes(points: List[Dict], top_k: int, highest: bool) -> List[Dict]:
+    """Birbiriyle çakışmayan en yüksek (veya en düşük) pencereler"""
+    ordered = sorted(points, key=lambda point: point['polarity'], reverse=highest)
+    chosen = []
+    for point in ordered:
+        if len(chosen) >= top_k:
+            break
+        if (highest and point['polarity'] <= 0) or (not highest and point['polarity'] >= 0):
+            break
+        if any(point['start'] < other['end'] and other['start'] < point['end'] for other in chosen):
+            continue
+        chosen.append(point)
+    return sorted(chosen, key=lambda point: point['start'])
+
+
+def _drivers(segments: Transcript, scores: _SegmentScores, point: Dict, positive: bool) -> List[Dict]:
+    """Pencerenin polaritesini en çok etkileyen parçalar"""
+    lo, hi = point['_range']
+    sign = 1 if positive else -1
+    indices = sorted(range(lo, hi), key=lambda i: sign * scores.polarity[i] * scores.weight[i], reverse=True)
+
+    drivers = []
+    for index in indices[:DRIVER_SEGMENTS]:
+        if sign * scores.polarity[index] <= 0:
+            break
+        start_ms, end_ms, text = segments[index]
+        drivers.append({
+            'start': start_ms / 1000,
+            'end': end_ms / 1000,
+            'text': text,
+            'polarity': round(scores.polarity[index], 4),
+        })
+    return drivers
+
+
+def sentiment_timeline(segments: Transcript, windows: Sequence[float] = DEFAULT_WINDOWS,
+                       scorer: Optional[BatchScorer] = None, top_k: int = DEFAULT_TOP_K) -> Dict[str, any]:
+    """
+    Video süresi boyunca kayan pencere duygu eğrisini hesaplar
+
+    Args:
+        segments: Zaman damgalı transkript
+        windows: Pencere boyutları (saniye); adım pencerenin yarısıdır
+        scorer: Parça metinlerini toplu puanlayan fonksiyon (varsayılan: TextBlob)
+        top_k: Her pencere için raporlanacak tepe ve dip sayısı
+
+    Returns:
+        Her pencere için eğri (points), tepeler (peaks) ve dipler (troughs);
+        tepe/diplerde onları belirleyen parçalar (drivers) bulunur
+    """
+    scores = _SegmentScores(segments, scorer or textblob_scorer)
+
+    result = {
+        'segment_count': len(segments),
+        'duration': segments.end_ms / 1000,
+        'windows': {},
+    }
+
+    for window in windows:
+        window_ms = max(1, int(window * 1000))
+        step_ms = max(1, window_ms // 2)
+        points = _window_curve(segments, scores, window_ms, step_ms)
+
+        peaks = [dict(point, drivers=_drivers(segments, scores, point, positive=True))
+                 for point in _extremes(points, top_k, highest=True)]
+        troughs = [dict(point, drivers=_drivers(segments, scores, point, positive=False))
+                   for point in _extremes(points, top_k, highest=False)]
+
+        for point in points + peaks + troughs:
+            point.pop('_range', None)
+
+        result['windows'][f"{window:g}s"] = {
+            'window': window,
+            'step': step_ms / 1000,
+            'points': points,
+            'peaks': peaks,
+            'troughs': troughs,
+        }
+
+    return result
@@ -0,0 +1,118 @@
+"""
+Paylaşılan HTTP oturumu
+Alt yazı isteklerinin hepsi aynı timedtext sunucusuna gider; her istekte yeni
+TCP+TLS bağlantısı açmak yerine tek, iş parçacığı güvenli ve bağlantı havuzlu
+bir requests.Session kullanılır.
+"""
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 16
+
+# Host bazlı havuz boyutları (URL öneki -> aynı anda açık tutulacak bağlantı sayısı)
+DEFAULT_HOST_POOL_SIZES = {
+    'https://www.youtube.com/': 32,
+}
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_config = {
+    'pool_connections': DEFAULT_POOL_CONNECTIONS,
+    'pool_maxsize': DEFAULT_POOL_MAXSIZE,
+    'host_pool_sizes': dict(DEFAULT_HOST_POOL_SIZES),
+    'retries': 2,
+}
+
+
+def _accept_encoding() -> str:
+    """urllib3'ün çözebildiği sıkıştırma türleri (br sadece brotli kuruluysa)"""
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append('br')
+        except ImportError:
+            pass
+    return ', '.join(encodings)
+
+
+def _make_adapter(pool_maxsize: int) -> HTTPAdapter:
+    retry = Retry(
+        total=_config['retries'],
+        connect=_config['retries'],
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+    )
+    return HTTPAdapter(
+        pool_connections=_config['pool_connections'],
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update({
+        'Accept-Encoding': _accept_encoding(),
+        'Connection': 'keep-alive',
+    })
+
+    default_adapter = _make_adapter(_config['pool_maxsize'])
+    session.mount('https://', default_adapter)
+    session.mount('http://', default_adapter)
+
+    # requests en uzun eşleşen öneki seçer; host'a özel havuzlar varsayılanı geçersiz kılar
+    for prefix, pool_maxsize in _config['host_pool_sizes'].items():
+        session.mount(prefix, _make_adapter(pool_maxsize))
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Süreç genelinde paylaşılan HTTP oturumunu döndürür
+
+    Returns:
+        Bağlantı havuzlu, keep-alive ve gzip/br destekli requests.Session
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def configure_http_session(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                           host_pool_sizes: Optional[Dict[str, int]] = None, retries: Optional[int] = None):
+    """
+    Havuz ayarlarını değiştirir; mevcut oturum kapatılır ve bir sonraki istekte yeniden oluşturulur
+
+    Args:
+        pool_connections: Önbellekte tutulacak host havuzu sayısı
+        pool_maxsize: Host başına varsayılan en fazla bağlantı
+        host_pool_sizes: URL öneki -> bağlantı sayısı (ör. {'https://www.youtube.com/': 64})
+        retries: Bağlantı hatalarında tekrar deneme sayısı
+    """
+    global _session
+    with _lock:
+        if pool_connections is not None:
+            _config['pool_connections'] = pool_connections
+        if pool_maxsize is not None:
+            _config['pool_maxsize'] = pool_maxsize
+        if host_pool_sizes is not None:
+            _config['host_pool_sizes'].update(host_pool_sizes)
+        if retries is not None:
+            _config['retries'] = retries
+
+        if _session is not None:
+            _session.close()
+            _session = None
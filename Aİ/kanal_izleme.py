@@ -0,0 +1,550 @@
+"""
+Kanal İzleme
+Kanalların yalnızca yeni yüklenen videolarını analiz eder. Her kanal için bir
+filigran (son görülen video ID'leri ve en son yükleme tarihi) saklanır. Kanal
+listesi yt-dlp ile işlenmeden (process=False) düz olarak okunur; yt-dlp sayfaları
+ancak istendikçe çeker ve bilinen bir videoya ulaşılınca listeleme durur, sonraki
+sayfalar hiç indirilmez.
+
+Çökmeye dayanıklılık: yeni ID'ler filigranla aynı işlemde bekleme kuyruğuna
+yazılır; kuyruktaki video ancak sonucu sonuç deposuna yazıldıktan sonra silinir.
+Yarıda kalan çalışma bir sonraki çalıştırmada kuyruktan devam eder (aynı sonucun
+tekrar yazılması depoda güncelleme olur).
+
+Kanal sekmeleri en yeni video başta listelendiği için filigran kanal URL'lerinde
+doğru çalışır; sırası değişebilen oynatma listelerinde yeni videolar atlanabilir.
+
+Kullanım:
+    python kanal_izleme.py kanallar.txt
+    python kanal_izleme.py "https://www.youtube.com/@kanal" --ai --workers 8
+    python kanal_izleme.py kanallar.txt --interval 3600 --initial 5
+    python kanal_izleme.py --status
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from duygu_motoru import BACKENDS, DEFAULT_BACKEND
+from sonuc_deposu import DEFAULT_BATCH_SIZE, ResultStore
+from sonuc_deposu import default_db_path as default_store_path
+from toplu_analiz import MAX_PLAYLIST_DEPTH, BatchSummary, _channel_videos_url, analyze_batch, read_url_file
+from transcript_cache import DEFAULT_CACHE_DIR
+from youtube_url import extract_video_id, video_url
+
+DEFAULT_DB_NAME = 'watch.sqlite3'
+# İlk taramada (filigran yokken) kuyruğa alınacak en yeni video sayısı
+DEFAULT_INITIAL = 20
+# Filigranda saklanan son video ID'si sayısı (son video silinse de listeleme durabilsin)
+WATERMARK_SIZE = 50
+# Filigrandaki hiçbir video bulunamazsa listeleme bu kadar videoda kesilir
+DEFAULT_MAX_NEW = 500
+# Bu kadar başarısız denemeden sonra video kuyruktan çıkarılır
+MAX_ATTEMPTS = 3
+# Başarısız video en erken bu kadar saniye sonra tekrar denenir (her denemede iki katı);
+# geçici kesintiler (hız sınırı, ağ) deneme hakkını aynı turda bitirmesin
+DEFAULT_RETRY_DELAY = 15 * 60
+DEFAULT_SCAN_WORKERS = 4
+
+YDL_FLAT_OPTIONS = {
+    'extract_flat': 'in_playlist',
+    'skip_download': True,
+    'quiet': True,
+    'no_warnings': True,
+}
+
+
+def default_db_path(cache_dir: Optional[str] = None) -> str:
+    """Önbellek klasöründeki watch.sqlite3 (VIDEO_CACHE_DIR veya ~/.cache/video_duygu_analizi)"""
+    return os.path.join(cache_dir or os.getenv('VIDEO_CACHE_DIR') or DEFAULT_CACHE_DIR, DEFAULT_DB_NAME)
+
+
+class WatchState:
+    """Kanal filigranları ve bekleme kuyruğu (SQLite)"""
+
+    def __init__(self, path: Optional[str] = None, retry_delay: float = DEFAULT_RETRY_DELAY):
+        """
+        Args:
+            path: SQLite dosyası (varsayılan: önbellek klasöründe watch.sqlite3)
+            retry_delay: Başarısız videonun tekrar denenmesi için ilk bekleme (saniye)
+        """
+        self.path = path or default_db_path()
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._transaction():
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS channels (
+                    source TEXT PRIMARY KEY,
+                    channel_id TEXT,
+                    known_ids TEXT NOT NULL,
+                    last_video_id TEXT,
+                    last_upload_date TEXT,
+                    checked_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pending (
+                    video_id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    added_at REAL NOT NULL,
+                    position INTEGER NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    last_attempt_at REAL
+                )
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pending)")}
+            if 'last_attempt_at' not in columns:
+                self._conn.execute("ALTER TABLE pending ADD COLUMN last_attempt_at REAL")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pending_order ON pending (added_at, position)")
+
+    def __enter__(self) -> 'WatchState':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def watermark(self, source: str) -> Optional[Dict[str, Any]]:
+        """Kanalın filigranı (hiç taranmadıysa None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT channel_id, known_ids, last_video_id, last_upload_date, checked_at FROM channels WHERE source = ?",
+                (source,)).fetchone()
+        if row is None:
+            return None
+        return {'channel_id': row[0], 'known_ids': json.loads(row[1]), 'last_video_id': row[2],
+                'last_upload_date': row[3], 'checked_at': row[4]}
+
+    def record_scan(self, source: str, seen_ids: List[str], queue_ids: List[str], channel_id: Optional[str] = None):
+        """
+        Tarama sonucunu tek işlemde yazar: yeni videolar kuyruğa, filigran güncellenir
+
+        Args:
+            source: Kanal URL'si
+            seen_ids: Listelemede görülen yeni ID'ler (en yeni başta)
+            queue_ids: Bunlardan analiz edilecekler
+            channel_id: Kanal ID'si (biliniyorsa)
+        """
+        now = time.time()
+        with self._transaction():
+            row = self._conn.execute("SELECT known_ids, last_video_id FROM channels WHERE source = ?",
+                                     (source,)).fetchone()
+            known = json.loads(row[0]) if row else []
+            last_video_id = seen_ids[0] if seen_ids else (row[1] if row else None)
+            # En eski video önce analiz edilsin: position büyükten küçüğe okunur
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO pending (video_id, source, added_at, position) VALUES (?, ?, ?, ?)",
+                [(video_id, source, now, position) for position, video_id in enumerate(queue_ids)])
+            self._conn.execute("""
+                INSERT INTO channels (source, channel_id, known_ids, last_video_id, checked_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (source) DO UPDATE SET
+                    channel_id = COALESCE(excluded.channel_id, channels.channel_id),
+                    known_ids = excluded.known_ids,
+                    last_video_id = excluded.last_video_id,
+                    checked_at = excluded.checked_at
+            """, (source, channel_id, json.dumps((seen_ids + known)[:WATERMARK_SIZE]), last_video_id, now))
+
+    def pending(self, limit: Optional[int] = None, due: bool = False) -> List[Dict[str, Any]]:
+        """
+        Kuyruktaki videolar (eklenme sırasına göre, aynı taramada en eskisi önce)
+
+        Args:
+            limit: En fazla kayıt
+            due: Yalnızca denenme zamanı gelenler (başarısız videolar retry_delay * 2^(deneme-1) bekler)
+        """
+        sql = "SELECT video_id, source, attempts, last_error FROM pending"
+        params: List[Any] = []
+        if due:
+            sql += " WHERE attempts = 0 OR last_attempt_at IS NULL OR last_attempt_at + ? * (1 << (attempts - 1)) <= ?"
+            params += [self.retry_delay, time.time()]
+        sql += " ORDER BY added_at, position DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [{'video_id': row[0], 'source': row[1], 'attempts': row[2], 'last_error': row[3]} for row in rows]
+
+    def complete(self, done: List[Tuple[str, Optional[str]]]):
+        """
+        Analizi depoya yazılmış videoları kuyruktan siler, kanalın en son yükleme tarihini günceller
+
+        Args:
+            done: (video_id, upload_date) çiftleri
+        """
+        if not done:
+            return
+        with self._transaction():
+            for video_id, upload_date in done:
+                row = self._conn.execute("SELECT source FROM pending WHERE video_id = ?", (video_id,)).fetchone()
+                self._conn.execute("DELETE FROM pending WHERE video_id = ?", (video_id,))
+                if row and upload_date:
+                    self._conn.execute("""
+                        UPDATE channels SET last_upload_date = ?
+                        WHERE source = ? AND (last_upload_date IS NULL OR last_upload_date < ?)
+                    """, (upload_date, row[0], upload_date))
+
+    def fail(self, video_id: str, error: str) -> bool:
+        """
+        Başarısız denemeyi kaydeder
+
+        Returns:
+            Deneme sınırına ulaşıp kuyruktan çıkarıldıysa True
+        """
+        with self._transaction():
+            self._conn.execute("""
+                UPDATE pending SET attempts = attempts + 1, last_error = ?, last_attempt_at = ? WHERE video_id = ?
+            """, (error, time.time(), video_id))
+            dropped = self._conn.execute("DELETE FROM pending WHERE video_id = ? AND attempts >= ?",
+                                         (video_id, MAX_ATTEMPTS)).rowcount
+        return dropped > 0
+
+    def channels(self) -> List[Dict[str, Any]]:
+        """Kanallar ve kuyruktaki video sayıları"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT channels.source, channel_id, last_video_id, last_upload_date, checked_at,
+                       (SELECT COUNT(*) FROM pending WHERE pending.source = channels.source)
+                FROM channels ORDER BY source
+            """).fetchall()
+        return [{'source': row[0], 'channel_id': row[1], 'last_video_id': row[2], 'last_upload_date': row[3],
+                 'checked_at': row[4], 'pending': row[5]} for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _youtube_dl():
+    from yt_dlp import YoutubeDL
+    return YoutubeDL(dict(YDL_FLAT_OPTIONS))
+
+
+def _lazy_video_ids(ydl, url: str, meta: Dict[str, Any], depth: int = 0) -> Iterator[str]:
+    """
+    Listedeki video ID'lerini sayfa sayfa üretir (işlenmemiş sonuç: girdiler tembel üretilir)
+
+    Args:
+        ydl: YoutubeDL örneği
+        url: Kanal sekmesi veya oynatma listesi URL'si
+        meta: Bulunursa 'channel_id' buraya yazılır
+    """
+    info = ydl.extract_info(url, download=False, process=False)
+    if not info:
+        return
+    if info.get('_type') in ('url', 'url_transparent') and info.get('url') and depth < MAX_PLAYLIST_DEPTH:
+        # Yönlendirme (ör. kanal adı -> kanal ID'si)
+        yield from _lazy_video_ids(ydl, info['url'], meta, depth + 1)
+        return
+    if info.get('channel_id'):
+        meta.setdefault('channel_id', info['channel_id'])
+
+    entries = info.get('entries')
+    if entries is None:
+        video_id = info.get('id')
+        if video_id and extract_video_id(video_id):
+            yield video_id
+        return
+
+    for entry in entries:
+        if not entry:
+            continue
+
+        video_id = entry.get('id')
+        entry_url = entry.get('url') or entry.get('webpage_url')
+        if entry.get('ie_key') in (None, 'Youtube') and video_id and extract_video_id(video_id):
+            yield video_id
+        elif entry_url and depth < MAX_PLAYLIST_DEPTH:
+            yield from _lazy_video_ids(ydl, entry_url, meta, depth + 1)
+
+
+def scan_channel(ydl, source: str, watermark: Optional[Dict[str, Any]], initial: int = DEFAULT_INITIAL,
+                 max_new: int = DEFAULT_MAX_NEW) -> Dict[str, Any]:
+    """
+    Kanalı filigrana kadar listeler
+
+    Args:
+        ydl: YoutubeDL örneği
+        source: Kanal URL'si
+        watermark: WatchState.watermark sonucu (None: ilk tarama)
+        initial: İlk taramada kuyruğa alınacak en yeni video sayısı (0: yalnızca filigran kaydedilir)
+        max_new: Filigrana ulaşılamazsa listelenecek en fazla video
+
+    Returns:
+        seen_ids (en yeni başta), queue_ids, channel_id, first_scan ve reached_watermark
+    """
+    known = set(watermark['known_ids']) if watermark else set()
+    limit = min(max(initial, 1), max_new) if watermark is None else max_new
+    meta: Dict[str, Any] = {}
+    seen_ids: List[str] = []
+    reached = False
+
+    ids = _lazy_video_ids(ydl, _channel_videos_url(source), meta)
+    try:
+        for video_id in ids:
+            if video_id in known:
+                reached = True
+                break
+            if video_id in seen_ids:
+                continue
+            seen_ids.append(video_id)
+            if len(seen_ids) >= limit:
+                break
+    finally:
+        ids.close()
+
+    queue_ids = seen_ids[:initial] if watermark is None else seen_ids
+    return {'seen_ids': seen_ids, 'queue_ids': queue_ids, 'channel_id': meta.get('channel_id'),
+            'first_scan': watermark is None, 'reached_watermark': reached}
+
+
+def scan_channels(state: WatchState, sources: List[str], initial: int = DEFAULT_INITIAL,
+                  max_new: int = DEFAULT_MAX_NEW, workers: int = DEFAULT_SCAN_WORKERS,
+                  ydl_factory: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    """
+    Kanalları paralel tarar ve yeni videoları kuyruğa yazar
+
+    Args:
+        state: WatchState
+        sources: Kanal URL'leri
+        initial: İlk taramada kuyruğa alınacak en yeni video sayısı
+        max_new: Filigrana ulaşılamazsa listelenecek en fazla video
+        workers: Aynı anda taranacak kanal sayısı
+        ydl_factory: YoutubeDL oluşturan fonksiyon (varsayılan: düz listeleme seçenekleriyle yt-dlp)
+
+    Returns:
+        Tarama özeti (channels, failed, new_videos)
+    """
+    factory = ydl_factory or _youtube_dl
+    local = threading.local()
+    instances = []
+    instances_lock = threading.Lock()
+
+    def scan(source: str) -> Dict[str, Any]:
+        ydl = getattr(local, 'ydl', None)
+        if ydl is None:
+            ydl = local.ydl = factory()
+            with instances_lock:
+                instances.append(ydl)
+        try:
+            found = scan_channel(ydl, source, state.watermark(source), initial=initial, max_new=max_new)
+        except Exception as e:
+            return {'source': source, 'error': str(e) or type(e).__name__}
+        state.record_scan(source, found['seen_ids'], found['queue_ids'], found['channel_id'])
+        return {'source': source, **found}
+
+    summary = {'channels': 0, 'failed': 0, 'new_videos': 0}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='scan') as executor:
+            for result in executor.map(scan, sources):
+                summary['channels'] += 1
+                if 'error' in result:
+                    summary['failed'] += 1
+                    print(f"❌ {result['source']}: {result['error']}", file=sys.stderr)
+                    continue
+                summary['new_videos'] += len(result['queue_ids'])
+                note = ''
+                if result['first_scan']:
+                    note = ' (ilk tarama)'
+                elif not result['reached_watermark'] and result['seen_ids']:
+                    note = ' (filigrana ulaşılamadı)'
+                print(f"🔎 {result['source']}: {len(result['queue_ids'])} yeni video{note}", file=sys.stderr)
+    finally:
+        for ydl in instances:
+            close = getattr(ydl, 'close', None)
+            if close:
+                close()
+    return summary
+
+
+def process_pending(state: WatchState, store: ResultStore, analyzer, workers: int = 4, use_ai: bool = False,
+                    timeline: bool = False, output=None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Denenme zamanı gelen kuyruk videolarını analiz eder; sonuç depoya yazılınca video kuyruktan silinir
+
+    Args:
+        state: WatchState
+        store: Sonuçların yazılacağı sonuc_deposu.ResultStore
+        analyzer: VideoDuyguAnalizi örneği
+        workers: Aynı anda analiz edilecek video sayısı
+        use_ai: OpenAI ile detaylı analiz yap
+        timeline: Duygu zaman çizelgesi çıkar
+        output: Verilirse kayıtlar NDJSON olarak buraya da yazılır
+        limit: Bu çalışmada en fazla analiz edilecek video
+
+    Returns:
+        Çalışma özeti (total, ok, failed, dropped, ...)
+    """
+    items = state.pending(limit, due=True)
+    summary = BatchSummary()
+    dropped = 0
+    done: List[Tuple[str, Optional[str]]] = []
+
+    def commit_done():
+        # Önce depo, sonra kuyruk: çökme olursa video tekrar analiz edilir ama kaybolmaz
+        store.flush()
+        state.complete(done)
+        done.clear()
+
+    try:
+        urls = (video_url(item['video_id']) for item in items)
+        for record in analyze_batch(analyzer, urls, workers=workers, use_ai=use_ai, timeline=timeline):
+            summary.add(record)
+            if output is not None:
+                output.write(json.dumps(record, ensure_ascii=False) + '\n')
+                output.flush()
+
+            if record['status'] == 'ok':
+                store.add(record['result'], url=record['url'])
+                done.append((record['video_id'], (record['result'].get('video') or {}).get('upload_date')))
+                if len(done) >= store.batch_size:
+                    commit_done()
+                print(f"✅ [{summary.total}/{len(items)}] {record['url']} ({record['elapsed']}s)", file=sys.stderr)
+            else:
+                if state.fail(record['video_id'], record['error']):
+                    dropped += 1
+                print(f"❌ [{summary.total}/{len(items)}] {record['url']}: {record['error']}", file=sys.stderr)
+    finally:
+        commit_done()
+
+    result = summary.to_dict()
+    result['dropped'] = dropped
+    return result
+
+
+def watch_once(state: WatchState, store: ResultStore, analyzer, sources: List[str], initial: int = DEFAULT_INITIAL,
+               max_new: int = DEFAULT_MAX_NEW, scan_workers: int = DEFAULT_SCAN_WORKERS, workers: int = 4,
+               use_ai: bool = False, timeline: bool = False, output=None, ydl_factory=None) -> Dict[str, Any]:
+    """
+    Tek izleme turu: tarama, ardından kuyruk (önceki çalışmadan kalanlar ve yeni videolar) tek geçişte
+
+    Kuyruk turda bir kez işlenir; başarısız video aynı turda tekrar denenmez.
+
+    Returns:
+        {'scan': ..., 'analysis': ...}
+    """
+    if state.pending(1):
+        print("⏯️  Önceki çalışmadan kalan kuyruk da işlenecek", file=sys.stderr)
+    result = {'scan': scan_channels(state, sources, initial=initial, max_new=max_new, workers=scan_workers,
+                                    ydl_factory=ydl_factory)}
+    result['analysis'] = process_pending(state, store, analyzer, workers=workers, use_ai=use_ai,
+                                         timeline=timeline, output=output)
+    return result
+
+
+def _read_sources(values: List[str]) -> List[str]:
+    """Argümanlardaki kanal URL'leri ve kanal listesi dosyaları (aynı kanal bir kez)"""
+    sources = []
+    for value in values:
+        for source in (read_url_file(value) if os.path.isfile(value) else [value]):
+            source = _channel_videos_url(source)
+            if source not in sources:
+                sources.append(source)
+    return sources
+
+
+def print_status(state: WatchState):
+    for channel in state.channels():
+        checked = time.strftime('%Y-%m-%d %H:%M', time.localtime(channel['checked_at']))
+        print(f"{channel['source']}  son: {channel['last_video_id'] or '-'} "
+              f"({channel['last_upload_date'] or '----------'})  taranma: {checked}  kuyruk: {channel['pending']}")
+    print(f"📊 Kuyrukta {len(state.pending())} video ({state.path})", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Kanalları izler, yalnızca yeni yüklenen videoları analiz eder")
+    parser.add_argument('sources', nargs='*', help="Kanal URL'leri veya her satırda bir kanal olan dosyalar")
+    parser.add_argument('--initial', type=int, default=DEFAULT_INITIAL,
+                        help=f"Yeni eklenen kanalda analiz edilecek en yeni video sayısı (varsayılan: {DEFAULT_INITIAL})")
+    parser.add_argument('--max-new', type=int, default=DEFAULT_MAX_NEW,
+                        help=f"Filigrana ulaşılamazsa kanal başına listelenecek en fazla video (varsayılan: {DEFAULT_MAX_NEW})")
+    parser.add_argument('-w', '--workers', type=int, default=4, help="Aynı anda analiz edilecek video sayısı (varsayılan: 4)")
+    parser.add_argument('--scan-workers', type=int, default=DEFAULT_SCAN_WORKERS,
+                        help=f"Aynı anda taranacak kanal sayısı (varsayılan: {DEFAULT_SCAN_WORKERS})")
+    parser.add_argument('--interval', type=float,
+                        help="Verilirse bu kadar saniyede bir yeniden tara (varsayılan: tek tur)")
+    parser.add_argument('--retry-delay', type=float, default=DEFAULT_RETRY_DELAY,
+                        help=f"Başarısız video en erken bu kadar saniye sonra tekrar denenir, her denemede iki katı "
+                             f"(varsayılan: {DEFAULT_RETRY_DELAY})")
+    parser.add_argument('--ai', action='store_true', help="OpenAI ile detaylı analiz yap")
+    parser.add_argument('--timeline', action='store_true', help="Duygu zaman çizelgesini çıkar")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="Duygu motoru: textblob veya aynı sonucu daha hızlı veren lexicon (varsayılan: textblob)")
+    parser.add_argument('-o', '--output', help="Kayıtları ayrıca bu NDJSON dosyasına ekle")
+    parser.add_argument('--state', help="Filigran ve kuyruk dosyası (varsayılan: önbellek klasöründe watch.sqlite3)")
+    parser.add_argument('--store', help="Sonuç deposu (varsayılan: önbellek klasöründe results.sqlite3)")
+    parser.add_argument('--store-batch', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Depoya her işlemde yazılacak sonuç sayısı (varsayılan: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--status', action='store_true', help="Kanalların filigranlarını ve kuyruğu göster")
+    args = parser.parse_args(argv)
+
+    state = WatchState(args.state, retry_delay=args.retry_delay)
+    if args.status:
+        with state:
+            print_status(state)
+        return 0
+
+    sources = _read_sources(args.sources)
+    if not sources and not state.pending(1):
+        state.close()
+        parser.error("en az bir kanal URL'si veya kanal listesi dosyası gerekli")
+
+    # http_session requests'i yükler; içe aktarma hızlı kalsın diye burada
+    from http_session import DEFAULT_HOST_POOL_SIZES, configure_http_session
+
+    configure_http_session(host_pool_sizes={prefix: max(size, args.workers * 2)
+                                            for prefix, size in DEFAULT_HOST_POOL_SIZES.items()})
+
+    from video_duygu_analizi import VideoDuyguAnalizi
+    analyzer = VideoDuyguAnalizi(verbose=False, sentiment_backend=args.backend)
+    store = ResultStore(args.store or default_store_path(), batch_size=args.store_batch)
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+    failed = 0
+    try:
+        while True:
+            summary = watch_once(state, store, analyzer, sources, initial=args.initial, max_new=args.max_new,
+                                 scan_workers=args.scan_workers, workers=args.workers, use_ai=args.ai,
+                                 timeline=args.timeline, output=output)
+            print("\n📊 Özet: " + json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+            failed = summary['scan']['failed'] + summary['analysis']['failed']
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n⏹️  Durduruldu; kuyruktaki videolar bir sonraki çalıştırmada işlenecek", file=sys.stderr)
+        return 130
+    finally:
+        if output:
+            output.close()
+        store.close()
+        state.close()
+        analyzer.close()
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,686 @@
+"""
+Çevrimdışı performans ölçümü (benchmark)
+YouTube'a ve OpenAI'ye gitmeden projenin hızını ölçer. Ağa çıkan parçalar yerel
+sunuculara yönlendirilir: yt-dlp extract_info cevabı (fixtures/extract_info.json,
+kayıttan kırpılmış) ve json3/srv3/VTT alt yazı gövdeleri gecikme eklenebilen yerel
+bir HTTP sunucusundan, OpenAI cevapları openai_stub'dan gelir. Alt yazı gövdeleri
+fixtures/duygu_korpusu.txt satırlarından YouTube'un otomatik alt yazı biçiminde
+(kelime zamanları, VTT'de kayan cue'lar) istenen sürede (1 dk - 10 saat) üretilir.
+
+Ölçümler:
+    parse      Alt yazı ayrıştırma + transkript oluşturma (MB/s), biçim ve süre başına
+    sentiment  Duygu motoru (parça/s), motor başına
+    e2e        analyze_video_async ile uçtan uca video/s, eşzamanlılık düzeyi başına
+
+Her ölçüm ayrı bir süreçte çalışır; en yüksek RSS o ölçüme aittir (--no-isolate
+ile tek süreçte çalışır ve RSS kümülatif olur). Sonuçlar JSON olarak
+kiyaslama_sonuclari/ klasörüne (veya --output) yazılır; --compare ile önceki bir
+sonuçla karşılaştırılır ve hız --tolerance'tan fazla düşerse veya RSS
+--rss-tolerance'tan fazla artarsa 1 ile çıkar.
+
+Kullanım:
+    python kiyaslama.py --output kiyaslama_sonuclari/taban.json
+    python kiyaslama.py --quick --compare kiyaslama_sonuclari/taban.json
+    python kiyaslama.py --only e2e --concurrency 1 8 32 --latency 0.1 --ai
+    python kiyaslama.py --serve --port 8766      # yalnızca yerel alt yazı sunucusu
+"""
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+RESULTS_VERSION = 1
+RESULTS_DIR = 'kiyaslama_sonuclari'
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+CORPUS_PATH = os.path.join(FIXTURES_DIR, 'duygu_korpusu.txt')
+INFO_FIXTURE_PATH = os.path.join(FIXTURES_DIR, 'extract_info.json')
+
+GROUPS = ('parse', 'sentiment', 'e2e')
+CAPTION_FORMATS = ('json3', 'srv3', 'vtt')
+
+# Ön ayarlar: --quick CI için birkaç saniyede biter
+PRESETS = {
+    'full': {
+        'durations': [1, 10, 60, 600],
+        'segments': 10000,
+        'concurrency': [1, 4, 16],
+        'videos': 32,
+        'repeat': 3,
+    },
+    'quick': {
+        'durations': [1, 10],
+        'segments': 2000,
+        'concurrency': [1, 4],
+        'videos': 8,
+        'repeat': 1,
+    },
+}
+
+# Üretilen alt yazılarda kelime süresi ve satır arası boşluk (milisaniye)
+WORD_MS = 330
+LINE_GAP_MS = 200
+
+DEFAULT_LATENCY = 0.05
+DEFAULT_INFO_LATENCY = 0.2
+DEFAULT_AI_LATENCY = 0.3
+DEFAULT_VIDEO_MINUTES = 10
+DEFAULT_TOLERANCE = 0.15
+DEFAULT_RSS_TOLERANCE = 0.25
+# Aynı adlı ölçümün sonucunu değiştiren ayarlar (diğerleri yalnızca hangi ölçümlerin çalışacağını seçer)
+COMPARABLE_OPTIONS = ('segments', 'videos', 'video_minutes', 'caption_format', 'backend', 'latency',
+                      'info_latency', 'ai_latency')
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Sürecin en yüksek RSS değeri, MB (resource modülü olmayan Windows'ta None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta byte
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+# ----------------------------------------------------------------------
+# Alt yazı gövdeleri
+# ----------------------------------------------------------------------
+
+def _corpus_lines() -> List[str]:
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def _caption_lines(seconds: float) -> Iterator[Tuple[int, int, List[str]]]:
+    """Korpus satırlarını sırayla konuşulmuş gibi zamanlar: (başlangıç ms, bitiş ms, kelimeler)"""
+    lines = _corpus_lines()
+    limit = int(seconds * 1000)
+    start = 160
+    index = 0
+    while True:
+        words = lines[index % len(lines)].split()
+        end = start + len(words) * WORD_MS
+        if end > limit:
+            return
+        yield start, end, words
+        start = end + LINE_GAP_MS
+        index += 1
+
+
+def _vtt_time(ms: int) -> str:
+    seconds, ms = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{ms:03d}"
+
+
+def _json3_body(seconds: float) -> str:
+    header = {
+        'wireMagic': 'pb3',
+        'pens': [{}],
+        'wsWinStyles': [{}, {'mhModeHint': 2, 'juJustifCode': 0, 'sdScrollDir': 3}],
+        'wpWinPositions': [{}, {'apPoint': 6, 'ahHorPos': 20, 'avVerPos': 100, 'rcRows': 2, 'ccCols': 40}],
+    }
+    events = [{'tStartMs': 0, 'dDurationMs': int(seconds * 1000), 'id': 1, 'wpWinPosId': 1, 'wsWinStyleId': 1}]
+    for start, end, words in _caption_lines(seconds):
+        segs = [{'utf8': words[0], 'acAsrConf': 0}]
+        segs.extend({'utf8': ' ' + word, 'tOffsetMs': index * WORD_MS, 'acAsrConf': 0}
+                    for index, word in enumerate(words[1:], 1))
+        events.append({'tStartMs': start, 'dDurationMs': end - start + LINE_GAP_MS, 'wWinId': 1, 'segs': segs})
+        events.append({'tStartMs': end, 'dDurationMs': 10, 'wWinId': 1, 'aAppend': 1, 'segs': [{'utf8': '\n'}]})
+
+    head = json.dumps(header, ensure_ascii=False)[:-1]
+    body = ',\n'.join(json.dumps(event, ensure_ascii=False) for event in events)
+    return f'{head}, "events": [\n{body}\n]}}\n'
+
+
+def _srv3_body(seconds: float) -> str:
+    parts = [
+        '<?xml version="1.0" encoding="utf-8" ?><timedtext format="3">\n<head>\n'
+        '<ws id="0"/>\n<ws id="1" mh="2" ju="0" sd="3"/>\n<wp id="0"/>\n'
+        '<wp id="1" ap="6" ah="20" av="100" rc="2" cc="40"/>\n</head>\n<body>\n'
+        '<w t="0" id="1" wp="1" ws="1"/>\n'
+    ]
+    for start, end, words in _caption_lines(seconds):
+        spans = [f'<s ac="0">{escape(words[0])}</s>']
+        spans.extend(f'<s t="{index * WORD_MS}" ac="0"> {escape(word)}</s>' for index, word in enumerate(words[1:], 1))
+        parts.append(f'<p t="{start}" d="{end - start + LINE_GAP_MS}" w="1">{"".join(spans)}</p>\n')
+        parts.append(f'<p t="{end}" d="10" w="1" a="1">\n</p>\n')
+    parts.append('</body>\n</timedtext>\n')
+    return ''.join(parts)
+
+
+def _vtt_body(seconds: float) -> str:
+    """YouTube otomatik VTT: her satır bir sonraki kayan cue'da ve 10 ms'lik geçiş cue'sunda tekrar eder"""
+    parts = ['WEBVTT\nKind: captions\nLanguage: en\n\n']
+    previous = ' '
+    for start, end, words in _caption_lines(seconds):
+        timed = ''.join(f"<{_vtt_time(start + index * WORD_MS)}><c> {word}</c>" for index, word in enumerate(words[1:], 1))
+        line = ' '.join(words)
+        parts.append(f"{_vtt_time(start)} --> {_vtt_time(end)} align:start position:0%\n{previous}\n{words[0]}{timed}\n\n")
+        parts.append(f"{_vtt_time(end)} --> {_vtt_time(end + 10)} align:start position:0%\n{line}\n \n\n")
+        previous = line
+    return ''.join(parts)
+
+
+_BODY_BUILDERS = {'json3': _json3_body, 'srv3': _srv3_body, 'vtt': _vtt_body}
+
+
+def caption_body(caption_format: str, seconds: float) -> bytes:
+    """
+    YouTube otomatik alt yazı biçiminde gövde üretir
+
+    Args:
+        caption_format: 'json3', 'srv3' veya 'vtt'
+        seconds: Alt yazının kapsadığı süre
+
+    Returns:
+        UTF-8 gövde
+    """
+    return _BODY_BUILDERS[caption_format](seconds).encode('utf-8')
+
+
+# ----------------------------------------------------------------------
+# Yerel alt yazı ve video bilgisi sunucusu
+# ----------------------------------------------------------------------
+
+class FixtureState:
+    """Sunucu ayarları, üretilmiş gövdeler ve sayaçlar (tüm istek iş parçacıkları paylaşır)"""
+
+    def __init__(self, latency: float = DEFAULT_LATENCY, info_latency: float = DEFAULT_INFO_LATENCY,
+                 caption_seconds: float = DEFAULT_VIDEO_MINUTES * 60, caption_format: Optional[str] = None):
+        """
+        Args:
+            latency: Her alt yazı isteğine eklenecek gecikme (saniye)
+            info_latency: Her video bilgisi isteğine eklenecek gecikme (yt-dlp extract_info yerine)
+            caption_seconds: Alt yazıların kapsadığı süre
+            caption_format: Verilirse video bilgisinde yalnızca bu biçim listelenir (analizör onu seçer)
+        """
+        self.latency = latency
+        self.info_latency = info_latency
+        self.caption_seconds = caption_seconds
+        self.caption_format = caption_format
+        self.requests = 0
+        self.bytes = 0
+        with open(INFO_FIXTURE_PATH, 'r', encoding='utf-8') as f:
+            self._info_template = f.read()
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def info(self, video_id: str, base_url: str) -> bytes:
+        info = json.loads(self._info_template.replace('{id}', video_id).replace('{base}', base_url))
+        info['duration'] = int(self.caption_seconds)
+        if self.caption_format:
+            for formats in info['automatic_captions'].values():
+                formats[:] = [f for f in formats if f['ext'] == self.caption_format] or formats
+        return json.dumps(info, ensure_ascii=False).encode('utf-8')
+
+    def body(self, caption_format: str) -> bytes:
+        with self._lock:
+            body = self._bodies.get(caption_format)
+            if body is None:
+                body = self._bodies[caption_format] = caption_body(caption_format, self.caption_seconds)
+        return body
+
+    def count(self, size: int):
+        with self._lock:
+            self.requests += 1
+            self.bytes += size
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'requests': self.requests, 'bytes': self.bytes}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server_version = 'CaptionFixture/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.state.count(len(body))
+
+    def do_GET(self):
+        state: FixtureState = self.server.state
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        video_id = query.get('v', '')
+
+        if url.path == '/info' and video_id:
+            if state.info_latency:
+                time.sleep(state.info_latency)
+            self._send(200, state.info(video_id, self.server.base_url), 'application/json; charset=utf-8')
+        elif url.path == '/api/timedtext' and query.get('fmt') in CAPTION_FORMATS:
+            if state.latency:
+                time.sleep(state.latency)
+            self._send(200, state.body(query['fmt']), 'text/plain; charset=utf-8')
+        else:
+            self._send(404, b'', 'text/plain')
+
+
+def start_fixture_server(port: int = 0, **options) -> ThreadingHTTPServer:
+    """
+    Yerel alt yazı ve video bilgisi sunucusunu arka planda başlatır
+
+    Args:
+        port: Dinlenecek port (0: boş port seçilir)
+        **options: FixtureState ayarları (latency, info_latency, caption_seconds, caption_format)
+
+    Returns:
+        Sunucu; adresi server.base_url, sayaçları server.state.stats(), kapatmak için server.shutdown()
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    server.daemon_threads = True
+    server.state = FixtureState(**options)
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name='caption-fixture', daemon=True).start()
+    return server
+
+
+class FixtureYoutubeDL:
+    """YoutubeDL yerine geçer: extract_info cevabını yerel sunucudan alır"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def extract_info(self, url: str, download: bool = False) -> Dict[str, Any]:
+        from urllib.request import urlopen
+        from youtube_url import extract_video_id
+
+        with urlopen(f"{self.base_url}/info?v={extract_video_id(url)}", timeout=30) as response:
+            return json.loads(response.read())
+
+    def close(self):
+        pass
+
+
+def _benchmark_analyzer(base_url: str, **options):
+    """yt-dlp yerine yerel sunucuyu kullanan VideoDuyguAnalizi"""
+    from video_duygu_analizi import VideoDuyguAnalizi
+
+    class BenchmarkAnalyzer(VideoDuyguAnalizi):
+        def _youtube_dl(self):
+            return self._fixture_ydl
+
+    analyzer = BenchmarkAnalyzer(**options)
+    analyzer._fixture_ydl = FixtureYoutubeDL(base_url)
+    return analyzer
+
+
+# ----------------------------------------------------------------------
+# Ölçümler (her biri ayrı süreçte çalışabilsin diye modül düzeyinde)
+# ----------------------------------------------------------------------
+
+def bench_parse(caption_format: str, minutes: float, repeat: int) -> Dict[str, Any]:
+    """Alt yazıyı analizördeki gibi 64 KB parçalarla ayrıştırıp transkript oluşturur"""
+    from altyazi_parser import CaptionStreamParser
+    from transcript import TranscriptBuilder
+    from video_duygu_analizi import SUBTITLE_CHUNK_SIZE
+
+    body = caption_body(caption_format, minutes * 60)
+    best = None
+    for _ in range(max(1, repeat)):
+        parser = CaptionStreamParser()
+        builder = TranscriptBuilder()
+        started = time.perf_counter()
+        for offset in range(0, len(body), SUBTITLE_CHUNK_SIZE):
+            builder.extend(parser.feed(body[offset:offset + SUBTITLE_CHUNK_SIZE]))
+        builder.extend(parser.close())
+        transcript = builder.build()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {
+        'value': round(len(body) / 1e6 / best, 2),
+        'unit': 'MB/s',
+        'bytes': len(body),
+        'segments': len(transcript),
+        'seconds': round(best, 4),
+    }
+
+
+def bench_sentiment(backend: str, segments: int, repeat: int) -> Dict[str, Any]:
+    """Korpus satırlarını tek score_batch çağrısında puanlar"""
+    from duygu_motoru import get_sentiment_backend
+
+    lines = _corpus_lines()
+    texts = (lines * (segments // len(lines) + 1))[:segments]
+    scorer = get_sentiment_backend(backend)
+    # Isınma: sözlük yükleme süresi ölçüme girmesin
+    scorer.score('good')
+
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        scorer.score_batch(texts)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {'value': round(len(texts) / best, 1), 'unit': 'parça/s', 'segments': len(texts), 'seconds': round(best, 4)}
+
+
+async def _e2e_run(analyzer, videos: int, concurrency: int, use_ai: bool) -> Dict[str, Any]:
+    slots = asyncio.Semaphore(concurrency)
+    elapsed: List[float] = []
+    stages: Dict[str, float] = {}
+    failed = 0
+
+    async def one(index: int):
+        nonlocal failed
+        async with slots:
+            started = time.perf_counter()
+            result = await analyzer.analyze_video_async(f"https://www.youtube.com/watch?v=bench{index:06d}",
+                                                        use_ai=use_ai)
+            elapsed.append(time.perf_counter() - started)
+        if 'error' in result or (use_ai and not result.get('ai_sentiment')):
+            failed += 1
+        for name, totals in result.get('timings', {}).get('stages', {}).items():
+            stages[name] = stages.get(name, 0.0) + totals['seconds']
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(videos)))
+    total = time.perf_counter() - started
+
+    elapsed.sort()
+    return {
+        'seconds': total,
+        'failed': failed,
+        'p50': elapsed[len(elapsed) // 2],
+        'p95': elapsed[min(len(elapsed) - 1, int(len(elapsed) * 0.95))],
+        'stages': {name: round(seconds / videos, 4) for name, seconds in sorted(stages.items())},
+    }
+
+
+def bench_e2e(concurrency: int, videos: int, repeat: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Videoları analyze_video_async ile yerel sunuculara karşı analiz eder
+
+    Args:
+        concurrency: Aynı anda analiz edilen video sayısı (extraction ve subtitle limitleri de bu değer)
+        videos: Analiz edilecek video sayısı
+        repeat: Tekrar; en iyi ölçüm alınır
+        options: latency, info_latency, video_minutes, caption_format, backend, ai, ai_latency
+    """
+    from ai_hiz_siniri import RateLimiter
+
+    server = start_fixture_server(latency=options['latency'], info_latency=options['info_latency'],
+                                  caption_seconds=options['video_minutes'] * 60,
+                                  caption_format=options['caption_format'])
+    stub = None
+    if options['ai']:
+        from openai_stub import start_stub_server
+
+        stub = start_stub_server(latency=options['ai_latency'])
+        os.environ['OPENAI_BASE_URL'] = stub.base_url
+
+    best = None
+    try:
+        for _ in range(max(1, repeat)):
+            analyzer = _benchmark_analyzer(
+                server.base_url, api_key='stub' if stub else None, use_cache=False, verbose=False,
+                sentiment_backend=options['backend'], async_limits={'extraction': concurrency, 'subtitle': concurrency},
+                ai_limiter=RateLimiter(10 ** 9, 10 ** 12),
+            )
+            analyzer.sentiment_backend.score('good')
+
+            async def run():
+                try:
+                    return await _e2e_run(analyzer, videos, concurrency, options['ai'])
+                finally:
+                    await analyzer.aclose()
+                    analyzer.close()
+
+            measured = asyncio.run(run())
+            if best is None or measured['seconds'] < best['seconds']:
+                best = measured
+    finally:
+        server.shutdown()
+        if stub:
+            stub.shutdown()
+
+    return {
+        'value': round(videos / best['seconds'], 2),
+        'unit': 'video/s',
+        'videos': videos,
+        'failed': best['failed'],
+        'seconds': round(best['seconds'], 3),
+        'p50_seconds': round(best['p50'], 3),
+        'p95_seconds': round(best['p95'], 3),
+        'stage_seconds_per_video': best['stages'],
+    }
+
+
+def _measure(func: Callable[..., Dict[str, Any]], args: tuple) -> Dict[str, Any]:
+    result = func(*args)
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def _duration_label(minutes: float) -> str:
+    return f"{minutes / 60:g}h" if minutes >= 60 and minutes % 60 == 0 else f"{minutes:g}m"
+
+
+def plan_cases(options: Dict[str, Any]) -> List[Tuple[str, Callable, tuple]]:
+    """Seçilen gruplardaki ölçümler: (ad, fonksiyon, argümanlar)"""
+    cases = []
+    if 'parse' in options['only']:
+        for caption_format in options['formats']:
+            for minutes in options['durations']:
+                cases.append((f"parse/{caption_format}/{_duration_label(minutes)}", bench_parse,
+                              (caption_format, minutes, options['repeat'])))
+    if 'sentiment' in options['only']:
+        for backend in options['backends']:
+            cases.append((f"sentiment/{backend}", bench_sentiment, (backend, options['segments'], options['repeat'])))
+    if 'e2e' in options['only']:
+        suffix = '/ai' if options['ai'] else ''
+        for concurrency in options['concurrency']:
+            cases.append((f"e2e/c{concurrency}{suffix}", bench_e2e,
+                          (concurrency, options['videos'], options['repeat'], options)))
+    return cases
+
+
+def run_cases(cases: List[Tuple[str, Callable, tuple]], isolate: bool = True) -> List[Dict[str, Any]]:
+    """
+    Ölçümleri çalıştırır ve ilerlemeyi yazar
+
+    Args:
+        cases: plan_cases sonucu
+        isolate: Her ölçümü yeni bir süreçte çalıştır (en yüksek RSS ölçüme ait olur)
+
+    Returns:
+        Sonuçlar (name, value, unit, peak_rss_mb ve ölçüme özel alanlar)
+    """
+    import multiprocessing
+
+    results = []
+    for name, func, args in cases:
+        if isolate:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                result = pool.submit(_measure, func, args).result()
+        else:
+            result = _measure(func, args)
+
+        result = {'name': name, **result}
+        results.append(result)
+        rss = f", RSS {result['peak_rss_mb']} MB" if result['peak_rss_mb'] is not None else ''
+        print(f"⏱️  {name:<22} {result['value']:>10} {result['unit']:<8} ({result['seconds']} sn{rss})")
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results: List[Dict[str, Any]], options: Dict[str, Any], isolate: bool) -> Dict[str, Any]:
+    return {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'commit': _git_commit(),
+            'isolated_rss': isolate,
+        },
+        'options': options,
+        'results': results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE,
+            rss_tolerance: float = DEFAULT_RSS_TOLERANCE) -> List[str]:
+    """
+    Sonuçları önceki bir raporla karşılaştırır ve farkları yazar
+
+    Args:
+        report: Bu çalışmanın raporu
+        baseline: Karşılaştırılacak rapor (aynı adlı ölçümler eşleştirilir)
+        tolerance: Hızdaki en fazla düşüş oranı (0.15: %15)
+        rss_tolerance: En yüksek RSS'teki en fazla artış oranı
+
+    Returns:
+        Gerileme mesajları (boşsa gerileme yok)
+    """
+    base = {result['name']: result for result in baseline.get('results', [])}
+    changed = [key for key in COMPARABLE_OPTIONS
+               if report['options'].get(key) != baseline.get('options', {}).get(key)]
+    if changed:
+        print(f"⚠️  Ayarlar farklı, karşılaştırma yanıltıcı olabilir: {', '.join(changed)}")
+
+    regressions = []
+    for result in report['results']:
+        old = base.get(result['name'])
+        if not old or not old.get('value'):
+            continue
+        change = result['value'] / old['value'] - 1
+        print(f"📊 {result['name']:<22} {old['value']:>10} → {result['value']:<10} {result['unit']:<8} ({change:+.1%})")
+        if change < -tolerance:
+            regressions.append(f"{result['name']}: {old['value']} → {result['value']} {result['unit']} ({change:+.1%})")
+        if result.get('peak_rss_mb') and old.get('peak_rss_mb'):
+            growth = result['peak_rss_mb'] / old['peak_rss_mb'] - 1
+            if growth > rss_tolerance:
+                regressions.append(f"{result['name']}: RSS {old['peak_rss_mb']} → {result['peak_rss_mb']} MB "
+                                   f"({growth:+.1%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="YouTube ve OpenAI'ye gitmeden performans ölçümü")
+    parser.add_argument('--only', nargs='+', choices=GROUPS, default=list(GROUPS), help="Çalıştırılacak gruplar")
+    parser.add_argument('--quick', action='store_true', help="Kısa ön ayar (CI için)")
+    parser.add_argument('--repeat', type=int, help="Ölçüm tekrarı; en iyisi alınır (varsayılan: 3, --quick ile 1)")
+    parser.add_argument('--durations', type=float, nargs='+', metavar='DK',
+                        help="Ayrıştırılacak alt yazı süreleri, dakika (varsayılan: 1 10 60 600)")
+    parser.add_argument('--formats', nargs='+', choices=CAPTION_FORMATS, default=list(CAPTION_FORMATS),
+                        help="Alt yazı biçimleri")
+    parser.add_argument('--segments', type=int, help="Duygu ölçümündeki parça sayısı (varsayılan: 10000)")
+    parser.add_argument('--backends', nargs='+', default=['textblob', 'lexicon'], help="Duygu motorları")
+    parser.add_argument('--concurrency', type=int, nargs='+', help="Uçtan uca eşzamanlılık düzeyleri (varsayılan: 1 4 16)")
+    parser.add_argument('--videos', type=int, help="Uçtan uca ölçümdeki video sayısı (varsayılan: 32)")
+    parser.add_argument('--video-minutes', type=float, default=DEFAULT_VIDEO_MINUTES,
+                        help=f"Uçtan uca ölçümde video süresi, dakika (varsayılan: {DEFAULT_VIDEO_MINUTES})")
+    parser.add_argument('--caption-format', choices=CAPTION_FORMATS, default='json3',
+                        help="Uçtan uca ölçümde sunulan alt yazı biçimi (varsayılan: json3)")
+    parser.add_argument('--backend', default='textblob', help="Uçtan uca ölçümde duygu motoru (varsayılan: textblob)")
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY,
+                        help=f"Alt yazı isteği gecikmesi, saniye (varsayılan: {DEFAULT_LATENCY:g})")
+    parser.add_argument('--info-latency', type=float, default=DEFAULT_INFO_LATENCY,
+                        help=f"extract_info gecikmesi, saniye (varsayılan: {DEFAULT_INFO_LATENCY:g})")
+    parser.add_argument('--ai', action='store_true', help="Uçtan uca ölçüme sahte OpenAI sunucusuyla AI analizini ekle")
+    parser.add_argument('--ai-latency', type=float, default=DEFAULT_AI_LATENCY,
+                        help=f"Sahte OpenAI cevap gecikmesi, saniye (varsayılan: {DEFAULT_AI_LATENCY:g})")
+    parser.add_argument('--no-isolate', action='store_true', help="Ölçümleri tek süreçte çalıştır (RSS kümülatif olur)")
+    parser.add_argument('--output', help=f"Sonuç dosyası (varsayılan: {RESULTS_DIR}/<tarih>.json)")
+    parser.add_argument('--compare', metavar='JSON', help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"İzin verilen en fazla hız düşüşü (varsayılan: {DEFAULT_TOLERANCE:g})")
+    parser.add_argument('--rss-tolerance', type=float, default=DEFAULT_RSS_TOLERANCE,
+                        help=f"İzin verilen en fazla RSS artışı (varsayılan: {DEFAULT_RSS_TOLERANCE:g})")
+    parser.add_argument('--serve', action='store_true', help="Ölçüm yapma, yalnızca yerel alt yazı sunucusunu çalıştır")
+    parser.add_argument('--port', type=int, default=8766, help="--serve portu (varsayılan: 8766)")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        server = start_fixture_server(args.port, latency=args.latency, info_latency=args.info_latency,
+                                      caption_seconds=args.video_minutes * 60)
+        print(f"🧪 Yerel alt yazı sunucusu: {server.base_url}/info?v=VIDEO_ID (Ctrl+C ile durdurun)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            print(f"📊 {json.dumps(server.state.stats())}")
+        return 0
+
+    preset = PRESETS['quick' if args.quick else 'full']
+    options = {
+        'only': args.only,
+        'repeat': args.repeat or preset['repeat'],
+        'formats': args.formats,
+        'durations': args.durations or preset['durations'],
+        'segments': args.segments or preset['segments'],
+        'backends': args.backends,
+        'concurrency': args.concurrency or preset['concurrency'],
+        'videos': args.videos or preset['videos'],
+        'video_minutes': args.video_minutes,
+        'caption_format': args.caption_format,
+        'backend': args.backend,
+        'latency': args.latency,
+        'info_latency': args.info_latency,
+        'ai': args.ai,
+        'ai_latency': args.ai_latency,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = run_cases(plan_cases(options), isolate=not args.no_isolate)
+    report = build_report(results, options, isolate=not args.no_isolate)
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 Sonuçlar yazıldı: {output}")
+
+    failed = [result['name'] for result in results if result.get('failed')]
+    for name in failed:
+        print(f"❌ {name}: başarısız videolar var")
+
+    regressions = compare(report, baseline, args.tolerance, args.rss_tolerance) if baseline else []
+    for regression in regressions:
+        print(f"❌ Gerileme: {regression}")
+    if baseline and not regressions:
+        print("✅ Gerileme yok")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
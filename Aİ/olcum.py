@@ -0,0 +1,306 @@
+"""
+Aşama ölçümleri
+Bir videonun süresinin nereye gittiğini (yt-dlp extract_info, alt yazı indirme,
+ayrıştırma, duygu motoru, OpenAI) görmek için aşama başına süre, byte, önbellek
+isabeti ve tekrar deneme sayıları kaydedilir.
+
+- recording(): analyze_video çevresinde açılır; içindeki aşamalar sonucun 'timings'
+  alanında toplanır. Kayıt contextvars ile taşınır; executor'a verilen işler bind()
+  ile sarılır.
+- Sink'ler: her aşama ve analiz bitişi yapılandırılmış olay olarak JSONLogSink'e
+  (satır başına bir JSON) veya PrometheusSink'e (metin biçimi) gönderilir.
+- profiled(): tek bir çalışmayı cProfile ile ölçer.
+
+Aşamalar iç içe olabilir ('ai' kendi 'ai_request' isteklerini kapsar); süreler
+toplanmaz, ayrı ayrı okunur.
+"""
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Aşama alanlarından Prometheus sayacı olarak yayımlananlar
+COUNTER_FIELDS = ('bytes', 'segments', 'cache_hits', 'cache_misses', 'requests', 'retries')
+# Süre histogramı kovaları (saniye)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+METRIC_PREFIX = 'video_sentiment'
+
+_current: contextvars.ContextVar[Optional['RunTimings']] = contextvars.ContextVar('olcum_run', default=None)
+_sinks: List[Any] = []
+_sinks_lock = threading.Lock()
+
+
+class RunTimings:
+    """Tek analizin aşama toplamları (aşamalar farklı iş parçacıklarından eklenebilir)"""
+
+    def __init__(self, **labels):
+        """
+        Args:
+            **labels: Olaylara eklenecek etiketler (video_id, url)
+        """
+        self.labels = {key: value for key, value in labels.items() if value is not None}
+        self.status = 'ok'
+        self.total_seconds: Optional[float] = None
+        self._started = time.perf_counter()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float, calls: int = 1, **fields):
+        with self._lock:
+            totals = self._stages.setdefault(stage, {'calls': 0, 'seconds': 0.0})
+            totals['calls'] += calls
+            totals['seconds'] += seconds
+            for name, value in fields.items():
+                if isinstance(value, (int, float)):
+                    totals[name] = totals.get(name, 0) + value
+
+    def finish(self):
+        self.total_seconds = time.perf_counter() - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sonuçtaki 'timings' alanı: toplam süre ve aşama başına calls, seconds ve sayaçlar"""
+        total = self.total_seconds if self.total_seconds is not None else time.perf_counter() - self._started
+        with self._lock:
+            stages = {name: {key: round(value, 4) if key == 'seconds' else value for key, value in totals.items()}
+                      for name, totals in self._stages.items()}
+        return {'total_seconds': round(total, 4), 'stages': stages}
+
+
+def current() -> Optional[RunTimings]:
+    """Bu bağlamdaki analiz kaydı (recording dışında None)"""
+    return _current.get()
+
+
+def record(name: str, seconds: float = 0.0, calls: int = 1, **fields):
+    """
+    Aşama ölçümünü kaydeder ve sink'lere gönderir
+
+    Args:
+        name: Aşama adı
+        seconds: Süre
+        calls: Çağrı sayısına eklenecek değer (yalnızca sayaç güncellemek için 0)
+        **fields: Sayaçlar (bytes, segments, cache_hits, cache_misses, requests, retries)
+    """
+    run = _current.get()
+    if run is not None:
+        run.add(name, seconds, calls, **fields)
+    if _sinks:
+        event = {'event': 'stage', 'stage': name, 'seconds': round(seconds, 6), 'calls': calls}
+        if run is not None:
+            event.update(run.labels)
+        event.update(fields)
+        emit(event)
+
+
+def count(name: str, **fields):
+    """Aşamanın sayaçlarını süre ve çağrı eklemeden artırır (ör. retries=1)"""
+    record(name, 0.0, calls=0, **fields)
+
+
+@contextmanager
+def stage(name: str, **fields) -> Iterator[Dict[str, Any]]:
+    """
+    Bloğun süresini aşama olarak kaydeder
+
+    Kullanım:
+        with olcum.stage('subtitle_fetch') as fields:
+            fields['bytes'] = len(data)
+    """
+    started = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        record(name, time.perf_counter() - started, **fields)
+
+
+@contextmanager
+def recording(**labels) -> Iterator[RunTimings]:
+    """
+    Tek analiz için ölçüm kaydı açar; bitişte 'analysis' olayı gönderilir
+
+    Args:
+        **labels: video_id, url gibi etiketler
+    """
+    run = RunTimings(**labels)
+    token = _current.set(run)
+    try:
+        yield run
+    except BaseException:
+        run.status = 'error'
+        raise
+    finally:
+        _current.reset(token)
+        run.finish()
+        if _sinks:
+            emit({'event': 'analysis', **run.labels, 'status': run.status, **run.to_dict()})
+
+
+def bind(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    func'u çağıranın bağlamıyla çalıştıran sarmalayıcı (run_in_executor ve iş parçacığı havuzları için)
+
+    Her çağrı bağlamın kendi kopyasında çalışır; aynı sarmalayıcı birden fazla iş
+    parçacığında aynı anda çağrılabilir.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+def add_sink(sink):
+    """Olayları alacak sink ekler (emit(event) metodu olmalı)"""
+    with _sinks_lock:
+        _sinks.append(sink)
+
+
+def remove_sink(sink):
+    with _sinks_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def emit(event: Dict[str, Any]):
+    """Olayı tüm sink'lere gönderir; sink hataları analizi durdurmaz"""
+    event.setdefault('ts', round(time.time(), 3))
+    for sink in list(_sinks):
+        try:
+            sink.emit(event)
+        except Exception as e:
+            print(f"⚠️  Ölçüm sink hatası ({type(sink).__name__}): {e}", file=sys.stderr)
+
+
+class JSONLogSink:
+    """Her olayı bir JSON satırı olarak yazar"""
+
+    def __init__(self, target):
+        """
+        Args:
+            target: Dosya yolu (sonuna eklenir), '-' (standart hata) veya yazılabilir akış
+        """
+        if target == '-':
+            self._stream, self._owns = sys.stderr, False
+        elif isinstance(target, str):
+            self._stream, self._owns = open(target, 'a', encoding='utf-8'), True
+        else:
+            self._stream, self._owns = target, False
+        self._lock = threading.Lock()
+
+    def emit(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self._stream.write(line + '\n')
+            self._stream.flush()
+
+    def close(self):
+        if self._owns:
+            self._stream.close()
+
+
+class PrometheusSink:
+    """Olayları histogram ve sayaçlarda toplar, Prometheus metin biçiminde verir"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix: str = METRIC_PREFIX):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        # (metrik, etiket) -> [kova sayıları..., toplam, adet]
+        self._histograms: Dict[tuple, List[float]] = {}
+        self._counters: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def _observe(self, metric: str, label: tuple, seconds: float):
+        values = self._histograms.get((metric, label))
+        if values is None:
+            values = self._histograms[(metric, label)] = [0] * len(self.buckets) + [0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                values[index] += 1
+        values[-2] += seconds
+        values[-1] += 1
+
+    def emit(self, event: Dict[str, Any]):
+        with self._lock:
+            if event['event'] == 'stage':
+                label = ('stage', event['stage'])
+                if event.get('calls'):
+                    self._observe('stage_seconds', label, event['seconds'])
+                for field in COUNTER_FIELDS:
+                    if event.get(field):
+                        key = (f"{field}_total", label)
+                        self._counters[key] = self._counters.get(key, 0) + event[field]
+            elif event['event'] == 'analysis':
+                self._observe('analysis_seconds', (), event['total_seconds'])
+                key = ('analyses_total', ('status', event['status']))
+                self._counters[key] = self._counters.get(key, 0) + 1
+
+    def render(self) -> str:
+        """Prometheus metin biçimi (text/plain; version=0.0.4)"""
+        def labels(label: tuple, extra: str = '') -> str:
+            parts = [f'{label[0]}="{label[1]}"'] if label else []
+            if extra:
+                parts.append(extra)
+            return '{' + ','.join(parts) + '}' if parts else ''
+
+        lines = []
+        with self._lock:
+            for metric in sorted({metric for metric, _ in self._histograms}):
+                name = f"{self.prefix}_{metric}"
+                lines.append(f"# TYPE {name} histogram")
+                for (other, label), values in sorted(self._histograms.items()):
+                    if other != metric:
+                        continue
+                    for bound, bucket in zip(self.buckets, values):
+                        le = 'le="%g"' % bound
+                        lines.append(f"{name}_bucket{labels(label, le)} {bucket}")
+                    le = 'le="+Inf"'
+                    lines.append(f"{name}_bucket{labels(label, le)} {values[-1]}")
+                    lines.append(f"{name}_sum{labels(label)} {values[-2]:.6f}")
+                    lines.append(f"{name}_count{labels(label)} {values[-1]}")
+            for metric in sorted({metric for metric, _ in self._counters}):
+                name = f"{self.prefix}_{metric}"
+                lines.append(f"# TYPE {name} counter")
+                for (other, label), value in sorted(self._counters.items()):
+                    if other == metric:
+                        lines.append(f"{name}{labels(label)} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Metinleri dosyaya atomik olarak yazar (node_exporter textfile collector için)"""
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(path + '.tmp', path)
+
+
+@contextmanager
+def profiled(path: Optional[str] = None, top: int = 25, stream=None) -> Iterator[Any]:
+    """
+    Bloğu cProfile ile ölçer; en pahalı fonksiyonları yazar
+
+    cProfile yalnızca çağıran iş parçacığını izler; tam profil için analiz aynı
+    iş parçacığında çalıştırılmalıdır (cli.py --profile bunu yapar).
+
+    Args:
+        path: Verilirse ham istatistikler buraya yazılır (snakeviz, pstats ile açılır)
+        top: Kümülatif süreye göre yazılacak fonksiyon sayısı
+        stream: Özetin yazılacağı akış (varsayılan: standart hata)
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        stats = pstats.Stats(profiler, stream=stream or sys.stderr)
+        stats.sort_stats('cumulative').print_stats(top)
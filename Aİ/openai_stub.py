@@ -0,0 +1,295 @@
+"""
+Yerel OpenAI uyumlu sahte sunucu
+API anahtarı ve ağ olmadan AI yolunu (JSON şeması, çoklu mod, hız sınırlayıcı,
+yeniden deneme) denemek için /v1/chat/completions uç noktasını taklit eder.
+Cevaplar yerel duygu motoruyla üretilir; gecikme ve 429 hataları eklenebilir.
+Batch API (ai_toplu_is) için /v1/files ve /v1/batches uç noktaları da vardır;
+işler --batch-delay saniye sonra tamamlanır.
+
+Kullanım:
+    python openai_stub.py --port 8765 --latency 0.3 --rpm 60 --error-rate 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub python toplu_analiz.py urls.txt --ai
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub python ai_toplu_is.py run istekler.jsonl sonuclar.ndjson
+"""
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from duygu_motoru import classify_sentiment, get_sentiment_backend
+
+DEFAULT_PORT = 8765
+
+_ITEM_RE = re.compile(r'^### Metin (\d+)\n', re.M)
+
+
+def _result(text: str) -> Dict[str, Any]:
+    """Metin için şemaya uygun sonuç (yerel motorla)"""
+    polarity, subjectivity = get_sentiment_backend('lexicon').score(text)
+    label = classify_sentiment(polarity, subjectivity)
+    duygu = 'Pozitif' if polarity > 0.1 else 'Negatif' if polarity < -0.1 else 'Nötr'
+    return {
+        'ruh_hali': label['ruh_hali'].rsplit(' ', 1)[0],
+        'duygu': duygu,
+        'yogunluk': max(1, min(10, round(abs(polarity) * 10) or 1)),
+        'aciklama': f"Yerel sahte sunucu cevabı ({len(text)} karakter)",
+    }
+
+
+def _items(prompt: str) -> List[Tuple[int, str]]:
+    """Çoklu istemdeki (id, metin) çiftleri"""
+    matches = list(_ITEM_RE.finditer(prompt))
+    items = []
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(prompt)
+        items.append((int(match.group(1)), prompt[match.end():end].strip()))
+    return items
+
+
+def chat_completion(request: Dict[str, Any]) -> Dict[str, Any]:
+    """chat.completions isteğine OpenAI biçiminde cevap"""
+    prompt = request['messages'][-1]['content']
+    schema_name = (request.get('response_format') or {}).get('json_schema', {}).get('name')
+    if schema_name == 'duygu_sonuclari':
+        content = {'items': [{'id': index, **_result(text)} for index, text in _items(prompt)]}
+    else:
+        content = _result(prompt)
+
+    prompt_tokens = sum(len(message['content']) for message in request['messages']) // 4
+    body = json.dumps(content, ensure_ascii=False)
+    return {
+        'id': f"chatcmpl-stub-{time.time_ns()}",
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': request.get('model', 'stub'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': body},
+            'finish_reason': 'stop',
+        }],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(body) // 4,
+            'total_tokens': prompt_tokens + len(body) // 4,
+        },
+    }
+
+
+class StubState:
+    """Sunucu ayarları ve sayaçları (tüm istek iş parçacıkları paylaşır)"""
+
+    def __init__(self, latency: float = 0.0, rpm: Optional[int] = None, error_rate: float = 0.0,
+                 retry_after: float = 1.0, batch_delay: float = 0.0):
+        self.latency = latency
+        self.rpm = rpm
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.batch_delay = batch_delay
+        self.requests = 0
+        self.rate_limited = 0
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def admit(self) -> bool:
+        """İstek kabul edilecek mi; False ise 429 döner"""
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if (self.rpm and len(self._recent) >= self.rpm) or random.random() < self.error_rate:
+                self.rate_limited += 1
+                return False
+            self._recent.append(now)
+            return True
+
+    def add_file(self, filename: str, data: bytes, purpose: str) -> Dict[str, Any]:
+        info = {
+            'id': f"file-{uuid.uuid4().hex[:24]}",
+            'object': 'file',
+            'bytes': len(data),
+            'created_at': int(time.time()),
+            'filename': filename,
+            'purpose': purpose,
+            'status': 'processed',
+        }
+        with self._lock:
+            self.files[info['id']] = {'info': info, 'data': data}
+        return info
+
+    def create_batch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """İşi kaydeder; batch_delay sonra arka planda çalıştırılır"""
+        batch = {
+            'id': f"batch_{uuid.uuid4().hex[:24]}",
+            'object': 'batch',
+            'endpoint': request['endpoint'],
+            'input_file_id': request['input_file_id'],
+            'completion_window': request['completion_window'],
+            'status': 'in_progress',
+            'created_at': int(time.time()),
+            'output_file_id': None,
+            'error_file_id': None,
+            'request_counts': {'total': 0, 'completed': 0, 'failed': 0},
+        }
+        with self._lock:
+            self.batches[batch['id']] = batch
+        timer = threading.Timer(self.batch_delay, self._run_batch, (batch['id'],))
+        timer.daemon = True
+        timer.start()
+        return batch
+
+    def _run_batch(self, batch_id: str):
+        with self._lock:
+            batch = self.batches[batch_id]
+            data = self.files[batch['input_file_id']]['data']
+
+        output = []
+        lines = [json.loads(line) for line in data.decode('utf-8').splitlines() if line.strip()]
+        for line in lines:
+            response = {'status_code': 200, 'request_id': uuid.uuid4().hex, 'body': chat_completion(line['body'])}
+            output.append(json.dumps({'id': f"batch_req_{uuid.uuid4().hex[:24]}", 'custom_id': line['custom_id'],
+                                      'response': response, 'error': None}, ensure_ascii=False))
+
+        info = self.add_file(f"{batch_id}_output.jsonl", ('\n'.join(output) + '\n').encode('utf-8'), 'batch_output')
+        with self._lock:
+            batch.update(status='completed', output_file_id=info['id'], completed_at=int(time.time()),
+                         request_counts={'total': len(lines), 'completed': len(lines), 'failed': 0})
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'requests': self.requests, 'rate_limited': self.rate_limited, 'batches': len(self.batches)}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = 'OpenAIStub/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_found(self):
+        self._send_json(404, {'error': {'message': f"Bilinmeyen yol: {self.path}", 'type': 'invalid_request_error'}})
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length)
+
+    def _read_form(self, body: bytes) -> Dict[str, Any]:
+        """multipart/form-data gövdesi: alan adı -> (dosya adı, içerik) veya metin"""
+        header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode('utf-8')
+        message = BytesParser(policy=HTTP).parsebytes(header + body)
+        form = {}
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            payload = part.get_payload(decode=True)
+            filename = part.get_filename()
+            form[name] = (filename, payload) if filename else payload.decode('utf-8')
+        return form
+
+    def do_POST(self):
+        state: StubState = self.server.state
+        body = self._read_body()
+        path = self.path.rstrip('/')
+
+        if path == '/v1/files':
+            form = self._read_form(body)
+            filename, data = form['file']
+            self._send_json(200, state.add_file(filename, data, form.get('purpose', 'batch')))
+        elif path == '/v1/batches':
+            self._send_json(200, state.create_batch(json.loads(body)))
+        elif path == '/v1/chat/completions':
+            if state.latency:
+                time.sleep(state.latency)
+            if not state.admit():
+                self._send_json(429, {'error': {'message': 'Rate limit reached (stub)', 'type': 'rate_limit_error'}},
+                                {'Retry-After': f"{state.retry_after:g}"})
+            else:
+                self._send_json(200, chat_completion(json.loads(body or b'{}')))
+        else:
+            self._not_found()
+
+    def do_GET(self):
+        state: StubState = self.server.state
+        parts = self.path.rstrip('/').split('/')
+        if parts[1:3] == ['v1', 'batches'] and len(parts) == 4 and parts[3] in state.batches:
+            with state._lock:
+                batch = dict(state.batches[parts[3]])
+            self._send_json(200, batch)
+        elif parts[1:3] == ['v1', 'files'] and len(parts) == 5 and parts[4] == 'content' and parts[3] in state.files:
+            data = state.files[parts[3]]['data']
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._not_found()
+
+
+def start_stub_server(port: int = 0, **options) -> ThreadingHTTPServer:
+    """
+    Sahte sunucuyu arka planda başlatır
+
+    Args:
+        port: Dinlenecek port (0: boş port seçilir)
+        **options: StubState ayarları (latency, rpm, error_rate, retry_after, batch_delay)
+
+    Returns:
+        Sunucu; adresi server.base_url, sayaçları server.state.stats(), kapatmak için server.shutdown()
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.state = StubState(**options)
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    threading.Thread(target=server.serve_forever, name='openai-stub', daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Yerel OpenAI uyumlu sahte sunucu")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (varsayılan: {DEFAULT_PORT})")
+    parser.add_argument('--latency', type=float, default=0.0, help="Her isteğe eklenecek gecikme (saniye)")
+    parser.add_argument('--rpm', type=int, help="Dakikada bundan fazla istek gelirse 429 döner")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Rastgele 429 oranı (0-1)")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="429 cevaplarındaki Retry-After (saniye)")
+    parser.add_argument('--batch-delay', type=float, default=5.0, help="Batch işlerinin tamamlanma süresi (saniye)")
+    args = parser.parse_args(argv)
+
+    server = start_stub_server(args.port, latency=args.latency, rpm=args.rpm, error_rate=args.error_rate,
+                               retry_after=args.retry_after, batch_delay=args.batch_delay)
+    print(f"🧪 Sahte OpenAI sunucusu: {server.base_url} (Ctrl+C ile durdurun)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"📊 {json.dumps(server.state.stats())}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""
+Sesten transkript (alt yazısı olmayan videolar için)
+Alt yazı yoksa başlık ve açıklamayla yapılan analiz neredeyse işe yaramaz. Bu modül
+videonun yalnızca ses akışını indirir, ffmpeg ile sabit uzunlukta ve birbiriyle
+örtüşen parçalara böler, parçaları seçilebilir bir konuşma tanıma motoruyla
+aynı anda yazıya döker ve zaman damgalı parçaları tek transkriptte birleştirir.
+Uzun videolarda süre video uzunluğuyla değil, eşzamanlı parça sayısıyla sınırlıdır.
+
+Motorlar:
+    openai          OpenAI audio.transcriptions (whisper-1, verbose_json parça zamanları)
+    faster-whisper  Yerel CPU modeli (pip install faster-whisper)
+
+Gerekli: ffmpeg (PATH'te)
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from ai_hiz_siniri import DEFAULT_MAX_ATTEMPTS, PRIORITY_INTERACTIVE, RateLimiter, call_with_retry, get_rate_limiter
+from bagimliliklar import load_env
+from transcript import Segment, Transcript, TranscriptBuilder
+
+DEFAULT_TRANSCRIPTION_BACKEND = 'openai'
+
+# Parça uzunluğu ve komşu parçalarla örtüşme (saniye); örtüşme sınırda kesilen kelimeleri kurtarır
+DEFAULT_CHUNK_SECONDS = 300
+DEFAULT_OVERLAP_SECONDS = 5
+DEFAULT_CONCURRENCY = 4
+
+# Konuşma tanıma için mono 16 kHz yeterli; 32 kbps mp3 ile 5 dakika ~1.2 MB (API sınırı 25 MB)
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_BITRATE_BPS = 32000
+AUDIO_BITRATE = f"{AUDIO_BITRATE_BPS // 1000}k"
+
+# Sınırlayıcıda bir transkripsiyon isteğinin maliyeti: konuşmanın dakikasında ~250 token çıktı
+TRANSCRIPTION_TOKENS_PER_MINUTE = 250
+
+
+class TranscriptionBackend:
+    """Konuşma tanıma motorlarının ortak arayüzü"""
+
+    name = ''
+    # Aynı anda kaç parça işlenebilir (yerel modeller CPU'yu zaten doldurur)
+    max_concurrency: Optional[int] = None
+
+    def transcribe(self, path: str, language: Optional[str] = None) -> List[Segment]:
+        """
+        Ses dosyasını yazıya döker
+
+        Args:
+            path: Ses dosyası
+            language: ISO-639-1 dil kodu (None: otomatik)
+
+        Returns:
+            (başlangıç ms, bitiş ms, metin) parçaları, zamanlar dosyanın başına göre
+        """
+        raise NotImplementedError
+
+
+class OpenAITranscriptionBackend(TranscriptionBackend):
+    name = 'openai'
+
+    def __init__(self, client=None, model: str = 'whisper-1', limiter: Optional[RateLimiter] = None,
+                 priority: int = PRIORITY_INTERACTIVE, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        """
+        Args:
+            client: OpenAI istemcisi (varsayılan: OPENAI_API_KEY ile yeni istemci)
+            model: Parça zamanı veren model (verbose_json: whisper-1)
+            limiter: RPM/TPM sınırlayıcısı (varsayılan: sohbet istekleriyle paylaşılan sınırlayıcı)
+            priority: Sınırlayıcı önceliği (toplu çalışmalarda PRIORITY_BATCH)
+            max_attempts: Geçici hatalarda (429, zaman aşımı) en fazla deneme
+        """
+        if client is None:
+            from openai import OpenAI
+            # OPENAI_API_KEY yalnızca .env dosyasında olabilir (istemci analizciden önce kurulur)
+            load_env()
+            # Tekrar denemeyi call_with_retry yapar (Retry-After sınırlayıcıya da uygulanır)
+            client = OpenAI(max_retries=0)
+        self.client = client
+        self.model = model
+        self.limiter = limiter or get_rate_limiter()
+        self.priority = priority
+        self.max_attempts = max_attempts
+
+    @staticmethod
+    def estimate_tokens(path: str) -> int:
+        """Parçanın sınırlayıcıdaki tahmini maliyeti (dosya boyutundan süre, dakikada TRANSCRIPTION_TOKENS_PER_MINUTE)"""
+        seconds = os.path.getsize(path) * 8 / AUDIO_BITRATE_BPS
+        return max(1, round(seconds / 60 * TRANSCRIPTION_TOKENS_PER_MINUTE))
+
+    def transcribe(self, path: str, language: Optional[str] = None) -> List[Segment]:
+        options = {'language': language} if language else {}
+
+        def send():
+            # Her denemede dosya baştan okunur
+            with open(path, 'rb') as f:
+                return self.client.audio.transcriptions.create(
+                    file=f,
+                    model=self.model,
+                    response_format='verbose_json',
+                    timestamp_granularities=['segment'],
+                    **options,
+                )
+
+        response = call_with_retry(send, self.limiter, self.estimate_tokens(path), self.priority,
+                                   max_attempts=self.max_attempts, log=lambda message: print(message, file=sys.stderr))
+        return [(int(segment.start * 1000), int(segment.end * 1000), segment.text.strip())
+                for segment in response.segments or [] if segment.text.strip()]
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    name = 'faster-whisper'
+    max_concurrency = 1
+
+    def __init__(self, model_size: str = 'small', device: str = 'cpu', compute_type: str = 'int8'):
+        """
+        Args:
+            model_size: Model boyutu (tiny, base, small, medium, large-v3)
+            device: 'cpu' veya 'cuda'
+            compute_type: Nicemleme türü (CPU'da int8 en hızlısı)
+        """
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("faster-whisper yüklü değil. Lütfen şu komutu çalıştırın: pip install faster-whisper")
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
+        self._lock = threading.Lock()
+
+    def transcribe(self, path: str, language: Optional[str] = None) -> List[Segment]:
+        with self._lock:
+            segments, _ = self.model.transcribe(path, language=language, vad_filter=True)
+            return [(int(segment.start * 1000), int(segment.end * 1000), segment.text.strip())
+                    for segment in segments if segment.text.strip()]
+
+
+TRANSCRIPTION_BACKENDS = {
+    OpenAITranscriptionBackend.name: OpenAITranscriptionBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def get_transcription_backend(name: str = DEFAULT_TRANSCRIPTION_BACKEND, **options) -> TranscriptionBackend:
+    """
+    Adıyla konuşma tanıma motoru oluşturur
+
+    Args:
+        name: 'openai' veya 'faster-whisper'
+        **options: Motorun __init__ parametreleri
+
+    Returns:
+        TranscriptionBackend
+    """
+    try:
+        backend = TRANSCRIPTION_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen konuşma tanıma motoru: {name} (seçenekler: {', '.join(TRANSCRIPTION_BACKENDS)})")
+    return backend(**options)
+
+
+def plan_audio_chunks(duration: float, chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+                      overlap_seconds: float = DEFAULT_OVERLAP_SECONDS) -> List[Tuple[float, float]]:
+    """
+    Sesi örtüşen parçalara böler
+
+    Args:
+        duration: Ses süresi (saniye)
+        chunk_seconds: Parça uzunluğu
+        overlap_seconds: Ardışık parçaların örtüşmesi
+
+    Returns:
+        (başlangıç, uzunluk) listesi; her parça bir öncekinin son overlap_seconds kadarını tekrar içerir
+    """
+    step = max(1.0, chunk_seconds - overlap_seconds)
+    chunks = []
+    start = 0.0
+    while True:
+        length = min(chunk_seconds, duration - start)
+        chunks.append((start, length))
+        if start + length >= duration:
+            return chunks
+        start += step
+
+
+def stitch_segments(chunks: Sequence[Tuple[float, List[Segment]]],
+                    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS) -> Transcript:
+    """
+    Parça sonuçlarını tek zaman çizgisinde birleştirir
+
+    Örtüşme bölgesi ortasından ikiye ayrılır: her parça kendi payına düşen
+    aralığın içinde ortası kalan parçaları tutar, böylece örtüşmedeki cümleler
+    iki kez yazılmaz.
+
+    Args:
+        chunks: (parçanın başlangıcı saniye, parçaya göre zamanlı parçalar), sırayla
+        overlap_seconds: plan_audio_chunks'a verilen örtüşme
+
+    Returns:
+        Video başına göre zamanlı Transcript
+    """
+    half = int(overlap_seconds * 500)
+    builder = TranscriptBuilder()
+    for index, (chunk_start, segments) in enumerate(chunks):
+        offset = int(chunk_start * 1000)
+        low = offset + half if index > 0 else None
+        high = int(chunks[index + 1][0] * 1000) + half if index + 1 < len(chunks) else None
+        for start, end, text in segments:
+            start, end = start + offset, end + offset
+            middle = (start + end) // 2
+            if (low is not None and middle < low) or (high is not None and middle >= high):
+                continue
+            builder.append(start, end, text)
+    return builder.build()
+
+
+def _require_ffmpeg():
+    if not shutil.which('ffmpeg'):
+        raise RuntimeError("ffmpeg bulunamadı. Sesten transkript için ffmpeg kurulu ve PATH'te olmalı.")
+
+
+def probe_duration(path: str) -> float:
+    """ffprobe ile ses süresi (saniye)"""
+    output = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=nw=1:nk=1', path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip())
+
+
+def extract_chunk(source: str, start: float, length: float, target: str):
+    """Kaynaktan [start, start+length) aralığını mono 16 kHz mp3 olarak keser"""
+    subprocess.run(
+        ['ffmpeg', '-nostdin', '-loglevel', 'error', '-y', '-ss', f"{start:.3f}", '-t', f"{length:.3f}",
+         '-i', source, '-vn', '-ac', '1', '-ar', str(AUDIO_SAMPLE_RATE), '-b:a', AUDIO_BITRATE, target],
+        check=True,
+    )
+
+
+def download_audio(url: str, directory: str) -> str:
+    """yt-dlp ile sadece en iyi ses akışını indirir (video indirilmez)"""
+    from yt_dlp import YoutubeDL
+
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'outtmpl': os.path.join(directory, 'audio.%(ext)s'),
+        'quiet': True,
+        'no_warnings': True,
+        'noprogress': True,
+    }
+    with YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=True)
+        return ydl.prepare_filename(info)
+
+
+class AudioTranscriber:
+    def __init__(self, backend: Optional[TranscriptionBackend] = None, chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+                 overlap_seconds: float = DEFAULT_OVERLAP_SECONDS, concurrency: int = DEFAULT_CONCURRENCY,
+                 verbose: bool = True):
+        """
+        Args:
+            backend: Konuşma tanıma motoru (varsayılan: OpenAI whisper-1)
+            chunk_seconds: Parça uzunluğu (saniye)
+            overlap_seconds: Ardışık parçaların örtüşmesi (saniye)
+            concurrency: Aynı anda yazıya dökülen parça sayısı (motorun sınırı daha küçükse o geçerli)
+            verbose: İlerleme mesajlarını yaz
+        """
+        self.backend = backend or get_transcription_backend()
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.concurrency = max(1, min(concurrency, self.backend.max_concurrency or concurrency))
+        self.verbose = verbose
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def transcribe_url(self, url: str, duration: Optional[float] = None,
+                       language: Optional[str] = None) -> Optional[Transcript]:
+        """
+        Videonun sesini indirir ve parçalar halinde yazıya döker
+
+        Args:
+            url: Video URL'si
+            duration: Süre (yt-dlp bilgisinden; yoksa ffprobe ile ölçülür)
+            language: Konuşma dili (None: otomatik)
+
+        Returns:
+            Zaman damgalı Transcript (konuşma bulunamazsa None)
+        """
+        _require_ffmpeg()
+        with tempfile.TemporaryDirectory(prefix='ses_') as directory:
+            self._log("🎧 Ses indiriliyor...")
+            source = download_audio(url, directory)
+            return self.transcribe_file(source, duration, language, directory)
+
+    def transcribe_file(self, source: str, duration: Optional[float] = None, language: Optional[str] = None,
+                        directory: Optional[str] = None) -> Optional[Transcript]:
+        """Yerel ses/video dosyasını parçalar halinde yazıya döker"""
+        _require_ffmpeg()
+        # yt-dlp bölgesel kod verebilir ('en-US'); Whisper ISO-639-1 bekler
+        if language:
+            language = language.split('-')[0].lower()
+        duration = duration or probe_duration(source)
+        chunks = plan_audio_chunks(duration, self.chunk_seconds, self.overlap_seconds)
+        self._log(f"🗣️  Ses {len(chunks)} parçada yazıya dökülüyor ({self.backend.name}, "
+                  f"aynı anda {self.concurrency})...")
+
+        with tempfile.TemporaryDirectory(prefix='ses_', dir=directory) as work_dir:
+            def transcribe_chunk(item: Tuple[int, Tuple[float, float]]) -> Tuple[float, List[Segment]]:
+                index, (start, length) = item
+                target = os.path.join(work_dir, f"{index:05d}.mp3")
+                extract_chunk(source, start, length, target)
+                try:
+                    return start, self.backend.transcribe(target, language)
+                finally:
+                    os.remove(target)
+
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='ses') as executor:
+                results = list(executor.map(transcribe_chunk, enumerate(chunks)))
+
+        transcript = stitch_segments(results, self.overlap_seconds)
+        return transcript if len(transcript) else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Video/ses dosyasını veya URL'yi parçalar halinde yazıya döker")
+    parser.add_argument('source', help="Video URL'si veya yerel dosya")
+    parser.add_argument('--backend', choices=sorted(TRANSCRIPTION_BACKENDS), default=DEFAULT_TRANSCRIPTION_BACKEND)
+    parser.add_argument('--language', help="Konuşma dili, ör. tr (varsayılan: otomatik)")
+    parser.add_argument('--chunk-seconds', type=float, default=DEFAULT_CHUNK_SECONDS)
+    parser.add_argument('--overlap-seconds', type=float, default=DEFAULT_OVERLAP_SECONDS)
+    parser.add_argument('-j', '--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    transcriber = AudioTranscriber(get_transcription_backend(args.backend), args.chunk_seconds,
+                                   args.overlap_seconds, args.concurrency)
+    started = time.perf_counter()
+    if os.path.exists(args.source):
+        transcript = transcriber.transcribe_file(args.source, language=args.language)
+    else:
+        transcript = transcriber.transcribe_url(args.source, language=args.language)
+    if transcript is None:
+        print("❌ Konuşma bulunamadı")
+        return 1
+
+    for start, end, text in transcript:
+        print(f"[{start / 1000:8.1f} - {end / 1000:8.1f}] {text}")
+    print(f"\n⏱️  {len(transcript)} parça, {time.perf_counter() - started:.1f} sn")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""
+Analiz sonuçları deposu
+analyze_video sonuçlarını video ID ve analiz sürümüne göre SQLite'ta saklar;
+panolar ("bu haftanın en olumsuz videoları", "kanalın son videoları") videoları
+yeniden analiz etmeden sorgulanır. Transkript metni saklanmaz, transkript
+önbelleğindeki anahtarı (transcript_ref) tutulur.
+
+Yazmalar tamponlanır ve her batch_size satır tek işlemde yazılır (WAL modu);
+toplu çalışmalarda her video için ayrı commit ve fsync yapılmaz. Aynı video
+aynı analiz sürümüyle tekrar yazılırsa kayıt güncellenir; AI sonucu olmayan
+yeni kayıt eski AI sonucunu silmez.
+
+Kullanım:
+    python sonuc_deposu.py --days 7 --order negative --limit 10
+    python sonuc_deposu.py --channel UCxxxx --order newest --json
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from transcript_cache import DEFAULT_CACHE_DIR, cache_key
+
+DEFAULT_DB_NAME = 'results.sqlite3'
+DEFAULT_BATCH_SIZE = 100
+
+# Sorgu sıralamaları
+ORDERS = {
+    'negative': 'polarity ASC',
+    'positive': 'polarity DESC',
+    'newest': 'upload_date DESC, analyzed_at DESC',
+    'analyzed': 'analyzed_at DESC',
+}
+
+_COLUMNS = ('video_id', 'analysis_version', 'url', 'title', 'channel', 'channel_id', 'upload_date', 'language',
+            'polarity', 'subjectivity', 'mood', 'sentiment', 'ai_sentiment', 'transcript_ref',
+            'transcript_length', 'timings', 'total_seconds', 'analyzed_at')
+_JSON_COLUMNS = ('sentiment', 'ai_sentiment', 'timings')
+
+_UPSERT = f"""
+    INSERT INTO results ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})
+    ON CONFLICT (video_id, analysis_version) DO UPDATE SET
+        {', '.join(f"{column} = excluded.{column}" for column in _COLUMNS[2:] if column != 'ai_sentiment')},
+        ai_sentiment = COALESCE(excluded.ai_sentiment, results.ai_sentiment)
+"""
+
+_UPDATE_AI = "UPDATE results SET ai_sentiment = ? WHERE video_id = ? AND analysis_version = ?"
+
+
+def default_db_path(cache_dir: Optional[str] = None) -> str:
+    """Önbellek klasöründeki results.sqlite3 (VIDEO_CACHE_DIR veya ~/.cache/video_duygu_analizi)"""
+    return os.path.join(cache_dir or os.getenv('VIDEO_CACHE_DIR') or DEFAULT_CACHE_DIR, DEFAULT_DB_NAME)
+
+
+class ResultStore:
+    def __init__(self, path: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            path: SQLite dosyası (varsayılan: önbellek klasöründe results.sqlite3)
+            batch_size: Bu kadar sonuç birikince tek işlemde yazılır (1: her sonuç hemen yazılır)
+        """
+        self.path = path or default_db_path()
+        self.batch_size = max(1, batch_size)
+        self.written = 0
+        self._pending: List[Tuple] = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Tek bağlantı kilitle paylaşılır; yazmalar zaten toplu yapılır
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS results (
+                        video_id TEXT NOT NULL,
+                        analysis_version TEXT NOT NULL,
+                        url TEXT,
+                        title TEXT,
+                        channel TEXT,
+                        channel_id TEXT,
+                        upload_date TEXT,
+                        language TEXT,
+                        polarity REAL,
+                        subjectivity REAL,
+                        mood TEXT,
+                        sentiment TEXT NOT NULL,
+                        ai_sentiment TEXT,
+                        transcript_ref TEXT,
+                        transcript_length INTEGER,
+                        timings TEXT,
+                        total_seconds REAL,
+                        analyzed_at REAL NOT NULL,
+                        PRIMARY KEY (video_id, analysis_version)
+                    )
+                """)
+                self._conn.execute("CREATE INDEX IF NOT EXISTS results_channel ON results (channel_id, upload_date)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS results_upload_date ON results (upload_date, polarity)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS results_polarity ON results (polarity)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS results_analyzed_at ON results (analyzed_at)")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @staticmethod
+    def _row(result: Dict[str, Any], url: Optional[str], analyzed_at: float) -> Tuple:
+        video = result.get('video') or {}
+        sentiment = result['sentiment']
+        timings = result.get('timings')
+        ai_sentiment = result.get('ai_sentiment')
+        video_id = result['video_id']
+        return (
+            video_id,
+            result.get('analysis_version') or '',
+            url,
+            video.get('title'),
+            video.get('channel'),
+            video.get('channel_id'),
+            video.get('upload_date'),
+            result.get('language'),
+            sentiment.get('polarity'),
+            sentiment.get('subjectivity'),
+            sentiment.get('ruh_hali'),
+            json.dumps(sentiment, ensure_ascii=False),
+            json.dumps(ai_sentiment, ensure_ascii=False) if ai_sentiment else None,
+            cache_key(video_id),
+            result.get('transcript_length'),
+            json.dumps(timings, ensure_ascii=False) if timings else None,
+            timings.get('total_seconds') if timings else None,
+            analyzed_at,
+        )
+
+    def add(self, result: Dict[str, Any], url: Optional[str] = None) -> bool:
+        """
+        Sonucu yazma tamponuna ekler; tampon dolunca hepsi tek işlemde yazılır
+
+        Args:
+            result: analyze_video sonucu (video_id içermeli; hata sonuçları yazılmaz)
+            url: Videonun analiz edilen URL'si
+
+        Returns:
+            Sonuç tampona eklendiyse True
+        """
+        if 'error' in result or not result.get('video_id') or not result.get('sentiment'):
+            return False
+        row = self._row(result, url, time.time())
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+        return True
+
+    def flush(self):
+        """Tampondaki sonuçları hemen yazar"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            self._pending = rows + self._pending
+            raise
+        self.written += len(rows)
+
+    def update_ai(self, updates: Iterable[Tuple[str, str, Dict[str, Any]]]) -> int:
+        """
+        Var olan kayıtların ai_sentiment alanını tek işlemde günceller (Batch API sonuçları)
+
+        Args:
+            updates: (video_id, analysis_version, ai_sentiment) üçlüleri
+
+        Returns:
+            Güncellenen kayıt sayısı (depoda olmayan videolar atlanır)
+        """
+        rows = [(json.dumps(ai_sentiment, ensure_ascii=False), video_id, analysis_version or '')
+                for video_id, analysis_version, ai_sentiment in updates]
+        with self._lock:
+            # Tamponda bekleyen kayıtlar önce yazılır, yoksa güncelleme onları bulamaz
+            self._flush_locked()
+            if not rows:
+                return 0
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                updated = self._conn.executemany(_UPDATE_AI, rows).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return updated
+
+    def close(self):
+        """Tamponu yazar ve bağlantıyı kapatır"""
+        with self._lock:
+            try:
+                self._flush_locked()
+            finally:
+                self._conn.close()
+
+    def _select(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            names = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        records = []
+        for row in rows:
+            record = dict(zip(names, row))
+            for column in _JSON_COLUMNS:
+                if record.get(column):
+                    record[column] = json.loads(record[column])
+            records.append(record)
+        return records
+
+    def get(self, video_id: str, analysis_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Videonun kaydı (sürüm verilmezse en son analiz edilen)"""
+        if analysis_version:
+            rows = self._select("SELECT * FROM results WHERE video_id = ? AND analysis_version = ?",
+                                (video_id, analysis_version))
+        else:
+            rows = self._select("SELECT * FROM results WHERE video_id = ? ORDER BY analyzed_at DESC LIMIT 1",
+                                (video_id,))
+        return rows[0] if rows else None
+
+    def query(self, channel_id: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+              analysis_version: Optional[str] = None, order: str = 'negative', limit: Optional[int] = 20,
+              latest_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        Kayıtları süzer ve sıralar (indeksli sütunlar: channel_id, upload_date, polarity)
+
+        Args:
+            channel_id: Kanal ID'si
+            since: Bu tarihte veya sonra yüklenenler (YYYY-MM-DD)
+            until: Bu tarihte veya önce yüklenenler (YYYY-MM-DD)
+            analysis_version: Yalnızca bu analiz sürümü
+            order: 'negative', 'positive', 'newest' veya 'analyzed'
+            limit: En fazla kayıt (None: sınırsız)
+            latest_only: Video birden fazla sürümle analiz edildiyse yalnızca en son analizi döndür
+
+        Returns:
+            Kayıtlar; sentiment, ai_sentiment ve timings sözlük olarak
+        """
+        if order not in ORDERS:
+            raise ValueError(f"Bilinmeyen sıralama: {order} (seçenekler: {', '.join(ORDERS)})")
+
+        conditions, params = [], []
+        for column, operator, value in (('channel_id', '=', channel_id), ('upload_date', '>=', since),
+                                        ('upload_date', '<=', until), ('analysis_version', '=', analysis_version)):
+            if value is not None:
+                conditions.append(f"results.{column} {operator} ?")
+                params.append(value)
+        if latest_only and analysis_version is None:
+            conditions.append("NOT EXISTS (SELECT 1 FROM results AS newer WHERE newer.video_id = results.video_id"
+                              " AND newer.analyzed_at > results.analyzed_at)")
+
+        sql = "SELECT * FROM results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {ORDERS[order]}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return self._select(sql, tuple(params))
+
+    def most_negative(self, days: int = 7, limit: int = 10, channel_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Son days günde yüklenen en olumsuz videolar"""
+        since = (date.today() - timedelta(days=days)).isoformat()
+        return self.query(channel_id=channel_id, since=since, order='negative', limit=limit)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kayıtlı analiz sonuçlarını sorgular (videolar yeniden analiz edilmez)")
+    parser.add_argument('--db', help="Depo dosyası (varsayılan: önbellek klasöründe results.sqlite3)")
+    parser.add_argument('--channel', help="Kanal ID'si (UC...)")
+    parser.add_argument('--days', type=int, help="Son N günde yüklenenler")
+    parser.add_argument('--since', help="Bu tarihte veya sonra yüklenenler (YYYY-MM-DD)")
+    parser.add_argument('--until', help="Bu tarihte veya önce yüklenenler (YYYY-MM-DD)")
+    parser.add_argument('--version', dest='analysis_version', help="Yalnızca bu analiz sürümü")
+    parser.add_argument('--order', choices=sorted(ORDERS), default='negative', help="Sıralama (varsayılan: negative)")
+    parser.add_argument('--limit', type=int, default=20, help="En fazla kayıt (varsayılan: 20)")
+    parser.add_argument('--json', action='store_true', help="Kayıtları satır başına bir JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    path = args.db or default_db_path()
+    if not os.path.exists(path):
+        print(f"❌ Depo bulunamadı: {path}", file=sys.stderr)
+        return 1
+
+    since = args.since
+    if args.days is not None:
+        since = (date.today() - timedelta(days=args.days)).isoformat()
+
+    with ResultStore(path) as store:
+        rows = store.query(channel_id=args.channel, since=since, until=args.until,
+                           analysis_version=args.analysis_version, order=args.order, limit=args.limit)
+
+    for row in rows:
+        if args.json:
+            print(json.dumps(row, ensure_ascii=False))
+        else:
+            polarity = f"{row['polarity']:+.3f}" if row['polarity'] is not None else '   -  '
+            print(f"{polarity}  {row['upload_date'] or '----------'}  {row['video_id']}  "
+                  f"{(row['channel'] or '')[:20]:<20}  {row['title'] or ''}")
+    if not args.json:
+        print(f"📊 {len(rows)} kayıt ({path})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Testler modülleri Aİ/ klasöründen doğrudan içe aktarır (paket yok):
+    cd Aİ && python -m pytest -q
+"""
+import os
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(PACKAGE_DIR, 'fixtures')
+
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
@@ -0,0 +1,174 @@
+"""Hız sınırlayıcı ve tekrar deneme: yerel sahte OpenAI sunucusuna karşı (openai_stub)"""
+import asyncio
+import time
+
+import pytest
+
+import ai_hiz_siniri
+from ai_hiz_siniri import RateLimiter, TokenBucket, call_with_retry, call_with_retry_async
+from openai_stub import start_stub_server
+
+openai = pytest.importorskip('openai')
+
+MESSAGES = [{'role': 'user', 'content': 'great video, really helpful'}]
+
+
+@pytest.fixture
+def stub():
+    server = start_stub_server(latency=0.01, retry_after=0.25)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """retry_delay'e verilen Retry-After değerlerini kaydeder; testler gerçekten beklemez"""
+    seen = []
+
+    def fake_delay(attempt, after=None, **kwargs):
+        seen.append(after)
+        return 0.0
+    monkeypatch.setattr(ai_hiz_siniri, 'retry_delay', fake_delay)
+    return seen
+
+
+def _client(server):
+    # SDK'nın kendi tekrar denemesi kapalı: yalnızca call_with_retry dener
+    return openai.OpenAI(api_key='stub', base_url=server.base_url, max_retries=0)
+
+
+def _send(server, calls, fail_first=0):
+    client = _client(server)
+
+    def send():
+        calls.append(time.monotonic())
+        server.state.error_rate = 1.0 if len(calls) <= fail_first else 0.0
+        return client.chat.completions.create(model='gpt-4o-mini', messages=MESSAGES)
+    return send
+
+
+def test_429_is_retried_with_retry_after(stub, delays):
+    limiter = RateLimiter(rpm=1000, tpm=100000)
+    calls, logs = [], []
+
+    response = call_with_retry(_send(stub, calls, fail_first=2), limiter, 100, log=logs.append)
+
+    assert response.choices[0].message.content
+    assert len(calls) == 3
+    assert stub.state.stats()['rate_limited'] == 2
+    assert limiter.stats()['retries'] == 2
+    assert len(logs) == 2
+    # Retry-After başlığı okundu ve sınırlayıcı tüm istekleri o kadar durdurdu
+    assert delays == [pytest.approx(0.25), pytest.approx(0.25)]
+    assert limiter.paused_until > 0
+
+
+def test_max_attempts_is_respected(stub, delays):
+    limiter = RateLimiter(rpm=1000, tpm=100000)
+    calls = []
+
+    with pytest.raises(openai.RateLimitError):
+        call_with_retry(_send(stub, calls, fail_first=10), limiter, 100, max_attempts=3, log=lambda _: None)
+
+    assert len(calls) == 3
+    assert stub.state.stats()['requests'] == 3
+    assert len(delays) == 2
+
+
+@pytest.mark.parametrize('max_attempts', [0, -1])
+def test_non_positive_max_attempts_still_calls_once(stub, delays, max_attempts):
+    limiter = RateLimiter(rpm=1000, tpm=100000)
+    calls = []
+
+    response = call_with_retry(_send(stub, calls), limiter, 100, max_attempts=max_attempts)
+    assert response.choices[0].message.content
+    assert len(calls) == 1
+
+    with pytest.raises(openai.RateLimitError):
+        call_with_retry(_send(stub, calls, fail_first=10), limiter, 100, max_attempts=max_attempts)
+    assert len(calls) == 2
+
+
+def test_non_retryable_error_is_not_retried(delays):
+    limiter = RateLimiter(rpm=1000, tpm=100000)
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise ValueError('bad request')
+
+    with pytest.raises(ValueError):
+        call_with_retry(send, limiter, 100, log=lambda _: None)
+    assert len(calls) == 1
+    assert delays == []
+
+
+def test_async_retry(stub, delays):
+    limiter = RateLimiter(rpm=1000, tpm=100000)
+    client = openai.AsyncOpenAI(api_key='stub', base_url=stub.base_url, max_retries=0)
+    calls = []
+
+    async def send():
+        calls.append(1)
+        stub.state.error_rate = 1.0 if len(calls) == 1 else 0.0
+        return await client.chat.completions.create(model='gpt-4o-mini', messages=MESSAGES)
+
+    async def run():
+        try:
+            return await call_with_retry_async(send, limiter, 100, log=lambda _: None)
+        finally:
+            await client.close()
+
+    response = asyncio.run(run())
+    assert response.choices[0].message.content
+    assert len(calls) == 2
+    assert delays == [pytest.approx(0.25)]
+
+
+def test_request_bucket_blocks_when_empty():
+    # 120 RPM: kova 120 istekle dolu, sonra saniyede 2 istek
+    limiter = RateLimiter(rpm=120, tpm=10 ** 9)
+    started = time.monotonic()
+    for _ in range(120):
+        limiter.acquire(1)
+    assert time.monotonic() - started < 0.2
+
+    started = time.monotonic()
+    limiter.acquire(1)
+    assert time.monotonic() - started >= 0.4
+
+
+def test_token_bucket_blocks_when_empty():
+    # 600 TPM: saniyede 10 token
+    limiter = RateLimiter(rpm=10 ** 6, tpm=600)
+    limiter.acquire(600)
+
+    started = time.monotonic()
+    limiter.acquire(5)
+    assert time.monotonic() - started >= 0.4
+    assert limiter.stats()['waited_seconds'] >= 0.4
+
+
+def test_limiter_keeps_stub_under_its_rpm(stub):
+    # Sınırlayıcı sunucunun RPM'i ile aynıysa hiç 429 alınmaz
+    stub.state.rpm = 5
+    limiter = RateLimiter(rpm=5, tpm=100000)
+    client = _client(stub)
+    for _ in range(5):
+        call_with_retry(lambda: client.chat.completions.create(model='gpt-4o-mini', messages=MESSAGES),
+                        limiter, 100, max_attempts=1)
+    assert stub.state.stats() == {'requests': 5, 'rate_limited': 0, 'batches': 0}
+
+    bucket = limiter.requests
+    assert bucket.delay(1, time.monotonic()) > 0
+
+
+def test_token_bucket_delay():
+    bucket = TokenBucket(60)
+    now = bucket.updated
+    bucket.take(60)
+    assert bucket.delay(1, now) == pytest.approx(1.0)
+    assert bucket.delay(1, now + 1.0) == pytest.approx(0.0)
+    # Kapasiteden büyük istek kova dolunca geçer
+    assert bucket.delay(1000, now) == pytest.approx(60.0)
@@ -0,0 +1,136 @@
+"""Batch API toplu modu: parçalı gönderimin devamı ve wait/merge'in iş başlatmaması (openai_stub)"""
+import json
+
+import pytest
+
+import ai_toplu_is
+from ai_toplu_is import BulkRequestWriter, load_manifest, submit, unsubmitted_chunks
+from openai_stub import start_stub_server
+from sonuc_deposu import ResultStore
+
+openai = pytest.importorskip('openai')
+
+VIDEOS = ['vid00000001', 'vid00000002', 'vid00000003', 'vid00000004', 'vid00000005']
+VERSION = 'textblob+gpt-4o-mini/test'
+
+
+def _body(text):
+    return {'model': 'gpt-4o-mini', 'messages': [{'role': 'user', 'content': text}]}
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = start_stub_server()
+    monkeypatch.setenv('OPENAI_BASE_URL', server.base_url)
+    monkeypatch.setenv('OPENAI_API_KEY', 'stub')
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def requests_file(tmp_path, monkeypatch):
+    """Beş videoluk istek dosyası; parça başına iki istek (üç Batch işi)"""
+    monkeypatch.setattr(ai_toplu_is, 'MAX_BATCH_REQUESTS', 2)
+    path = str(tmp_path / 'istekler.jsonl')
+    writer = BulkRequestWriter(path)
+    for video_id in VIDEOS:
+        writer.add(video_id, {'requests': [([0], _body(f"great video {video_id}"))],
+                              'tokens': [10], 'results': [None], 'keys': [], 'analysis_version': VERSION})
+    writer.close()
+
+    results = tmp_path / 'sonuclar.ndjson'
+    with open(results, 'w', encoding='utf-8') as f:
+        for video_id in VIDEOS:
+            record = {'url': f"https://youtu.be/{video_id}", 'video_id': video_id, 'status': 'ok',
+                      'result': {'video_id': video_id, 'sentiment': {'polarity': 0.5}}}
+            f.write(json.dumps(record) + '\n')
+    return path, str(results)
+
+
+def test_interrupted_submit_resumes_remaining_chunks(stub, requests_file):
+    path, _ = requests_file
+    client = openai.OpenAI(max_retries=0)
+    create = client.batches.create
+    calls = []
+
+    def failing_create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 2:
+            raise RuntimeError('bağlantı koptu')
+        return create(**kwargs)
+
+    client.batches.create = failing_create
+    with pytest.raises(RuntimeError):
+        submit(client, path, log=lambda _: None)
+    assert load_manifest(path)['submitted'].keys() == {'0'}
+    assert unsubmitted_chunks(path) == [1, 2]
+
+    client.batches.create = create
+    batch_ids = submit(client, path, log=lambda _: None)
+    manifest = load_manifest(path)
+    assert len(batch_ids) == 3
+    assert sorted(manifest['submitted']) == ['0', '1', '2']
+    assert unsubmitted_chunks(path) == []
+    assert stub.state.stats()['batches'] == 3
+
+    # Tamamı gönderildiyse tekrar çalıştırmak yeni iş başlatmaz
+    assert submit(client, path, log=lambda _: None) == batch_ids
+    assert stub.state.stats()['batches'] == 3
+
+
+def test_old_manifest_without_submitted_map(requests_file):
+    # Eski eşleme dosyalarında yalnızca sırayla gönderilen işlerin listesi vardır
+    path, _ = requests_file
+    manifest = load_manifest(path)
+    manifest['batches'] = ['batch_old']
+    del manifest['submitted']
+    ai_toplu_is.save_manifest(path, manifest)
+
+    assert unsubmitted_chunks(path) == [1, 2]
+
+
+@pytest.mark.parametrize('command', ['wait', 'merge'])
+def test_wait_and_merge_do_not_submit(stub, requests_file, command, capsys):
+    path, results = requests_file
+    assert ai_toplu_is.main([command, path, results, '--poll', '0.05', '--no-cache']) == 1
+    assert stub.state.stats()['batches'] == 0
+    assert 'submit' in capsys.readouterr().err
+
+
+def test_run_then_merge(stub, requests_file):
+    path, results = requests_file
+    assert ai_toplu_is.main(['run', path, results, '--poll', '0.05', '--no-cache']) == 0
+    assert stub.state.stats()['batches'] == 3
+
+    with open(results, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert all(record['result']['ai_sentiment']['duygu'] for record in records)
+
+    # merge yeniden çalıştırılabilir ve gönderilmiş işleri kullanır
+    assert ai_toplu_is.main(['merge', path, results, '--poll', '0.05', '--no-cache']) == 0
+    assert stub.state.stats()['batches'] == 3
+
+
+def test_merge_into_store(stub, requests_file, tmp_path):
+    path, _ = requests_file
+    db = str(tmp_path / 'results.sqlite3')
+    with ResultStore(db) as store:
+        for video_id in VIDEOS:
+            for version in (VERSION, 'eski-surum'):
+                store.add({'video_id': video_id, 'analysis_version': version, 'sentiment': {'polarity': 0.5}})
+
+    # Sonuç dosyası olmadan yalnızca depo güncellenir
+    assert ai_toplu_is.main(['run', path, '--store', db, '--poll', '0.05', '--no-cache']) == 0
+
+    with ResultStore(db) as store:
+        for video_id in VIDEOS:
+            assert store.get(video_id, VERSION)['ai_sentiment']['duygu']
+            # Yalnızca isteğin analiz sürümü güncellenir
+            assert store.get(video_id, 'eski-surum')['ai_sentiment'] is None
+
+
+def test_merge_requires_results_or_store(requests_file):
+    path, _ = requests_file
+    with pytest.raises(SystemExit):
+        ai_toplu_is.main(['merge', path])
@@ -0,0 +1,44 @@
+"""Kayan (rolling) otomatik VTT alt yazılarında tekrar birleştirme (fixtures/rolling_*)"""
+import os
+from collections import Counter
+
+import pytest
+
+from altyazi_parser import CaptionStreamParser, parse_caption_chunks
+from conftest import FIXTURES_DIR
+
+LANGUAGES = ['en', 'tr']
+
+
+def _parse(language, merge_rolling, chunk_size=64 * 1024):
+    with open(os.path.join(FIXTURES_DIR, f"rolling_{language}.vtt"), 'rb') as f:
+        data = f.read()
+    chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    return parse_caption_chunks(chunks, CaptionStreamParser(merge_rolling=merge_rolling))
+
+
+def _expected(language):
+    with open(os.path.join(FIXTURES_DIR, f"rolling_{language}.txt"), 'r', encoding='utf-8') as f:
+        return f.read().strip()
+
+
+@pytest.mark.parametrize('chunk_size', [7, 64 * 1024])
+@pytest.mark.parametrize('language', LANGUAGES)
+def test_merge_rolling_matches_expected_text(language, chunk_size):
+    segments = _parse(language, merge_rolling=True, chunk_size=chunk_size)
+
+    assert ' '.join(segment.text for segment in segments) == _expected(language)
+    # Zamanlar sıralı kalır
+    starts = [segment.start_ms for segment in segments]
+    assert starts == sorted(starts)
+
+
+@pytest.mark.parametrize('language', LANGUAGES)
+def test_without_merge_repeated_lines_are_kept(language):
+    merged = _parse(language, merge_rolling=True)
+    segments = _parse(language, merge_rolling=False)
+
+    repeated = [text for text, count in Counter(segment.text for segment in segments).items() if count > 1]
+    assert repeated
+    assert len(segments) > len(merged)
+    assert ' '.join(segment.text for segment in segments) != _expected(language)
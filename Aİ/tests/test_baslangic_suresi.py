@@ -0,0 +1,12 @@
+"""Giriş modülleri içe aktarılırken ağır paketler yüklenmemeli (python -X importtime, ayrı yorumlayıcı)"""
+import pytest
+
+from baslangic_suresi import DEFAULT_BUDGETS_MS, HEAVY_MODULES, measure
+
+
+@pytest.mark.parametrize('module', sorted(DEFAULT_BUDGETS_MS))
+def test_entry_module_does_not_load_heavy_packages(module):
+    total, packages = measure(module)
+
+    assert total > 0, f"{module} importtime çıktısında bulunamadı"
+    assert [name for name in HEAVY_MODULES if name in packages] == []
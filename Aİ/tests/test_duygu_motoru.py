@@ -0,0 +1,53 @@
+"""Sözlük motorunun TextBlob ile eşliği (polarity ve subjectivity, 1e-9 içinde)"""
+import os
+
+import pytest
+
+from conftest import FIXTURES_DIR
+from duygu_motoru import get_sentiment_backend
+
+pytest.importorskip('textblob')
+
+TOLERANCE = 1e-9
+
+# Korpusta olmayan kenar durumlar: olumsuzlama, yoğunlaştırıcılar, noktalama, boş metin
+EDGE_CASES = [
+    '',
+    '!!!',
+    'not good',
+    'not very good at all',
+    'very very good',
+    'this is NOT bad!!!',
+    "it's the best, isn't it?",
+    'good... bad... ok',
+    'GREAT',
+    'extremely terrible and awful',
+]
+
+
+def _corpus():
+    with open(os.path.join(FIXTURES_DIR, 'duygu_korpusu.txt'), 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+@pytest.fixture(scope='module')
+def backends():
+    return get_sentiment_backend('textblob'), get_sentiment_backend('lexicon')
+
+
+@pytest.mark.parametrize('texts', [_corpus(), EDGE_CASES], ids=['korpus', 'kenar'])
+def test_lexicon_matches_textblob(backends, texts):
+    reference, candidate = backends
+    expected = reference.score_batch(texts)
+    actual = candidate.score_batch(texts)
+
+    assert len(actual) == len(texts)
+    for text, want, got in zip(texts, expected, actual):
+        assert got[0] == pytest.approx(want[0], abs=TOLERANCE), f"polarity: {text!r}"
+        assert got[1] == pytest.approx(want[1], abs=TOLERANCE), f"subjectivity: {text!r}"
+
+
+def test_score_matches_batch(backends):
+    _, candidate = backends
+    texts = _corpus()[:10]
+    assert [candidate.score(text) for text in texts] == candidate.score_batch(texts)
@@ -0,0 +1,92 @@
+"""Whisper istekleri: paylaşılan sınırlayıcı, maliyet tahmini ve tekrar deneme"""
+from types import SimpleNamespace
+
+import pytest
+
+import ai_hiz_siniri
+from ai_hiz_siniri import PRIORITY_BATCH, RateLimiter
+from ses_transkript import AUDIO_BITRATE_BPS, TRANSCRIPTION_TOKENS_PER_MINUTE, OpenAITranscriptionBackend
+
+
+class RecordingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__(rpm=1000, tpm=10 ** 6)
+        self.acquired = []
+
+    def acquire(self, tokens, priority=ai_hiz_siniri.PRIORITY_INTERACTIVE):
+        self.acquired.append((tokens, priority))
+        super().acquire(tokens, priority)
+
+
+class RateLimited(Exception):
+    status_code = 429
+    response = SimpleNamespace(headers={'retry-after': '0.5'})
+
+
+class FakeClient:
+    """client.audio.transcriptions.create; ilk fail_first çağrı 429 döndürür"""
+
+    def __init__(self, fail_first=0):
+        self.calls = []
+        self.fail_first = fail_first
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self.create))
+
+    def create(self, file, **kwargs):
+        self.calls.append(file.read())
+        if len(self.calls) <= self.fail_first:
+            raise RateLimited()
+        return SimpleNamespace(segments=[SimpleNamespace(start=0.0, end=1.5, text=' merhaba ')])
+
+
+@pytest.fixture
+def chunk(tmp_path):
+    # 32 kbps'de iki dakikalık parça boyutu
+    path = tmp_path / 'parca.mp3'
+    path.write_bytes(b'\0' * (AUDIO_BITRATE_BPS // 8 * 120))
+    return str(path)
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    seen = []
+
+    def fake_delay(attempt, after=None, **kwargs):
+        seen.append(after)
+        return 0.0
+    monkeypatch.setattr(ai_hiz_siniri, 'retry_delay', fake_delay)
+    return seen
+
+
+def test_estimate_tokens_from_file_size(chunk):
+    assert OpenAITranscriptionBackend.estimate_tokens(chunk) == 2 * TRANSCRIPTION_TOKENS_PER_MINUTE
+
+
+def test_transcribe_uses_shared_limiter(chunk):
+    limiter = RecordingLimiter()
+    backend = OpenAITranscriptionBackend(client=FakeClient(), limiter=limiter, priority=PRIORITY_BATCH)
+
+    assert backend.transcribe(chunk, 'tr') == [(0, 1500, 'merhaba')]
+    assert limiter.acquired == [(2 * TRANSCRIPTION_TOKENS_PER_MINUTE, PRIORITY_BATCH)]
+
+
+def test_transcribe_retries_429_and_rereads_file(chunk, delays, capsys):
+    limiter = RecordingLimiter()
+    client = FakeClient(fail_first=2)
+    backend = OpenAITranscriptionBackend(client=client, limiter=limiter)
+
+    assert backend.transcribe(chunk) == [(0, 1500, 'merhaba')]
+    assert len(client.calls) == 3
+    # Her deneme dosyanın tamamını gönderir
+    assert all(len(data) == len(client.calls[0]) > 0 for data in client.calls)
+    assert len(limiter.acquired) == 3
+    assert limiter.stats()['retries'] == 2
+    assert delays == [pytest.approx(0.5), pytest.approx(0.5)]
+
+
+def test_max_attempts_is_respected(chunk, delays, capsys):
+    client = FakeClient(fail_first=10)
+    backend = OpenAITranscriptionBackend(client=client, limiter=RecordingLimiter(), max_attempts=2)
+
+    with pytest.raises(RateLimited):
+        backend.transcribe(chunk)
+    assert len(client.calls) == 2
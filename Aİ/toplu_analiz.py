@@ -0,0 +1,372 @@
+"""
+Toplu Video Duygu Analizi
+URL listesi dosyası, oynatma listesi veya kanal URL'sindeki tüm videoları
+sınırlı bir iş parçacığı havuzunda analiz eder ve sonuçları NDJSON olarak yazar.
+
+Kullanım:
+    python toplu_analiz.py urls.txt --workers 8 --output sonuclar.ndjson
+    python toplu_analiz.py "https://www.youtube.com/playlist?list=..." --ai
+    python toplu_analiz.py urls.txt --ai --cascade --gate-margin 0.05
+    python toplu_analiz.py urls.txt --ai --bulk istekler.jsonl --output sonuclar.ndjson
+    python toplu_analiz.py "https://www.youtube.com/@kanal"
+    python toplu_analiz.py urls.txt --metrics-log olcumler.jsonl --metrics-prom video.prom
+    python toplu_analiz.py "https://www.youtube.com/@kanal" --store --store-batch 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ai_hiz_siniri import DEFAULT_RPM, DEFAULT_TPM, PRIORITY_BATCH, RateLimiter, get_rate_limiter
+from ai_kapisi import DEFAULT_MARGIN, DEFAULT_MAX_SUBJECTIVITY, AIGate
+from ai_toplu_is import BulkRequestWriter
+from duygu_motoru import BACKENDS, DEFAULT_BACKEND
+import olcum
+from ses_transkript import DEFAULT_CONCURRENCY, TRANSCRIPTION_BACKENDS, AudioTranscriber, get_transcription_backend
+from sonuc_deposu import DEFAULT_BATCH_SIZE, ResultStore, default_db_path
+from youtube_url import extract_video_id, video_url
+
+# Sekmesi belirtilmemiş kanal URL'leri (/@isim, /channel/ID, /c/isim, /user/isim)
+CHANNEL_PATH_PREFIXES = ('/@', '/channel/', '/c/', '/user/')
+CHANNEL_TABS = ('/videos', '/shorts', '/streams', '/playlists', '/featured')
+
+# İç içe oynatma listelerinde en fazla bu kadar derine inilir (kanal -> sekme -> video)
+MAX_PLAYLIST_DEPTH = 3
+
+
+def read_url_file(path: str) -> List[str]:
+    """Her satırda bir URL olan dosyayı okur (boş satırlar ve # yorumları atlanır)"""
+    urls = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                urls.append(line)
+    return urls
+
+
+def _channel_videos_url(url: str) -> str:
+    """Sekmesiz kanal URL'sini /videos sekmesine yönlendirir"""
+    path = url.split('youtube.com', 1)[-1].split('?', 1)[0].rstrip('/')
+    if path.startswith(CHANNEL_PATH_PREFIXES) and not path.endswith(CHANNEL_TABS):
+        return url.split('?', 1)[0].rstrip('/') + '/videos'
+    return url
+
+
+def _flat_entries(ydl, url: str, depth: int = 0) -> Iterator[str]:
+    """Düz (flat) çıkarma ile oynatma listesindeki video URL'lerini üretir"""
+    info = ydl.extract_info(url, download=False)
+    if not info:
+        return
+
+    entries = info.get('entries')
+    if entries is None:
+        # Tek video
+        video_id = info.get('id')
+        if video_id and extract_video_id(video_id):
+            yield video_url(video_id)
+        return
+
+    for entry in entries:
+        if not entry:
+            continue
+
+        video_id = entry.get('id')
+        entry_url = entry.get('url') or entry.get('webpage_url')
+        if entry.get('ie_key') in (None, 'Youtube') and video_id and extract_video_id(video_id):
+            yield video_url(video_id)
+        elif entry_url and depth < MAX_PLAYLIST_DEPTH:
+            # Kanal sekmesi veya iç içe liste
+            yield from _flat_entries(ydl, entry_url, depth + 1)
+
+
+def enumerate_videos(source: str) -> Iterator[str]:
+    """
+    Kaynaktaki video URL'lerini üretir
+
+    Args:
+        source: URL listesi dosyası, video URL'si, oynatma listesi veya kanal URL'si
+
+    Returns:
+        Video URL'leri (aynı video bir kez döner)
+    """
+    seen = set()
+    for url in _source_urls(source):
+        key = extract_video_id(url) or url
+        if key in seen:
+            continue
+        seen.add(key)
+        yield url
+
+
+def _source_urls(source: str) -> Iterator[str]:
+    """Kaynağın türüne göre (dosya, tek video, liste/kanal) URL'leri üretir"""
+    if os.path.isfile(source):
+        yield from read_url_file(source)
+    elif extract_video_id(source) and 'list=' not in source:
+        yield source
+    else:
+        from yt_dlp import YoutubeDL
+
+        ydl_opts = {
+            'extract_flat': 'in_playlist',
+            'skip_download': True,
+            'quiet': True,
+            'no_warnings': True,
+            'ignoreerrors': True,
+        }
+        with YoutubeDL(ydl_opts) as ydl:
+            yield from _flat_entries(ydl, _channel_videos_url(source))
+
+
+class BatchSummary:
+    """Toplu çalışmanın sayaçları"""
+
+    def __init__(self):
+        self.total = 0
+        self.ok = 0
+        self.failed = 0
+        self.started = time.time()
+
+    def add(self, record: Dict[str, any]):
+        self.total += 1
+        if record['status'] == 'ok':
+            self.ok += 1
+        else:
+            self.failed += 1
+
+    def to_dict(self) -> Dict[str, any]:
+        elapsed = time.time() - self.started
+        return {
+            'total': self.total,
+            'ok': self.ok,
+            'failed': self.failed,
+            'elapsed_seconds': round(elapsed, 2),
+            'videos_per_second': round(self.total / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+
+
+def _analyze_one(analyzer, url: str, use_ai: bool, include_transcript: bool, timeline: bool) -> Dict[str, any]:
+    """Tek videoyu analiz eder; hatalar kayda yazılır, dışarı sızmaz"""
+    started = time.time()
+    record = {'url': url, 'video_id': extract_video_id(url)}
+
+    try:
+        result = analyzer.analyze_video(url, use_ai=use_ai, timeline=timeline)
+    except Exception as e:
+        record.update(status='error', error=str(e) or type(e).__name__)
+    else:
+        if 'error' in result:
+            record.update(status='error', error=result['error'])
+        else:
+            if not include_transcript:
+                result = {key: value for key, value in result.items() if key != 'transcript'}
+            record.update(status='ok', result=result)
+
+    record['elapsed'] = round(time.time() - started, 3)
+    return record
+
+
+def analyze_batch(analyzer, urls: Iterable[str], workers: int = 4, use_ai: bool = False,
+                  include_transcript: bool = False, timeline: bool = False) -> Iterator[Dict[str, any]]:
+    """
+    Videoları iş parçacığı havuzunda analiz eder, her video bitince sonucunu üretir
+
+    Args:
+        analyzer: VideoDuyguAnalizi örneği (iş parçacıkları arasında paylaşılır)
+        urls: Video URL'leri
+        workers: Aynı anda analiz edilecek video sayısı
+        use_ai: OpenAI ile detaylı analiz yap
+        include_transcript: Transkript metnini sonuca ekle
+        timeline: Duygu zaman çizelgesi çıkar
+
+    Returns:
+        Bitiş sırasına göre video kayıtları (url, video_id, status, result/error, elapsed)
+    """
+    workers = max(1, workers)
+    url_iter = iter(urls)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='video') as executor:
+        pending = set()
+
+        def submit_next() -> bool:
+            url = next(url_iter, None)
+            if url is None:
+                return False
+            pending.add(executor.submit(_analyze_one, analyzer, url, use_ai, include_transcript, timeline))
+            return True
+
+        # Havuzu dolu tut ama tüm listeyi birden kuyruğa atma
+        for _ in range(workers * 2):
+            if not submit_next():
+                break
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                yield future.result()
+                submit_next()
+
+
+def run_batch(sources: List[str], output, workers: int = 4, use_ai: bool = False,
+              include_transcript: bool = False, timeline: bool = False, analyzer=None,
+              sentiment_backend: Optional[str] = None, processes: Optional[int] = None,
+              ai_gate=None, ai_limiter=None, ai_bulk=None, audio_transcriber=None, store=None) -> Dict[str, any]:
+    """
+    Kaynaklardaki tüm videoları analiz eder ve sonuçları NDJSON olarak yazar
+
+    Args:
+        sources: URL dosyaları, video, oynatma listesi veya kanal URL'leri
+        output: Yazılabilir metin akışı (her satır bir JSON kaydı)
+        workers: İş parçacığı sayısı
+        use_ai: OpenAI ile detaylı analiz yap
+        include_transcript: Transkript metnini sonuca ekle
+        timeline: Duygu zaman çizelgesi çıkar
+        analyzer: Kullanılacak VideoDuyguAnalizi (varsayılan: yeni, sessiz örnek)
+        sentiment_backend: Yeni örnek için duygu motoru ('textblob' veya 'lexicon')
+        processes: Yeni örnekte duygu puanlaması için işçi süreç sayısı (None: iş parçacığında)
+        ai_gate: Yeni örnekte kademeli AI modu için ai_kapisi.AIGate
+        ai_limiter: Yeni örnekte OpenAI RPM/TPM sınırlayıcısı (varsayılan: paylaşılan)
+        ai_bulk: Yeni örnekte AI isteklerini Batch API için yazan ai_toplu_is.BulkRequestWriter
+        audio_transcriber: Yeni örnekte alt yazısız videolar için ses_transkript.AudioTranscriber
+        store: Verilirse başarılı sonuçlar bu sonuc_deposu.ResultStore'a toplu olarak yazılır
+
+    Returns:
+        Çalışma özeti
+    """
+    owns_analyzer = analyzer is None
+    if owns_analyzer:
+        from video_duygu_analizi import VideoDuyguAnalizi
+        analyzer = VideoDuyguAnalizi(verbose=False, sentiment_backend=sentiment_backend or DEFAULT_BACKEND,
+                                     sentiment_processes=processes, ai_gate=ai_gate,
+                                     ai_limiter=ai_limiter, ai_priority=PRIORITY_BATCH, ai_bulk=ai_bulk,
+                                     audio_transcriber=audio_transcriber)
+
+    def all_urls() -> Iterator[str]:
+        for source in sources:
+            try:
+                yield from enumerate_videos(source)
+            except Exception as e:
+                print(f"⚠️  Kaynak okunamadı ({source}): {e}", file=sys.stderr)
+
+    summary = BatchSummary()
+    try:
+        for record in analyze_batch(analyzer, all_urls(), workers=workers, use_ai=use_ai,
+                                    include_transcript=include_transcript, timeline=timeline):
+            summary.add(record)
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+            if store is not None and record['status'] == 'ok':
+                store.add(record['result'], url=record['url'])
+
+            mark = '✅' if record['status'] == 'ok' else '❌'
+            print(f"{mark} [{summary.total}] {record['url']} ({record['elapsed']}s)", file=sys.stderr)
+    finally:
+        if owns_analyzer:
+            analyzer.close()
+
+    result = summary.to_dict()
+    if use_ai and getattr(analyzer, 'ai_cache', None):
+        result['ai_cache'] = analyzer.ai_cache.stats()
+    if use_ai and getattr(analyzer, 'ai_gate', None):
+        result['ai_gate'] = analyzer.ai_gate.stats()
+    if use_ai and getattr(analyzer, 'ai_limiter', None):
+        result['ai_limiter'] = analyzer.ai_limiter.stats()
+    if use_ai and getattr(analyzer, 'ai_bulk', None):
+        result['ai_bulk'] = analyzer.ai_bulk.stats()
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="YouTube videolarını toplu olarak duygu analizinden geçirir")
+    parser.add_argument('sources', nargs='+', help="URL listesi dosyası, video, oynatma listesi veya kanal URL'si")
+    parser.add_argument('-w', '--workers', type=int, default=4, help="Aynı anda analiz edilecek video sayısı (varsayılan: 4)")
+    parser.add_argument('-o', '--output', help="NDJSON çıktı dosyası (varsayılan: standart çıktı)")
+    parser.add_argument('--ai', action='store_true', help="OpenAI ile detaylı analiz yap")
+    parser.add_argument('--cascade', action='store_true',
+                        help="Kademeli mod: AI'ı yalnızca yerel sonucun belirsiz olduğu videolarda çağır (--ai ile)")
+    parser.add_argument('--gate-margin', type=float, default=DEFAULT_MARGIN,
+                        help=f"Polarite ±0.1/±0.3 eşiklerine bu kadar yakınsa AI çağrılır (varsayılan: {DEFAULT_MARGIN})")
+    parser.add_argument('--gate-subjectivity', type=float, default=DEFAULT_MAX_SUBJECTIVITY,
+                        help=f"Subjektivite bu değer veya üzerindeyse AI çağrılır (varsayılan: {DEFAULT_MAX_SUBJECTIVITY})")
+    parser.add_argument('--transcript', action='store_true', help="Transkript metnini çıktıya ekle")
+    parser.add_argument('--timeline', action='store_true', help="Duygu zaman çizelgesini çıktıya ekle")
+    parser.add_argument('--bulk', metavar='JSONL',
+                        help="AI isteklerini göndermek yerine Batch API için bu dosyaya yaz (--ai ile; "
+                             "sonra: python ai_toplu_is.py run JSONL SONUCLAR)")
+    parser.add_argument('--audio', choices=sorted(TRANSCRIPTION_BACKENDS),
+                        help="Alt yazısı olmayan videoları sesten yazıya dök (openai: whisper-1, faster-whisper: yerel CPU)")
+    parser.add_argument('--audio-concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Bir videoda aynı anda yazıya dökülen ses parçası (varsayılan: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--rpm', type=int, help=f"OpenAI dakikadaki istek sınırı (varsayılan: OPENAI_RPM veya {DEFAULT_RPM})")
+    parser.add_argument('--tpm', type=int, help=f"OpenAI dakikadaki token sınırı (varsayılan: OPENAI_TPM veya {DEFAULT_TPM})")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="Duygu motoru: textblob veya aynı sonucu daha hızlı veren lexicon (varsayılan: textblob)")
+    parser.add_argument('-p', '--processes', type=int,
+                        help="Duygu puanlamasını bu kadar işçi süreçte yap (çok çekirdekli makinelerde)")
+    parser.add_argument('--store', nargs='?', const='', metavar='DB',
+                        help="Başarılı sonuçları SQLite sonuç deposuna yaz (varsayılan dosya: önbellek klasöründe results.sqlite3)")
+    parser.add_argument('--store-batch', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Depoya her işlemde yazılacak sonuç sayısı (varsayılan: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--metrics-log', metavar='DOSYA',
+                        help="Aşama ölçümlerini satır başına bir JSON olarak yaz ('-': standart hata)")
+    parser.add_argument('--metrics-prom', metavar='DOSYA',
+                        help="Bitişte Prometheus metin biçiminde ölçümleri yaz (textfile collector)")
+    args = parser.parse_args(argv)
+
+    # Alt yazı bağlantı havuzu en az eşzamanlı video sayısı kadar olmalı
+    # http_session requests'i yükler; içe aktarma hızlı kalsın diye burada
+    from http_session import DEFAULT_HOST_POOL_SIZES, configure_http_session
+
+    configure_http_session(host_pool_sizes={prefix: max(size, args.workers * 2)
+                                            for prefix, size in DEFAULT_HOST_POOL_SIZES.items()})
+
+    ai_gate = AIGate(args.gate_margin, args.gate_subjectivity) if args.cascade else None
+    ai_bulk = BulkRequestWriter(args.bulk) if args.ai and args.bulk else None
+    # Sohbet ve Whisper istekleri aynı RPM/TPM bütçesini paylaşır
+    ai_limiter = RateLimiter(args.rpm, args.tpm) if args.rpm or args.tpm else get_rate_limiter()
+    audio_transcriber = None
+    if args.audio:
+        options = {'limiter': ai_limiter, 'priority': PRIORITY_BATCH} if args.audio == 'openai' else {}
+        audio_transcriber = AudioTranscriber(get_transcription_backend(args.audio, **options),
+                                             concurrency=args.audio_concurrency, verbose=False)
+
+    metrics_log = olcum.JSONLogSink(args.metrics_log) if args.metrics_log else None
+    metrics_prom = olcum.PrometheusSink() if args.metrics_prom else None
+    for sink in (metrics_log, metrics_prom):
+        if sink:
+            olcum.add_sink(sink)
+
+    store = ResultStore(args.store or default_db_path(), batch_size=args.store_batch) if args.store is not None else None
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    try:
+        summary = run_batch(args.sources, output, workers=args.workers, use_ai=args.ai,
+                            include_transcript=args.transcript, timeline=args.timeline,
+                            sentiment_backend=args.backend, processes=args.processes, ai_gate=ai_gate,
+                            ai_limiter=ai_limiter,
+                            ai_bulk=ai_bulk, audio_transcriber=audio_transcriber, store=store)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if ai_bulk:
+            ai_bulk.close()
+        if store:
+            store.close()
+        if metrics_log:
+            olcum.remove_sink(metrics_log)
+            metrics_log.close()
+        if metrics_prom:
+            olcum.remove_sink(metrics_prom)
+            metrics_prom.write(args.metrics_prom)
+
+    print("\n📊 Özet: " + json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Zaman damgalı transkript modeli
+Parça başlangıç/bitiş zamanları ve metin ofsetleri array('i') dizilerinde,
+metnin kendisi tek bir str tamponunda tutulur. 50 binlik transkriptlerde bile
+parça başına sözlük tutmaya göre çok daha az bellek kullanır; zaman aralığına
+göre dilimleme kopya oluşturmaz.
+"""
+import base64
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Parçalar metin tamponunda bu ayraçla birleştirilir
+SEPARATOR = ' '
+
+Segment = Tuple[int, int, str]
+
+
+class _SegmentSequence:
+    """Transcript ve TranscriptView için ortak okuma işlemleri"""
+
+    __slots__ = ()
+
+    def _bounds(self) -> Tuple['Transcript', int, int]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        _, lo, hi = self._bounds()
+        return hi - lo
+
+    def __iter__(self) -> Iterator[Segment]:
+        base, lo, hi = self._bounds()
+        for index in range(lo, hi):
+            yield base._segment(index)
+
+    def __getitem__(self, index: int) -> Segment:
+        base, lo, hi = self._bounds()
+        if index < 0:
+            index += hi - lo
+        if not 0 <= index < hi - lo:
+            raise IndexError(index)
+        return base._segment(lo + index)
+
+    @property
+    def text(self) -> str:
+        """Parçaların birleştirilmiş metni"""
+        base, lo, hi = self._bounds()
+        if lo >= hi:
+            return ''
+        return base._text[base._offsets[lo]:base._offsets[hi] - len(SEPARATOR)]
+
+    @property
+    def starts(self) -> memoryview:
+        """Başlangıç zamanları (ms), kopyasız görünüm"""
+        base, lo, hi = self._bounds()
+        return memoryview(base._starts)[lo:hi]
+
+    @property
+    def ends(self) -> memoryview:
+        """Bitiş zamanları (ms), kopyasız görünüm"""
+        base, lo, hi = self._bounds()
+        return memoryview(base._ends)[lo:hi]
+
+    @property
+    def start_ms(self) -> int:
+        base, lo, hi = self._bounds()
+        return base._starts[lo] if lo < hi else 0
+
+    @property
+    def end_ms(self) -> int:
+        base, lo, hi = self._bounds()
+        return max(base._ends[lo:hi]) if lo < hi else 0
+
+    def texts(self) -> List[str]:
+        """Parça metinlerinin listesi"""
+        return [segment[2] for segment in self]
+
+    def slice_time(self, start_ms: int, end_ms: int) -> 'TranscriptView':
+        """
+        [start_ms, end_ms) aralığıyla kesişen parçaları döndürür
+
+        Args:
+            start_ms: Aralık başlangıcı (ms)
+            end_ms: Aralık sonu (ms)
+
+        Returns:
+            Aynı dizileri paylaşan TranscriptView (kopya yok)
+        """
+        base, lo, hi = self._bounds()
+        # Başlangıcı end_ms'den önce olan parçalar
+        right = bisect_left(base._starts, end_ms, lo, hi)
+        # start_ms'de veya sonrasında başlayanlar, artı öncesinde başlayıp aralığa taşanlar
+        left = bisect_left(base._starts, start_ms, lo, right)
+        while left > lo and base._ends[left - 1] > start_ms:
+            left -= 1
+        return TranscriptView(base, left, right)
+
+    def slice_index(self, start: int, stop: int) -> 'TranscriptView':
+        """Parça indeksine göre kopyasız dilim"""
+        base, lo, hi = self._bounds()
+        start = min(max(lo + start, lo), hi)
+        stop = min(max(lo + stop, start), hi)
+        return TranscriptView(base, start, stop)
+
+
+class Transcript(_SegmentSequence):
+    """Zaman damgalı parçalardan oluşan transkript"""
+
+    def __init__(self, text: str = '', starts: Optional[array] = None, ends: Optional[array] = None,
+                 offsets: Optional[array] = None):
+        """
+        Genelde doğrudan değil, TranscriptBuilder veya from_segments ile oluşturulur.
+
+        Args:
+            text: Parçaların SEPARATOR ile birleştirilmiş metni
+            starts: Parça başlangıçları (ms)
+            ends: Parça bitişleri (ms)
+            offsets: Parçaların metin içindeki başlangıç indeksleri (n+1 eleman)
+        """
+        self._text = text
+        self._starts = starts if starts is not None else array('i')
+        self._ends = ends if ends is not None else array('i')
+        self._offsets = offsets if offsets is not None else array('i', [0])
+
+    def _bounds(self) -> Tuple['Transcript', int, int]:
+        return self, 0, len(self._starts)
+
+    def _segment(self, index: int) -> Segment:
+        start = self._offsets[index]
+        stop = self._offsets[index + 1] - len(SEPARATOR)
+        return self._starts[index], self._ends[index], self._text[start:stop]
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment]) -> 'Transcript':
+        builder = TranscriptBuilder()
+        builder.extend(segments)
+        return builder.build()
+
+    def nbytes(self) -> int:
+        """Dizilerin ve metnin yaklaşık bellek kullanımı (byte)"""
+        arrays = sum(arr.itemsize * len(arr) for arr in (self._starts, self._ends, self._offsets))
+        return arrays + sys.getsizeof(self._text)
+
+    def to_json_arrays(self) -> Dict[str, str]:
+        """Zaman ve ofset dizilerini JSON'a yazılabilir biçime (base64) dönüştürür; metin dahil değildir"""
+        return {
+            'starts': base64.b64encode(self._starts.tobytes()).decode('ascii'),
+            'ends': base64.b64encode(self._ends.tobytes()).decode('ascii'),
+            'offsets': base64.b64encode(self._offsets.tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def from_json_arrays(cls, text: str, data: Dict[str, str]) -> 'Transcript':
+        """to_json_arrays çıktısını ve metni Transcript'e geri dönüştürür"""
+        arrays = []
+        for name in ('starts', 'ends', 'offsets'):
+            arr = array('i')
+            arr.frombytes(base64.b64decode(data[name]))
+            arrays.append(arr)
+        return cls(text, *arrays)
+
+
+class TranscriptView(_SegmentSequence):
+    """Transcript'in bir bölümü; dizileri ve metni kopyalamadan paylaşır"""
+
+    __slots__ = ('_base', '_lo', '_hi')
+
+    def __init__(self, base: Transcript, lo: int, hi: int):
+        self._base = base
+        self._lo = lo
+        self._hi = hi
+
+    def _bounds(self) -> Tuple[Transcript, int, int]:
+        return self._base, self._lo, self._hi
+
+
+class TranscriptBuilder:
+    """Parçaları geldikçe ekleyip sonunda tek bir Transcript oluşturur"""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._starts = array('i')
+        self._ends = array('i')
+        self._offsets = array('i', [0])
+        self._length = 0
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def append(self, start_ms: int, end_ms: int, text: str):
+        self._parts.append(text)
+        self._starts.append(start_ms)
+        self._ends.append(max(end_ms, start_ms))
+        self._length += len(text) + len(SEPARATOR)
+        self._offsets.append(self._length)
+
+    def extend(self, segments: Iterable[Segment]):
+        for start_ms, end_ms, text in segments:
+            self.append(start_ms, end_ms, text)
+
+    def build(self) -> Transcript:
+        starts, ends, offsets = self._starts, self._ends, self._offsets
+
+        # Parçalar neredeyse her zaman sıralı gelir; değilse başlangıca göre sırala
+        if any(starts[i] > starts[i + 1] for i in range(len(starts) - 1)):
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            builder = TranscriptBuilder()
+            builder.extend((starts[i], ends[i], self._parts[i]) for i in order)
+            return builder.build()
+
+        text = SEPARATOR.join(self._parts)
+        return Transcript(text, starts, ends, offsets)
@@ -0,0 +1,71 @@
+"""
+Transkript önbelleği
+Aynı video tekrar analiz edildiğinde meta veri ve alt yazılar yeniden indirilmez.
+Kayıtlar URL'ye göre değil, standart YouTube video ID'sine göre tutulur.
+"""
+import os
+from typing import Any, Dict, Optional
+
+from disk_cache import DiskCache
+from transcript import Transcript
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'video_duygu_analizi')
+
+# Kayıt biçimi değişirse artırılır; eski kayıtlar okunmaz
+# (3: VTT kayan tekrarları birleştirilmiş transkriptler, 4: video meta verisi)
+CACHE_FORMAT_VERSION = 4
+
+
+def cache_key(video_id: str) -> str:
+    """Videonun önbellek anahtarı (sonuç deposunda transkript referansı olarak da tutulur)"""
+    return f"v{CACHE_FORMAT_VERSION}:{video_id}"
+
+
+class TranscriptCache:
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 5000,
+                 max_bytes: int = 500 * 1024 * 1024, ttl: Optional[float] = 7 * 24 * 3600):
+        """
+        Args:
+            cache_dir: Önbellek klasörü (varsayılan: VIDEO_CACHE_DIR veya ~/.cache/video_duygu_analizi)
+            max_entries: En fazla video sayısı
+            max_bytes: Toplam boyut sınırı (byte)
+            ttl: Kayıtların geçerlilik süresi (saniye)
+        """
+        self.cache_dir = cache_dir or os.getenv('VIDEO_CACHE_DIR') or DEFAULT_CACHE_DIR
+        self.store = DiskCache(
+            os.path.join(self.cache_dir, 'transcripts.sqlite3'),
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl=ttl,
+        )
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Önbellekteki transkript kaydını döndürür
+
+        Returns:
+            transcript, segments, language, track, fallback_text, video alanlarını içeren kayıt veya None
+        """
+        entry = self.store.get(self._key(video_id))
+        if entry is None:
+            return None
+
+        # Zaman dizileri ayrı saklanır, metin transcript alanıyla paylaşılır
+        timing = entry.pop('timing', None)
+        entry['segments'] = Transcript.from_json_arrays(entry['transcript'], timing) if timing else None
+        return entry
+
+    def set(self, video_id: str, entry: Dict[str, Any]):
+        """Transkript kaydını önbelleğe yazar"""
+        segments = entry.get('segments')
+        self.store.set(self._key(video_id), {
+            'transcript': entry.get('transcript', ''),
+            'timing': segments.to_json_arrays() if segments else None,
+            'language': entry.get('language'),
+            'track': entry.get('track'),
+            'fallback_text': entry.get('fallback_text', ''),
+            'video': entry.get('video'),
+        })
+
+    def _key(self, video_id: str) -> str:
+        return cache_key(video_id)
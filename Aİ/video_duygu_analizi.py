@@ -2,59 +2,183 @@
 YouTube Video Duygu Analizi
 URL'den videoyu alır, metne dönüştürür ve ruh halini analiz eder
 """
+import asyncio
 import os
 import sys
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
 import re
-import json
 
-# Paketleri kontrol et ve yükle
-missing_packages = []
+# Paketleri kontrol et (içe aktarmadan); yt-dlp, openai ve textblob ilk kullanımda yüklenir
+from bagimliliklar import check_dependencies, load_env
 
-try:
-    from yt_dlp import YoutubeDL
-except ImportError:
-    missing_packages.append("yt-dlp")
+check_dependencies()
 
-try:
-    from openai import OpenAI
-except ImportError:
-    missing_packages.append("openai")
+from ai_hiz_siniri import (PRIORITY_INTERACTIVE, RateLimiter, call_with_retry, call_with_retry_async,
+                           get_rate_limiter)
+from ai_kapisi import AIGate
+from ai_onbellek import AIResponseCache
+from ai_sonuc import AIResultError, combine_results, parse_items, parse_result, response_format
+from ai_parcalama import TextChunk, group_by_tokens, plan_chunks, token_counter
+from altyazi_parser import CaptionStreamParser
+from duygu_motoru import DEFAULT_BACKEND, classify_sentiment, get_sentiment_backend
+from duygu_zaman_cizelgesi import DEFAULT_WINDOWS, sentiment_timeline
+import olcum
+from transcript import Transcript, TranscriptBuilder
+from transcript_cache import TranscriptCache
+from youtube_url import extract_video_id
 
-try:
-    from textblob import TextBlob
-except ImportError:
-    missing_packages.append("textblob")
+# Alt yazı dil önceliği (listede olmayan diller en sona)
+SUBTITLE_LANG_PRIORITY = ['tr', 'en']
+# yt-dlp video bilgisi ayarları; YoutubeDL iş parçacığı başına bir kez kurulur ve tekrar kullanılır
+YDL_INFO_OPTIONS = {
+    'writesubtitles': True,
+    'writeautomaticsub': True,
+    'subtitleslangs': ['tr', 'en'],  # Önce tr ve en, sonra tüm dilleri manuel kontrol edeceğiz
+    'skip_download': True,
+    'quiet': True,  # Sessiz mod
+    'no_warnings': False,
+    'extract_flat': False,
+    'ignoreerrors': False,  # Hataları göster
+}
+# Ayrıştırabildiğimiz formatlar, küçük değer = daha iyi
+SUBTITLE_FORMAT_PRIORITY = {'json3': 0, 'srv3': 1, 'vtt': 2}
+# Alt yazı akışının okunma parça boyutu (byte)
+SUBTITLE_CHUNK_SIZE = 64 * 1024
+# Metin içermeyen izler
+SKIP_SUBTITLE_LANGS = {'live_chat'}
 
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    missing_packages.append("python-dotenv")
+# AI analizi modeli ve senkron sürümde aynı anda en fazla kaç OpenAI isteği açık olur
+# (json_schema response_format desteklemesi gerekir)
+AI_MODEL = "gpt-4o-mini"
+AI_TEMPERATURE = 0.3
+AI_MAX_CONCURRENT_REQUESTS = 8
+# Çoklu modda bir isteğe konan metinlerin toplam token bütçesi ve en fazla metin sayısı
+AI_BATCH_TOKENS = 6000
+AI_BATCH_ITEMS = 8
+# İstem şablonları değişince artırılır; eski önbellek cevapları kullanılmaz
+AI_PROMPT_VERSION = 'v2'
+AI_SYSTEM_PROMPT = "Sen bir duygu analizi uzmanısın. Verilen metni analiz edip ruh halini, duyguyu ve tonunu belirliyorsun."
 
-if missing_packages:
-    print("❌ Gerekli paketler yüklü değil!")
-    print(f"Eksik paketler: {', '.join(missing_packages)}")
-    print("Lütfen şu komutu çalıştırın: pip install -r requirements.txt")
-    input("Enter'a basın...")
-    sys.exit(1)
+# analyze_video_async: her aşamada aynı anda en fazla kaç iş yürür
+DEFAULT_ASYNC_LIMITS = {
+    'extraction': 8,   # yt-dlp extract_info (executor iş parçacığı tutar)
+    'subtitle': 32,    # alt yazı HTTP istekleri
+    'sentiment': 4,    # duygu motoru (CPU)
+    'ai': 16,          # OpenAI istekleri
+    'audio': 2,        # sesten transkript (her video kendi içinde parçaları paralel işler)
+}
 
-# Import'ları yap
-from yt_dlp import YoutubeDL
-from openai import OpenAI
-from textblob import TextBlob
-from dotenv import load_dotenv
 
-load_dotenv()
+def _format_ms(ms: Optional[int]) -> str:
+    """Milisaniyeyi dd:ss (veya ss:dd:ss) biçimine çevirir"""
+    seconds = (ms or 0) // 1000
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+class _CaptionReader:
+    """Alt yazı akışını ayrıştırır; indirme ve ayrıştırma sürelerini ayrı ölçer"""
+    
+    def __init__(self, merge_rolling: bool = True):
+        """
+        Args:
+            merge_rolling: VTT kayan tekrarlarını birleştir (yalnızca otomatik alt yazılar; manuel
+                alt yazılarda tekrarlanan satırlar gerçektir)
+        """
+        self.parser = CaptionStreamParser(merge_rolling=merge_rolling)
+        self.builder = TranscriptBuilder()
+        self.bytes = 0
+        self.parse_seconds = 0.0
+        self._started = time.perf_counter()
+    
+    def feed(self, chunk: bytes):
+        self.bytes += len(chunk)
+        started = time.perf_counter()
+        self.builder.extend(self.parser.feed(chunk))
+        self.parse_seconds += time.perf_counter() - started
+    
+    def close(self):
+        started = time.perf_counter()
+        self.builder.extend(self.parser.close())
+        self.parse_seconds += time.perf_counter() - started
+    
+    def record(self):
+        """subtitle_fetch (ağ) ve subtitle_parse aşamalarını kaydeder"""
+        elapsed = time.perf_counter() - self._started
+        olcum.record('subtitle_fetch', elapsed - self.parse_seconds, bytes=self.bytes)
+        olcum.record('subtitle_parse', self.parse_seconds, segments=len(self.builder))
 
 
 class VideoDuyguAnalizi:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_dir: Optional[str] = None, use_cache: bool = True,
+                 verbose: bool = True, async_limits: Optional[Dict[str, int]] = None,
+                 sentiment_backend: str = DEFAULT_BACKEND, sentiment_processes: Optional[int] = None,
+                 ai_concurrency: int = AI_MAX_CONCURRENT_REQUESTS, ai_gate: Optional[AIGate] = None,
+                 ai_limiter: Optional[RateLimiter] = None, ai_priority: int = PRIORITY_INTERACTIVE,
+                 ai_bulk=None, audio_transcriber=None):
         """
         Args:
             api_key: OpenAI API anahtarı (opsiyonel, .env'den de alınabilir)
+            cache_dir: Transkript önbelleği klasörü (opsiyonel, VIDEO_CACHE_DIR'den de alınabilir)
+            use_cache: Transkript ve AI cevap önbelleklerini kullan (varsayılan: True)
+            verbose: İlerleme mesajlarını ekrana yaz (varsayılan: True)
+            async_limits: analyze_video_async aşama limitleri (extraction, subtitle, sentiment, ai, audio)
+            sentiment_backend: Duygu motoru: 'textblob' veya daha hızlı, aynı sonuçları veren 'lexicon'
+            sentiment_processes: Verilirse duygu puanlaması bu kadar işçi süreçte yapılır (çok çekirdek)
+            ai_concurrency: Senkron AI analizinde aynı anda açık en fazla OpenAI isteği
+            ai_gate: Verilirse kademeli mod: AI yalnızca yerel sonucun belirsiz olduğu videolarda çağrılır
+            ai_limiter: OpenAI RPM/TPM sınırlayıcısı (varsayılan: süreç genelinde paylaşılan)
+            ai_priority: Sınırlayıcı kuyruğundaki öncelik (PRIORITY_INTERACTIVE veya PRIORITY_BATCH)
+            ai_bulk: Verilirse (ai_toplu_is.BulkRequestWriter) AI istekleri gönderilmez, Batch API için yazılır
+            audio_transcriber: Verilirse (ses_transkript.AudioTranscriber) alt yazısı olmayan videolar sesten yazıya dökülür
         """
+        load_env()
+        self.verbose = verbose
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=self.api_key) if self.api_key else None
+        self._client = None
+        self.cache = TranscriptCache(cache_dir) if use_cache else None
+        self.ai_cache = AIResponseCache(cache_dir) if use_cache else None
+        self.async_limits = {**DEFAULT_ASYNC_LIMITS, **(async_limits or {})}
+        self._async = None
+        self._ai_slots = threading.BoundedSemaphore(max(1, ai_concurrency))
+        self.ai_concurrency = max(1, ai_concurrency)
+        self.ai_gate = ai_gate
+        self.ai_limiter = ai_limiter or get_rate_limiter()
+        self.ai_priority = ai_priority
+        self.ai_bulk = ai_bulk
+        self.audio_transcriber = audio_transcriber
+        self._ydl_local = threading.local()
+        self._ydl_instances = []
+        self._ydl_lock = threading.Lock()
+        if sentiment_processes:
+            from duygu_havuzu import ProcessSentimentPool
+            self.sentiment_backend = ProcessSentimentPool(sentiment_backend, sentiment_processes)
+        else:
+            self.sentiment_backend = get_sentiment_backend(sentiment_backend)
+        # Sonuç deposundaki anahtarın parçası; motor veya AI istemi değişince aynı video yeniden kaydedilir
+        self.analysis_version = f"{self.sentiment_backend.name}+{AI_MODEL}/{AI_PROMPT_VERSION}"
+    
+    def _log(self, message: str):
+        """İlerleme mesajını yazar (verbose kapalıysa sessiz kalır)"""
+        if self.verbose:
+            print(message)
+    
+    @property
+    def client(self):
+        """OpenAI istemcisi; openai paketi ilk AI isteğinde yüklenir (API anahtarı yoksa None)"""
+        if self._client is None and self.api_key:
+            from openai import OpenAI
+            # Tekrar denemeler ai_limiter ile yapılır; istemcinin kendi denemeleri kapalı
+            self._client = OpenAI(api_key=self.api_key, max_retries=0)
+        return self._client
+    
+    @client.setter
+    def client(self, value):
+        self._client = value
     
     def get_video_transcript(self, url: str) -> str:
         """
@@ -66,224 +190,338 @@ class VideoDuyguAnalizi:
         Returns:
             Video transkripti (metin)
         """
-        print("🎥 Video analiz ediliyor...")
+        self._log("🎥 Video analiz ediliyor...")
+        entry = self._get_transcript_entry(url)
+        return self._transcript_or_fallback(entry)
+    
+    def get_timed_transcript(self, url: str) -> Optional[Transcript]:
+        """
+        Alt yazıdan zaman damgalı transkripti alır
+        
+        Args:
+            url: YouTube video URL'si
+            
+        Returns:
+            Transcript (parça zamanları + metin), alt yazı yoksa None
+        """
+        return self._get_transcript_entry(url).get('segments')
+    
+    def _get_transcript_entry(self, url: str) -> Dict[str, any]:
+        """Transkript kaydını önbellekten veya YouTube'dan alır"""
+        video_id = extract_video_id(url)
+        
+        if self.cache and video_id:
+            with olcum.stage('transcript_cache') as fields:
+                entry = self.cache.get(video_id)
+                fields['cache_hits' if entry is not None else 'cache_misses'] = 1
+            if entry is not None:
+                self._log(f"💾 Önbellekten alındı ({video_id})")
+                entry['video_id'] = video_id
+                return entry
+        
+        entry = self._fetch_transcript_entry(url)
+        video_id = video_id or entry.get('video_id')
+        
+        if self.cache and video_id:
+            self.cache.set(video_id, entry)
+        return entry
+    
+    def _fetch_transcript_entry(self, url: str) -> Dict[str, any]:
+        """
+        yt-dlp ile video bilgilerini alır ve en uygun alt yazıyı indirir
         
+        Returns:
+            video_id, transcript, language, track ve fallback_text alanları
+        """
         try:
-            # yt-dlp ile video bilgilerini al
-            ydl_opts = {
-                'writesubtitles': True,
-                'writeautomaticsub': True,
-                'subtitleslangs': ['tr', 'en'],  # Önce tr ve en, sonra tüm dilleri manuel kontrol edeceğiz
-                'skip_download': True,
-                'quiet': True,  # Sessiz mod
-                'no_warnings': False,
-                'extract_flat': False,
-                'ignoreerrors': False,  # Hataları göster
-            }
+            with olcum.stage('extract_info'):
+                info = self._extract_info(url)
+            
+            segments = None
+            chosen = None
+            for track in self._subtitle_candidates(info):
+                kind = "otomatik" if track['auto'] else "manuel"
+                self._log(f"📝 {track['lang']} {kind} alt yazı deneniyor ({track['ext']})...")
+                segments = self._download_subtitle(track['url'], track['auto'])
+                if segments and len(segments.text) > 50:
+                    chosen = track
+                    break
+            
+            if chosen is None and self.audio_transcriber:
+                with olcum.stage('audio_transcribe'):
+                    chosen, segments = self._transcribe_audio(url, info)
+            
+            return self._make_transcript_entry(info, chosen, segments)
             
-            with YoutubeDL(ydl_opts) as ydl:
-                print("📝 Video bilgileri alınıyor...")
-                info = None
-                error_occurred = False
-                
-                try:
-                    # İlk deneme - normal mod
-                    info = ydl.extract_info(url, download=False)
-                except Exception as e:
-                    error_msg = str(e)
-                    error_occurred = True
-                    print(f"⚠️  İlk deneme başarısız: {error_msg[:150]}")
-                    
-                    # Özel hata mesajları
-                    if 'Private video' in error_msg or 'private' in error_msg.lower():
-                        raise Exception("Bu video özel (private). Transkript alınamaz.")
-                    elif 'Video unavailable' in error_msg or 'unavailable' in error_msg.lower():
-                        raise Exception("Video mevcut değil veya silinmiş.")
-                    elif 'Sign in' in error_msg or 'age-restricted' in error_msg.lower():
-                        raise Exception("Video yaş kısıtlamalı veya giriş gerektiriyor.")
-                    
-                    # Alternatif yöntem dene
-                    try:
-                        print("🔄 Alternatif yöntem deneniyor...")
-                        ydl_opts_alt = ydl_opts.copy()
-                        ydl_opts_alt['quiet'] = True
-                        ydl_opts_alt['no_warnings'] = True
-                        with YoutubeDL(ydl_opts_alt) as ydl_alt:
-                            info = ydl_alt.extract_info(url, download=False)
-                    except Exception as e2:
-                        print(f"❌ Alternatif yöntem de başarısız: {str(e2)[:150]}")
-                        raise Exception(f"Video bilgileri alınamadı. Hata: {error_msg[:200]}")
-                
-                if not info:
-                    if error_occurred:
-                        raise Exception("Video bilgileri alınamadı. Video erişilebilir mi kontrol edin.")
-                    else:
-                        raise Exception("Video bilgileri alınamadı (info None). Video URL'si doğru mu kontrol edin.")
-                
-                # Tüm mevcut alt yazıları kontrol et
-                subtitles = info.get('subtitles', {}) if info else {}
-                auto_captions = info.get('automatic_captions', {}) if info else {}
-                
-                print(f"🔍 Mevcut alt yazılar: {list(subtitles.keys()) if subtitles else 'Yok'}")
-                print(f"🔍 Otomatik alt yazılar: {list(auto_captions.keys()) if auto_captions else 'Yok'}")
-                
-                transcript_text = ""
-                
-                # Tüm dilleri topla
-                all_languages = set()
-                if subtitles:
-                    all_languages.update(subtitles.keys())
-                if auto_captions:
-                    all_languages.update(auto_captions.keys())
-                
-                # Öncelik sırası: tr, en, diğer diller
-                languages_to_try = ['tr', 'en'] + [lang for lang in all_languages if lang not in ['tr', 'en']]
-                
-                print(f"🌐 Denenecek diller: {languages_to_try[:5]}...")  # İlk 5'ini göster
-                
-                for lang in languages_to_try:
-                    if not transcript_text:
-                        # Önce manuel alt yazıları dene
-                        if lang in subtitles:
-                            print(f"📝 {lang} manuel alt yazı deneniyor...")
-                            transcript_text = self._download_subtitle(url, lang, auto=False)
-                            if transcript_text and len(transcript_text) > 50:
-                                break
-                        
-                        # Sonra otomatik alt yazıları dene
-                        if not transcript_text and lang in auto_captions:
-                            print(f"📝 {lang} otomatik alt yazı deneniyor...")
-                            transcript_text = self._download_subtitle(url, lang, auto=True)
-                            if transcript_text and len(transcript_text) > 50:
-                                break
-                
-                if transcript_text and len(transcript_text) > 50:
-                    print(f"✅ Transkript alındı! ({len(transcript_text)} karakter)")
-                    return transcript_text
-                
-                # Eğer transkript yoksa, video başlığı ve açıklamasını kullan
-                print("\n⚠️  Transkript bulunamadı!")
-                title = info.get('title', '')
-                description = info.get('description', '')
-                
-                # Açıklamayı temizle (linkler, hashtag'ler vb.)
-                if description:
-                    # İlk 3000 karakteri al (çok uzun olabilir)
-                    description = description[:3000]
-                    # Çok kısa satırları birleştir
-                    lines = description.split('\n')
-                    clean_lines = []
-                    for line in lines:
-                        line = line.strip()
-                        # Linkleri, hashtag'leri ve özel karakterleri temizle
-                        if line and not line.startswith('http') and not line.startswith('#') and len(line) > 10:
-                            # Email ve linkleri temizle
-                            line = re.sub(r'http\S+|www\.\S+', '', line)
-                            line = re.sub(r'\S+@\S+', '', line)
-                            if line and len(line.strip()) > 10:
-                                clean_lines.append(line.strip())
-                    description = ' '.join(clean_lines)
-                
-                # Başlık ve açıklamayı birleştir
-                combined_text = f"{title}"
-                if description and len(description) > 50:
-                    combined_text += f"\n\n{description}"
-                
-                if len(combined_text) > 200:
-                    print(f"📄 Video başlığı ve açıklaması kullanılıyor... ({len(combined_text)} karakter)")
-                    print("💡 Not: Bu video için transkript bulunamadı, sadece başlık ve açıklama analiz edilecek.")
-                    return combined_text
-                elif len(combined_text) > 20:
-                    print(f"⚠️  Sadece video başlığı kullanılıyor... ({len(combined_text)} karakter)")
-                    print("💡 Not: Bu video için transkript bulunamadı. Analiz çok sınırlı olacak.")
-                    return combined_text
-                else:
-                    print("❌ Video'da transkript veya yeterli açıklama bulunamadı.")
-                    print("💡 Bu video için analiz yapılamıyor.")
-                    print("💡 Lütfen transkripti olan başka bir video deneyin.")
-                    return ""
-                
         except Exception as e:
-            print(f"❌ Transkript alınırken hata: {e}")
+            self._log(f"❌ Transkript alınırken hata: {e}")
             raise
     
-    def _download_subtitle(self, url: str, lang: str, auto: bool = False) -> str:
-        """Alt yazı dosyasını indirir ve metne dönüştürür"""
+    def _youtube_dl(self):
+        """Bu iş parçacığının YoutubeDL örneği (çıkarıcılar her videoda yeniden kurulmaz)"""
+        ydl = getattr(self._ydl_local, 'ydl', None)
+        if ydl is None:
+            from yt_dlp import YoutubeDL
+            ydl = YoutubeDL(dict(YDL_INFO_OPTIONS))
+            self._ydl_local.ydl = ydl
+            with self._ydl_lock:
+                self._ydl_instances.append(ydl)
+        return ydl
+    
+    def warm_up(self):
+        """
+        yt-dlp ve OpenAI istemcisini önceden hazırlar
+        
+        Uzun ömürlü süreçlerde (analiz_sunucusu) ilk isteğin paket yükleme ve istemci
+        kurulum süresini ödememesi için başlangıçta çağrılır.
+        """
+        self._youtube_dl()
+        if self.api_key:
+            self.client
+    
+    def _extract_info(self, url: str) -> Dict[str, any]:
+        """yt-dlp ile video bilgilerini alır (tek extract_info çağrısı, hata olursa bir alternatif deneme)"""
+        ydl = self._youtube_dl()
+        self._log("📝 Video bilgileri alınıyor...")
+        info = None
+        error_occurred = False
+        
         try:
-            ydl_opts = {
-                'writesubtitles': not auto,
-                'writeautomaticsub': auto,
-                'subtitleslangs': [lang],
-                'skip_download': True,
-                'quiet': True,
-                'no_warnings': False,
-                'ignoreerrors': True,
-            }
+            # İlk deneme - normal mod
+            info = ydl.extract_info(url, download=False)
+        except Exception as e:
+            error_msg = str(e)
+            error_occurred = True
+            self._log(f"⚠️  İlk deneme başarısız: {error_msg[:150]}")
+            
+            # Özel hata mesajları
+            if 'Private video' in error_msg or 'private' in error_msg.lower():
+                raise Exception("Bu video özel (private). Transkript alınamaz.")
+            elif 'Video unavailable' in error_msg or 'unavailable' in error_msg.lower():
+                raise Exception("Video mevcut değil veya silinmiş.")
+            elif 'Sign in' in error_msg or 'age-restricted' in error_msg.lower():
+                raise Exception("Video yaş kısıtlamalı veya giriş gerektiriyor.")
             
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+            # Alternatif yöntem dene
+            try:
+                self._log("🔄 Alternatif yöntem deneniyor...")
+                from yt_dlp import YoutubeDL
                 
-                # VTT dosyasını indir
-                if auto:
-                    subtitle_url = info.get('automatic_captions', {}).get(lang, [{}])[0].get('url')
-                else:
-                    subtitle_url = info.get('subtitles', {}).get(lang, [{}])[0].get('url')
+                ydl_opts_alt = dict(YDL_INFO_OPTIONS)
+                ydl_opts_alt['quiet'] = True
+                ydl_opts_alt['no_warnings'] = True
+                with YoutubeDL(ydl_opts_alt) as ydl_alt:
+                    info = ydl_alt.extract_info(url, download=False)
+            except Exception as e2:
+                self._log(f"❌ Alternatif yöntem de başarısız: {str(e2)[:150]}")
+                raise Exception(f"Video bilgileri alınamadı. Hata: {error_msg[:200]}")
+        
+        if not info:
+            if error_occurred:
+                raise Exception("Video bilgileri alınamadı. Video erişilebilir mi kontrol edin.")
+            else:
+                raise Exception("Video bilgileri alınamadı (info None). Video URL'si doğru mu kontrol edin.")
+        
+        return info
+    
+    def _subtitle_candidates(self, info: Dict) -> List[Dict[str, any]]:
+        """Mevcut alt yazıları raporlar ve denenecek izleri sıralı döndürür"""
+        # Tüm mevcut alt yazıları kontrol et
+        subtitles = info.get('subtitles', {}) if info else {}
+        auto_captions = info.get('automatic_captions', {}) if info else {}
+        
+        self._log(f"🔍 Mevcut alt yazılar: {list(subtitles.keys()) if subtitles else 'Yok'}")
+        self._log(f"🔍 Otomatik alt yazılar: {list(auto_captions.keys()) if auto_captions else 'Yok'}")
+        
+        # Tüm izleri tek seferde sırala; sadece seçilen izlerin URL'leri indirilir
+        tracks = self._select_subtitle_tracks(info)
+        
+        self._log(f"🌐 Denenecek diller: {[track['lang'] for track in tracks[:5]]}...")  # İlk 5'ini göster
+        return tracks
+    
+    def _transcribe_audio(self, url: str, info: Dict) -> Tuple[Optional[Dict[str, any]], Optional[Transcript]]:
+        """Alt yazı yoksa sesi parçalar halinde yazıya döker; başarısızsa (None, None)"""
+        self._log("🎧 Alt yazı yok, ses yazıya dökülüyor...")
+        language = info.get('language')
+        try:
+            segments = self.audio_transcriber.transcribe_url(info.get('webpage_url') or url,
+                                                             info.get('duration'), language)
+        except Exception as e:
+            self._log(f"⚠️  Ses yazıya dökülemedi: {e}")
+            return None, None
+        
+        if not segments or len(segments.text) <= 50:
+            return None, None
+        track = {'lang': language or 'ses', 'auto': True, 'ext': f"ses:{self.audio_transcriber.backend.name}"}
+        return track, segments
+    
+    def _make_transcript_entry(self, info: Dict, chosen: Optional[Dict], segments: Optional[Transcript]) -> Dict[str, any]:
+        """Önbelleğe yazılacak transkript kaydını oluşturur"""
+        return {
+            'video_id': info.get('id'),
+            'transcript': segments.text if chosen else "",
+            'segments': segments if chosen else None,
+            'language': chosen['lang'] if chosen else None,
+            'track': {'auto': chosen['auto'], 'ext': chosen['ext']} if chosen else None,
+            'fallback_text': self._build_fallback_text(info),
+            'video': self._video_metadata(info),
+        }
+    
+    def _video_metadata(self, info: Dict) -> Dict[str, any]:
+        """Sonuç deposu sorguları için başlık, kanal ve yükleme tarihi (YYYY-MM-DD)"""
+        upload_date = info.get('upload_date')
+        if upload_date and len(upload_date) == 8 and upload_date.isdigit():
+            upload_date = f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:]}"
+        return {
+            'title': info.get('title'),
+            'channel': info.get('channel') or info.get('uploader'),
+            'channel_id': info.get('channel_id'),
+            'upload_date': upload_date,
+            'duration': info.get('duration'),
+        }
+    
+    def _build_fallback_text(self, info: Dict) -> str:
+        """Transkript yoksa kullanılacak başlık + temizlenmiş açıklama metni"""
+        title = info.get('title', '') or ''
+        description = info.get('description', '') or ''
+        
+        # Açıklamayı temizle (linkler, hashtag'ler vb.)
+        if description:
+            # İlk 3000 karakteri al (çok uzun olabilir)
+            description = description[:3000]
+            # Çok kısa satırları birleştir
+            lines = description.split('\n')
+            clean_lines = []
+            for line in lines:
+                line = line.strip()
+                # Linkleri, hashtag'leri ve özel karakterleri temizle
+                if line and not line.startswith('http') and not line.startswith('#') and len(line) > 10:
+                    # Email ve linkleri temizle
+                    line = re.sub(r'http\S+|www\.\S+', '', line)
+                    line = re.sub(r'\S+@\S+', '', line)
+                    if line and len(line.strip()) > 10:
+                        clean_lines.append(line.strip())
+            description = ' '.join(clean_lines)
+        
+        # Başlık ve açıklamayı birleştir
+        combined_text = f"{title}"
+        if description and len(description) > 50:
+            combined_text += f"\n\n{description}"
+        return combined_text
+    
+    def _transcript_or_fallback(self, entry: Dict[str, any]) -> str:
+        """Transkript varsa onu, yoksa başlık ve açıklamayı döndürür"""
+        transcript_text = entry.get('transcript', '')
+        if transcript_text and len(transcript_text) > 50:
+            self._log(f"✅ Transkript alındı! ({len(transcript_text)} karakter)")
+            return transcript_text
+        
+        # Eğer transkript yoksa, video başlığı ve açıklamasını kullan
+        self._log("\n⚠️  Transkript bulunamadı!")
+        combined_text = entry.get('fallback_text', '')
+        
+        if len(combined_text) > 200:
+            self._log(f"📄 Video başlığı ve açıklaması kullanılıyor... ({len(combined_text)} karakter)")
+            self._log("💡 Not: Bu video için transkript bulunamadı, sadece başlık ve açıklama analiz edilecek.")
+            return combined_text
+        elif len(combined_text) > 20:
+            self._log(f"⚠️  Sadece video başlığı kullanılıyor... ({len(combined_text)} karakter)")
+            self._log("💡 Not: Bu video için transkript bulunamadı. Analiz çok sınırlı olacak.")
+            return combined_text
+        else:
+            self._log("❌ Video'da transkript veya yeterli açıklama bulunamadı.")
+            self._log("💡 Bu video için analiz yapılamıyor.")
+            self._log("💡 Lütfen transkripti olan başka bir video deneyin.")
+            return ""
+    
+    def _select_subtitle_tracks(self, info: Dict) -> List[Dict[str, any]]:
+        """
+        extract_info sonucundaki tüm alt yazı izlerini dil ve formata göre sıralar
+        
+        Args:
+            info: yt-dlp extract_info sonucu
+            
+        Returns:
+            Denenecek izler (lang, auto, ext, url), en iyi aday başta
+        """
+        tracks = []
+        sources = [
+            (info.get('subtitles') or {}, False),
+            (info.get('automatic_captions') or {}, True),
+        ]
+        
+        for source, auto in sources:
+            for lang, formats in source.items():
+                if lang in SKIP_SUBTITLE_LANGS or not formats:
+                    continue
                 
-                if subtitle_url:
-                    import requests
-                    try:
-                        response = requests.get(subtitle_url, timeout=10)
-                        response.raise_for_status()
-                        subtitle_text = response.text
-                        
-                        # JSON formatını kontrol et (YouTube'un yeni formatı)
-                        if subtitle_text.strip().startswith('{') or 'wireMagic' in subtitle_text or '"events"' in subtitle_text:
-                            try:
-                                subtitle_data = json.loads(subtitle_text)
-                                # JSON formatından metni çıkar
-                                clean_text = []
-                                if 'events' in subtitle_data:
-                                    for event in subtitle_data['events']:
-                                        if 'segs' in event:
-                                            for seg in event['segs']:
-                                                if 'utf8' in seg:
-                                                    text = seg['utf8'].strip()
-                                                    # Özel karakterleri temizle
-                                                    text = text.replace('>>', '').replace('<<', '')
-                                                    if text and text != '\n' and len(text) > 0:
-                                                        clean_text.append(text)
-                                
-                                result = ' '.join(clean_text)
-                                if result and len(result) > 20:
-                                    return result
-                            except (json.JSONDecodeError, KeyError) as e:
-                                print(f"⚠️  JSON parse hatası: {e}")
-                                pass  # JSON değilse VTT olarak işle
-                        
-                        # VTT formatını temizle
-                        lines = subtitle_text.split('\n')
-                        clean_text = []
-                        for line in lines:
-                            line = line.strip()
-                            # VTT zaman damgalarını ve HTML etiketlerini kaldır
-                            if line and not line.startswith('<') and not re.match(r'^\d+$', line) and not '-->' in line and not line.startswith('WEBVTT') and not line.startswith('NOTE'):
-                                # HTML etiketlerini temizle
-                                line = re.sub(r'<[^>]+>', '', line)
-                                # Özel karakterleri temizle
-                                line = line.replace('>>', '').replace('<<', '')
-                                if line and len(line) > 1:
-                                    clean_text.append(line)
-                        
-                        result = ' '.join(clean_text)
-                        if result and len(result) > 20:
-                            return result
-                    except requests.RequestException as e:
-                        print(f"⚠️  Alt yazı indirme hatası: {e}")
-                        return ""
+                # Bu dil için ayrıştırabildiğimiz en iyi formatı seç
+                candidates = [f for f in formats if f.get('url') and f.get('ext') in SUBTITLE_FORMAT_PRIORITY]
+                if not candidates:
+                    continue
+                best = min(candidates, key=lambda f: SUBTITLE_FORMAT_PRIORITY[f['ext']])
+                
+                # Öncelik sırası: tr, en, diğer diller; her dilde önce manuel, sonra otomatik.
+                # Otomatik çeviriler (tlang) orijinal izlerden sonra gelir.
+                base_lang = lang.split('-')[0]
+                lang_rank = SUBTITLE_LANG_PRIORITY.index(base_lang) if base_lang in SUBTITLE_LANG_PRIORITY else len(SUBTITLE_LANG_PRIORITY)
+                translated = 'tlang=' in best['url']
+                
+                tracks.append({
+                    'lang': lang,
+                    'auto': auto,
+                    'ext': best['ext'],
+                    'url': best['url'],
+                    '_rank': (lang_rank, auto, translated),
+                })
+        
+        tracks.sort(key=lambda track: track['_rank'])
+        for track in tracks:
+            del track['_rank']
+        return tracks
+    
+    def _download_subtitle(self, subtitle_url: str, auto: bool = True) -> Optional[Transcript]:
+        """
+        Seçilen alt yazı izini akış halinde indirir ve zaman damgalı transkripte dönüştürür
+        
+        Args:
+            subtitle_url: Alt yazı URL'si
+            auto: Otomatik alt yazı mı (kayan tekrar birleştirmesi yalnızca bunlarda yapılır)
+        """
+        if not subtitle_url:
+            return None
+        
+        import requests
+        from http_session import get_http_session
+        
+        reader = _CaptionReader(merge_rolling=auto)
+        try:
+            with get_http_session().get(subtitle_url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(SUBTITLE_CHUNK_SIZE):
+                    reader.feed(chunk)
+            reader.close()
+            return self._finish_transcript(reader.builder, reader.parser)
+        except requests.RequestException as e:
+            self._log(f"⚠️  Alt yazı indirme hatası: {e}")
         except Exception as e:
-            print(f"⚠️  Alt yazı indirilirken hata: {e}")
+            self._log(f"⚠️  Alt yazı indirilirken hata: {e}")
+        finally:
+            reader.record()
         
-        return ""
+        return None
+    
+    def _finish_transcript(self, builder: TranscriptBuilder,
+                           parser: Optional[CaptionStreamParser] = None) -> Optional[Transcript]:
+        """Ayrıştırılan parçalardan transkripti oluşturur; çok kısa sonuçlar geçersiz sayılır"""
+        stats = parser.stats() if parser else None
+        if stats and stats['chars_after'] < stats['chars_before']:
+            self._log(f"🧹 Kayan alt yazı tekrarları birleştirildi: {stats['segments_before']} → "
+                      f"{stats['segments_after']} parça, {stats['chars_before']} → {stats['chars_after']} karakter")
+        segments = builder.build()
+        if len(segments.text) > 20:
+            return segments
+        return None
     
     def analyze_sentiment_textblob(self, text: str) -> Dict[str, any]:
         """
@@ -295,122 +533,360 @@ class VideoDuyguAnalizi:
         Returns:
             Duygu analizi sonuçları
         """
-        print("😊 Duygu analizi yapılıyor...")
-        
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity  # -1 (negatif) ile 1 (pozitif) arası
-        subjectivity = blob.sentiment.subjectivity  # 0 (objektif) ile 1 (subjektif) arası
-        
-        # Ruh halini belirle
-        if polarity > 0.3:
-            ruh_hali = "Mutlu 😊"
-            duygu = "Pozitif"
-        elif polarity > 0.1:
-            ruh_hali = "İyi 👍"
-            duygu = "Hafif Pozitif"
-        elif polarity > -0.1:
-            ruh_hali = "Nötr 😐"
-            duygu = "Nötr"
-        elif polarity > -0.3:
-            ruh_hali = "Üzgün 😔"
-            duygu = "Hafif Negatif"
-        else:
-            ruh_hali = "Çok Üzgün/Kızgın 😢"
-            duygu = "Negatif"
+        from textblob import TextBlob
         
-        return {
-            'ruh_hali': ruh_hali,
-            'duygu': duygu,
-            'polarity': polarity,
-            'subjectivity': subjectivity,
-            'yuzde': round((polarity + 1) * 50, 1)  # 0-100 arası yüzde
-        }
+        self._log("😊 Duygu analizi yapılıyor...")
+        
+        with olcum.stage('sentiment'):
+            blob = TextBlob(text)
+            return classify_sentiment(blob.sentiment.polarity, blob.sentiment.subjectivity)
     
-    def analyze_sentiment_ai(self, text: str) -> Dict[str, any]:
+    def analyze_sentiment(self, text: str) -> Dict[str, any]:
         """
-        OpenAI ile gelişmiş duygu analizi yapar
+        Seçili duygu motoruyla analiz yapar (analyze_sentiment_textblob ile aynı çıktı)
         
         Args:
             text: Analiz edilecek metin
             
+        Returns:
+            Duygu analizi sonuçları
+        """
+        self._log("😊 Duygu analizi yapılıyor...")
+        
+        with olcum.stage('sentiment'):
+            polarity, subjectivity = self.sentiment_backend.score(text)
+        return classify_sentiment(polarity, subjectivity)
+    
+    def analyze_sentiment_ai(self, text: str, segments: Optional[Transcript] = None) -> Dict[str, any]:
+        """
+        OpenAI ile gelişmiş duygu analizi yapar
+        
+        Uzun metinler token bütçesine göre parçalara bölünür (map), parçalar aynı anda
+        en fazla ai_concurrency istekle analiz edilir ve sonuçlar tek bir istekle
+        birleştirilir (reduce). Kısa metinler tek istekle analiz edilir.
+        
+        Args:
+            text: Analiz edilecek metin
+            segments: Zaman damgalı transkript (varsa parçalar alt yazı sınırlarından bölünür)
+        
         Returns:
             Duygu analizi sonuçları
         """
         if not self.client:
             return None
         
-        print("🤖 AI ile detaylı duygu analizi yapılıyor...")
+        self._log("🤖 AI ile detaylı duygu analizi yapılıyor...")
         
-        try:
-            # Metni kısalt (token limiti için)
-            text_short = text[:3000] if len(text) > 3000 else text
+        with olcum.stage('ai'):
+            chunks = plan_chunks(text, segments, model=AI_MODEL)
+            if len(chunks) > 1:
+                self._log(f"🧩 Metin {len(chunks)} parçaya bölündü, parçalar paralel analiz ediliyor...")
+            results = self._ai_score_texts([chunk.text for chunk in chunks])
+            if len(chunks) == 1:
+                return results[0]
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Sen bir duygu analizi uzmanısın. Verilen metni analiz edip ruh halini, duyguyu ve tonunu belirliyorsun."},
-                    {"role": "user", "content": f"""Aşağıdaki metni analiz et ve şunları belirle:
+            parts = [(chunk, result) for chunk, result in zip(chunks, results) if result]
+            if not parts:
+                return None
+            
+            reduced = self._ai_reduce(parts) if len(parts) > 1 else parts[0][1]
+            return self._finish_reduce(reduced, parts)
+    
+    def ai_bulk_plan(self, text: str, segments: Optional[Transcript] = None) -> Dict[str, any]:
+        """
+        Metnin AI isteklerini göndermeden hazırlar (Batch API toplu modu için)
+        
+        Args:
+            text: Analiz edilecek metin
+            segments: Zaman damgalı transkript
+            
+        Returns:
+            tokens (parça token sayıları), results (önbellekteki parça sonuçları),
+            keys (parça önbellek anahtarları), requests ((parça indeksleri, istek gövdesi) listesi)
+            ve analysis_version (sonuç deposundaki kaydın sürümü)
+        """
+        chunks = plan_chunks(text, segments, model=AI_MODEL)
+        texts = [chunk.text for chunk in chunks]
+        results, batches = self._ai_plan_batches(texts)
+        return {
+            'tokens': [chunk.tokens for chunk in chunks],
+            'results': results,
+            'keys': [self._ai_item_key(text) for text in texts] if self.ai_cache else [],
+            'requests': [(batch, self._ai_batch_request([texts[i] for i in batch])) for batch in batches],
+            'analysis_version': self.analysis_version,
+        }
+    
+    def _queue_ai_bulk(self, entry: Dict[str, any], url: str, transcript: str):
+        """Videonun AI isteklerini toplu iş dosyasına yazar"""
+        plan = self.ai_bulk_plan(transcript, self._ai_segments(entry, transcript))
+        count = self.ai_bulk.add(entry.get('video_id') or url, plan)
+        self._log(f"📝 {count} AI isteği toplu iş dosyasına yazıldı")
+    
+    def analyze_sentiment_ai_many(self, texts: Sequence[str]) -> List[Optional[Dict[str, any]]]:
+        """
+        Birden fazla metni (ör. farklı videoların kısa transkriptleri) toplu analiz eder
+        
+        Metinler token bütçesine göre gruplanır ve her grup tek istekte puanlanır;
+        sistem istemi ve şema her metin için tekrar gönderilmez.
+        
+        Args:
+            texts: Analiz edilecek metinler
+        
+        Returns:
+            Her metin için duygu analizi sonucu (başarısızsa None), aynı sırada
+        """
+        if not self.client:
+            return [None] * len(texts)
+        
+        self._log(f"🤖 {len(texts)} metin AI ile toplu analiz ediliyor...")
+        return self._ai_score_texts(texts)
+    
+    def _ai_score_texts(self, texts: Sequence[str]) -> List[Optional[Dict[str, any]]]:
+        """Önbellekte olmayan metinleri gruplar halinde, gruplar paralel olacak şekilde puanlar"""
+        results, batches = self._ai_plan_batches(texts)
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.ai_concurrency, len(batches)),
+                                    thread_name_prefix='ai') as executor:
+                batch_results = list(executor.map(
+                    olcum.bind(lambda batch: self._ai_score_batch([texts[i] for i in batch])), batches))
+            self._ai_store_batches(texts, batches, batch_results, results)
+        return results
+    
+    def _ai_plan_batches(self, texts: Sequence[str]) -> Tuple[List[Optional[Dict[str, any]]], List[List[int]]]:
+        """Önbellekteki sonuçları doldurur, kalan metinleri istek gruplarına ayırır"""
+        results: List[Optional[Dict[str, any]]] = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            cached = self.ai_cache.get(self._ai_item_key(text)) if self.ai_cache else None
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+        
+        olcum.count('ai', cache_hits=len(texts) - len(pending), cache_misses=len(pending))
+        groups = group_by_tokens([texts[i] for i in pending], AI_BATCH_TOKENS, AI_BATCH_ITEMS, model=AI_MODEL)
+        return results, [[pending[i] for i in group] for group in groups]
+    
+    def _ai_store_batches(self, texts: Sequence[str], batches: List[List[int]],
+                          batch_results: List[List[Optional[Dict[str, any]]]], results: List[Optional[Dict[str, any]]]):
+        """Grup sonuçlarını sırasına yerleştirir ve metin bazında önbelleğe yazar"""
+        for batch, values in zip(batches, batch_results):
+            for index, value in zip(batch, values):
+                results[index] = value
+                if value is not None and self.ai_cache:
+                    self.ai_cache.set(self._ai_item_key(texts[index]), value)
+    
+    def _ai_item_key(self, text: str) -> str:
+        """Metin bazında önbellek anahtarı; metnin hangi grupta gönderildiğinden bağımsızdır"""
+        return self.ai_cache.key(AI_MODEL, AI_PROMPT_VERSION, AI_TEMPERATURE, text)
+    
+    def _ai_score_batch(self, texts: List[str]) -> List[Optional[Dict[str, any]]]:
+        content = self._ai_complete(self._ai_batch_request(texts))
+        return self._parse_ai_batch(content, len(texts))
+    
+    def _ai_reduce(self, parts: List[Tuple[TextChunk, Dict[str, any]]]) -> Optional[Dict[str, any]]:
+        request = self._ai_reduce_request(parts)
+        key = self._ai_request_key(request)
+        if key:
+            cached = self.ai_cache.get(key)
+            olcum.count('ai', **{'cache_hits' if cached is not None else 'cache_misses': 1})
+            if cached is not None:
+                return cached
+        
+        result = self._parse_ai_batch(self._ai_complete(request), 1)[0]
+        if key and result is not None:
+            self.ai_cache.set(key, result)
+        return result
+    
+    def _ai_complete(self, request: Dict[str, any]) -> Optional[str]:
+        """
+        Tek chat.completions isteği; RPM/TPM sınırlayıcısından pay alınır, geçici hatalarda
+        tekrar denenir ve aynı anda açık istek sayısı ai_concurrency ile sınırlıdır
+        """
+        def send():
+            with self._ai_slots:
+                return self.client.chat.completions.create(**request)
+        
+        try:
+            with olcum.stage('ai_request'):
+                response = call_with_retry(send, self.ai_limiter, self._ai_request_tokens(request),
+                                           self.ai_priority, log=self._log)
+            return response.choices[0].message.content
+        except Exception as e:
+            self._log(f"⚠️  AI analizi yapılırken hata: {e}")
+            return None
+    
+    def _ai_request_tokens(self, request: Dict[str, any]) -> int:
+        """TPM sınırı için isteğin tahmini token sayısı (istem + en fazla cevap)"""
+        count_tokens = token_counter(request['model'])
+        return sum(count_tokens(message['content']) for message in request['messages']) + request['max_tokens']
+    
+    def _ai_request_key(self, request: Dict[str, any]) -> Optional[str]:
+        """İsteğin cevap önbelleği anahtarı (önbellek kapalıysa None)"""
+        if not self.ai_cache:
+            return None
+        text = '\n'.join(message['content'] for message in request['messages'])
+        return self.ai_cache.key(request['model'], AI_PROMPT_VERSION, request.get('temperature'), text)
+    
+    def _ai_chat_request(self, prompt: str, multi: bool = False, max_tokens: int = 200) -> Dict[str, any]:
+        return {
+            'model': AI_MODEL,
+            'messages': [
+                {"role": "system", "content": AI_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            'response_format': response_format(multi),
+            'max_tokens': max_tokens,
+            'temperature': AI_TEMPERATURE,
+        }
+    
+    def _ai_request(self, text: str) -> Dict[str, any]:
+        """chat.completions.create için istek parametrelerini hazırlar"""
+        return self._ai_chat_request(f"""Aşağıdaki metni analiz et ve şunları belirle:
 1. Ruh hali (Mutlu, Üzgün, Kızgın, Nötr, Korkulu, Şaşkın, vb.)
 2. Genel duygu (Pozitif, Negatif, Nötr)
 3. Duygu yoğunluğu (1-10 arası)
 4. Kısa açıklama
 
 Metin:
-{text_short}
+{text}""")
+    
+    def _ai_batch_request(self, texts: List[str]) -> Dict[str, any]:
+        """Tek metin için normal istek, birden fazlası için id'li çoklu istek"""
+        if len(texts) == 1:
+            return self._ai_request(texts[0])
+        
+        blocks = '\n\n'.join(f"### Metin {index}\n{text}" for index, text in enumerate(texts))
+        return self._ai_chat_request(f"""Aşağıdaki {len(texts)} metnin her birini birbirinden bağımsız analiz et.
+Her metin için id (metin numarası), ruh hali, genel duygu (Pozitif, Negatif, Nötr),
+duygu yoğunluğu (1-10 arası) ve kısa açıklama ver.
 
-Cevabı şu formatta ver:
-Ruh Hali: [ruh hali]
-Duygu: [pozitif/negatif/nötr]
-Yoğunluk: [1-10]
-Açıklama: [kısa açıklama]"""}
-                ],
-                max_tokens=200,
-                temperature=0.3
-            )
-            
-            result_text = response.choices[0].message.content
-            
-            # Sonuçları parse et
-            result = {
-                'ruh_hali': "Bilinmiyor",
-                'duygu': "Bilinmiyor",
-                'yoğunluk': 5,
-                'aciklama': result_text
-            }
-            
-            for line in result_text.split('\n'):
-                if 'Ruh Hali:' in line:
-                    result['ruh_hali'] = line.split('Ruh Hali:')[1].strip()
-                elif 'Duygu:' in line:
-                    result['duygu'] = line.split('Duygu:')[1].strip()
-                elif 'Yoğunluk:' in line:
-                    try:
-                        result['yoğunluk'] = int(re.search(r'\d+', line).group())
-                    except:
-                        pass
-                elif 'Açıklama:' in line:
-                    result['aciklama'] = line.split('Açıklama:')[1].strip()
-            
-            return result
-            
-        except Exception as e:
-            print(f"⚠️  AI analizi yapılırken hata: {e}")
-            return None
+{blocks}""", multi=True, max_tokens=150 * len(texts) + 50)
     
-    def analyze_video(self, url: str, use_ai: bool = False) -> Dict[str, any]:
+    def _ai_reduce_request(self, parts: List[Tuple[TextChunk, Dict[str, any]]]) -> Dict[str, any]:
+        """Parça sonuçlarını videonun geneli için birleştiren istek"""
+        lines = []
+        for index, (chunk, result) in enumerate(parts, 1):
+            span = f" ({_format_ms(chunk.start_ms)}-{_format_ms(chunk.end_ms)})" if chunk.start_ms is not None else ""
+            lines.append(f"Bölüm {index}{span}: Ruh Hali: {result['ruh_hali']} | Duygu: {result['duygu']} | "
+                         f"Yoğunluk: {result['yoğunluk']} | Açıklama: {result['aciklama']}")
+        summary = '\n'.join(lines)
+        
+        return self._ai_chat_request(f"""Aşağıda uzun bir videonun bölümlerinin sırayla yapılmış duygu analizleri var.
+Bunları birleştirerek videonun genelinin ruh halini, duygusunu, yoğunluğunu (1-10) belirle ve kısa açıklama yaz.
+
+{summary}""")
+    
+    def _parse_ai_batch(self, content: Optional[str], count: int) -> List[Optional[Dict[str, any]]]:
+        """Şemaya göre doğrulanmış sonuç sözlükleri; geçersiz cevaplar None olur"""
+        if content is None:
+            return [None] * count
+        try:
+            results = [parse_result(content)] if count == 1 else parse_items(content, count)
+        except AIResultError as e:
+            self._log(f"⚠️  AI cevabı şemaya uymuyor: {e}")
+            return [None] * count
+        
+        missing = sum(1 for result in results if result is None)
+        if missing:
+            self._log(f"⚠️  AI cevabında {missing} metnin sonucu eksik veya geçersiz")
+        return [result.to_dict() if result else None for result in results]
+    
+    def _finish_reduce(self, reduced: Optional[Dict[str, any]],
+                       parts: List[Tuple[TextChunk, Dict[str, any]]]) -> Dict[str, any]:
+        """Reduce isteği başarısızsa parça sonuçlarını token ağırlıklı olarak yerelde birleştirir"""
+        if reduced is None:
+            reduced = combine_results([(chunk.tokens, result) for chunk, result in parts])
+        if len(parts) > 1:
+            reduced['parca_sayisi'] = len(parts)
+        return reduced
+    
+    def analyze_video(self, url: str, use_ai: bool = False, timeline: bool = False,
+                      timeline_windows: Sequence[float] = DEFAULT_WINDOWS) -> Dict[str, any]:
         """
         Video URL'sinden duygu analizi yapar
         
         Args:
             url: YouTube video URL'si
             use_ai: OpenAI kullanarak detaylı analiz yap (varsayılan: False)
+            timeline: Alt yazı zamanlarına göre duygu zaman çizelgesi çıkar (varsayılan: False)
+            timeline_windows: Zaman çizelgesi pencere boyutları (saniye)
             
         Returns:
-            Analiz sonuçları
+            Analiz sonuçları ('timings': aşama başına süre, byte, önbellek ve tekrar sayaçları)
         """
+        with olcum.recording(video_id=extract_video_id(url), url=url) as timings:
+            result = self._analyze_video(url, use_ai, timeline, timeline_windows)
+            timings.status = 'error' if 'error' in result else 'ok'
+        result['timings'] = timings.to_dict()
+        return result
+    
+    def _analyze_video(self, url: str, use_ai: bool, timeline: bool,
+                       timeline_windows: Sequence[float]) -> Dict[str, any]:
         # Transkripti al
-        transcript = self.get_video_transcript(url)
+        self._log("🎥 Video analiz ediliyor...")
+        entry = self._get_transcript_entry(url)
+        transcript = self._transcript_or_fallback(entry)
+        
+        error = self._transcript_error(transcript)
+        if error:
+            return error
+        
+        # Duygu analizi yap
+        sentiment = self.analyze_sentiment(transcript)
+        
+        # Zaman çizelgesi (opsiyonel, sadece zaman damgalı alt yazı varsa)
+        timeline_result = None
+        if timeline and entry.get('segments'):
+            timeline_result = self.analyze_sentiment_timeline(entry['segments'], timeline_windows)
+        
+        # AI analizi (opsiyonel; kademeli modda yalnızca yerel sonuç belirsizse)
+        ai_sentiment = None
+        gate = None
+        if use_ai and self.client:
+            gate = self._check_ai_gate(entry, transcript, sentiment)
+            if self.ai_bulk and (gate is None or gate['call']):
+                self._queue_ai_bulk(entry, url, transcript)
+            elif gate is None or gate['call']:
+                ai_sentiment = self.analyze_sentiment_ai(transcript, self._ai_segments(entry, transcript))
+        
+        return self._build_result(transcript, sentiment, ai_sentiment, timeline_result, gate, entry)
+    
+    def analyze_sentiment_timeline(self, segments: Transcript,
+                                   windows: Sequence[float] = DEFAULT_WINDOWS) -> Dict[str, any]:
+        """
+        Video süresi boyunca kayan pencere duygu eğrisini çıkarır
         
+        Args:
+            segments: Zaman damgalı transkript
+            windows: Pencere boyutları (saniye)
+            
+        Returns:
+            Pencere başına eğri, tepe ve dip noktaları
+        """
+        self._log(f"📈 Duygu zaman çizelgesi çıkarılıyor ({len(segments)} parça)...")
+        with olcum.stage('timeline', segments=len(segments)):
+            return sentiment_timeline(segments, windows, scorer=self.sentiment_backend.score_batch)
+    
+    def _ai_segments(self, entry: Dict[str, any], transcript: str) -> Optional[Transcript]:
+        """Analiz edilen metin alt yazının kendisiyse zaman damgalı parçaları döndürür"""
+        if entry.get('segments') and entry.get('transcript') == transcript:
+            return entry['segments']
+        return None
+    
+    def _check_ai_gate(self, entry: Dict[str, any], transcript: str,
+                       sentiment: Dict[str, any]) -> Optional[Dict[str, any]]:
+        """Kademeli modda AI'ın çağrılıp çağrılmayacağına karar verir (kapı yoksa None)"""
+        if self.ai_gate is None:
+            return None
+        
+        gate = self.ai_gate.check(sentiment, is_fallback=transcript != entry.get('transcript'))
+        if not gate['call']:
+            self._log("⏭️  Yerel sonuç net, AI analizi atlandı")
+        return gate
+    
+    def _transcript_error(self, transcript: str) -> Optional[Dict[str, any]]:
+        """Transkript analiz için yetersizse hata sonucunu döndürür"""
         if not transcript or len(transcript) < 20:
             error_msg = 'Yeterli transkript bulunamadı'
             if transcript:
@@ -421,21 +897,325 @@ Açıklama: [kısa açıklama]"""}
                 'error': error_msg,
                 'transcript': transcript if transcript else ''
             }
-        
-        # Duygu analizi yap
-        sentiment = self.analyze_sentiment_textblob(transcript)
-        
-        # AI analizi (opsiyonel)
-        ai_sentiment = None
-        if use_ai and self.client:
-            ai_sentiment = self.analyze_sentiment_ai(transcript)
-        
-        return {
+        return None
+    
+    def _build_result(self, transcript: str, sentiment: Dict, ai_sentiment: Optional[Dict],
+                      timeline: Optional[Dict] = None, ai_gate: Optional[Dict] = None,
+                      entry: Optional[Dict] = None) -> Dict[str, any]:
+        entry = entry or {}
+        result = {
+            'video_id': entry.get('video_id'),
+            'video': entry.get('video'),
+            'language': entry.get('language'),
+            'analysis_version': self.analysis_version,
             'transcript': transcript,
             'sentiment': sentiment,
             'ai_sentiment': ai_sentiment,
+            'timeline': timeline,
             'transcript_length': len(transcript)
         }
+        if ai_gate is not None:
+            result['ai_gate'] = ai_gate
+        return result
+    
+    # ------------------------------------------------------------------
+    # asyncio sürümü
+    # ------------------------------------------------------------------
+    
+    async def analyze_video_async(self, url: str, use_ai: bool = False, timeline: bool = False,
+                                  timeline_windows: Sequence[float] = DEFAULT_WINDOWS) -> Dict[str, any]:
+        """
+        analyze_video'nun asyncio sürümü
+        
+        yt-dlp çıkarımı executor'da, alt yazılar httpx.AsyncClient ile, AI analizi
+        AsyncOpenAI ile yapılır. Her aşamanın kendi semaforu vardır; yavaş bir aşama
+        iş parçacığı biriktirmek yerine önündeki aşamayı bekletir.
+        
+        Args:
+            url: YouTube video URL'si
+            use_ai: OpenAI kullanarak detaylı analiz yap (varsayılan: False)
+            timeline: Duygu zaman çizelgesi çıkar (varsayılan: False)
+            timeline_windows: Zaman çizelgesi pencere boyutları (saniye)
+            
+        Returns:
+            analyze_video ile aynı biçimde analiz sonuçları
+        """
+        with olcum.recording(video_id=extract_video_id(url), url=url) as timings:
+            result = await self._analyze_video_async(url, use_ai, timeline, timeline_windows)
+            timings.status = 'error' if 'error' in result else 'ok'
+        result['timings'] = timings.to_dict()
+        return result
+    
+    async def _analyze_video_async(self, url: str, use_ai: bool, timeline: bool,
+                                   timeline_windows: Sequence[float]) -> Dict[str, any]:
+        self._log("🎥 Video analiz ediliyor...")
+        entry = await self._get_transcript_entry_async(url)
+        transcript = self._transcript_or_fallback(entry)
+        
+        error = self._transcript_error(transcript)
+        if error:
+            return error
+        
+        loop = asyncio.get_running_loop()
+        async with self._async_stage('sentiment'):
+            sentiment = await loop.run_in_executor(None, olcum.bind(self.analyze_sentiment), transcript)
+        
+        timeline_result = None
+        if timeline and entry.get('segments'):
+            async with self._async_stage('sentiment'):
+                timeline_result = await loop.run_in_executor(
+                    None, olcum.bind(self.analyze_sentiment_timeline), entry['segments'], timeline_windows)
+        
+        ai_sentiment = None
+        gate = None
+        if use_ai and self.api_key:
+            gate = self._check_ai_gate(entry, transcript, sentiment)
+            if self.ai_bulk and (gate is None or gate['call']):
+                await loop.run_in_executor(None, olcum.bind(self._queue_ai_bulk), entry, url, transcript)
+            elif gate is None or gate['call']:
+                ai_sentiment = await self.analyze_sentiment_ai_async(transcript, self._ai_segments(entry, transcript))
+        
+        return self._build_result(transcript, sentiment, ai_sentiment, timeline_result, gate, entry)
+    
+    async def analyze_sentiment_ai_async(self, text: str, segments: Optional[Transcript] = None) -> Optional[Dict[str, any]]:
+        """analyze_sentiment_ai'nin AsyncOpenAI kullanan sürümü (istekler 'ai' semaforuyla sınırlı)"""
+        if not self.api_key:
+            return None
+        
+        self._log("🤖 AI ile detaylı duygu analizi yapılıyor...")
+        
+        with olcum.stage('ai'):
+            chunks = plan_chunks(text, segments, model=AI_MODEL)
+            if len(chunks) > 1:
+                self._log(f"🧩 Metin {len(chunks)} parçaya bölündü, parçalar paralel analiz ediliyor...")
+            results = await self._ai_score_texts_async([chunk.text for chunk in chunks])
+            if len(chunks) == 1:
+                return results[0]
+            
+            parts = [(chunk, result) for chunk, result in zip(chunks, results) if result]
+            if not parts:
+                return None
+            
+            reduced = await self._ai_reduce_async(parts) if len(parts) > 1 else parts[0][1]
+            return self._finish_reduce(reduced, parts)
+    
+    async def analyze_sentiment_ai_many_async(self, texts: Sequence[str]) -> List[Optional[Dict[str, any]]]:
+        """analyze_sentiment_ai_many'nin asyncio sürümü"""
+        if not self.api_key:
+            return [None] * len(texts)
+        
+        self._log(f"🤖 {len(texts)} metin AI ile toplu analiz ediliyor...")
+        return await self._ai_score_texts_async(texts)
+    
+    async def _ai_score_texts_async(self, texts: Sequence[str]) -> List[Optional[Dict[str, any]]]:
+        loop = asyncio.get_running_loop()
+        results, batches = await loop.run_in_executor(None, olcum.bind(self._ai_plan_batches), texts)
+        if batches:
+            batch_results = await asyncio.gather(
+                *(self._ai_score_batch_async([texts[i] for i in batch]) for batch in batches))
+            await loop.run_in_executor(None, self._ai_store_batches, texts, batches, batch_results, results)
+        return results
+    
+    async def _ai_score_batch_async(self, texts: List[str]) -> List[Optional[Dict[str, any]]]:
+        content = await self._ai_complete_async(self._ai_batch_request(texts))
+        return self._parse_ai_batch(content, len(texts))
+    
+    async def _ai_reduce_async(self, parts: List[Tuple[TextChunk, Dict[str, any]]]) -> Optional[Dict[str, any]]:
+        loop = asyncio.get_running_loop()
+        request = self._ai_reduce_request(parts)
+        key = self._ai_request_key(request)
+        if key:
+            cached = await loop.run_in_executor(None, self.ai_cache.get, key)
+            olcum.count('ai', **{'cache_hits' if cached is not None else 'cache_misses': 1})
+            if cached is not None:
+                return cached
+        
+        result = self._parse_ai_batch(await self._ai_complete_async(request), 1)[0]
+        if key and result is not None:
+            await loop.run_in_executor(None, self.ai_cache.set, key, result)
+        return result
+    
+    async def _ai_complete_async(self, request: Dict[str, any]) -> Optional[str]:
+        async def send():
+            async with self._async_stage('ai'):
+                return await self._async_clients()['openai'].chat.completions.create(**request)
+        
+        try:
+            with olcum.stage('ai_request'):
+                response = await call_with_retry_async(send, self.ai_limiter, self._ai_request_tokens(request),
+                                                       self.ai_priority, log=self._log)
+            return response.choices[0].message.content
+        except Exception as e:
+            self._log(f"⚠️  AI analizi yapılırken hata: {e}")
+            return None
+    
+    async def _get_transcript_entry_async(self, url: str) -> Dict[str, any]:
+        """_get_transcript_entry'nin asyncio sürümü"""
+        loop = asyncio.get_running_loop()
+        video_id = extract_video_id(url)
+        
+        if self.cache and video_id:
+            with olcum.stage('transcript_cache') as fields:
+                entry = await loop.run_in_executor(None, self.cache.get, video_id)
+                fields['cache_hits' if entry is not None else 'cache_misses'] = 1
+            if entry is not None:
+                self._log(f"💾 Önbellekten alındı ({video_id})")
+                entry['video_id'] = video_id
+                return entry
+        
+        try:
+            async with self._async_stage('extraction'):
+                with olcum.stage('extract_info'):
+                    info = await loop.run_in_executor(None, self._extract_info, url)
+            
+            segments = None
+            chosen = None
+            for track in self._subtitle_candidates(info):
+                kind = "otomatik" if track['auto'] else "manuel"
+                self._log(f"📝 {track['lang']} {kind} alt yazı deneniyor ({track['ext']})...")
+                async with self._async_stage('subtitle'):
+                    segments = await self._download_subtitle_async(track['url'], track['auto'])
+                if segments and len(segments.text) > 50:
+                    chosen = track
+                    break
+            
+            if chosen is None and self.audio_transcriber:
+                async with self._async_stage('audio'):
+                    with olcum.stage('audio_transcribe'):
+                        chosen, segments = await loop.run_in_executor(None, self._transcribe_audio, url, info)
+            
+            entry = self._make_transcript_entry(info, chosen, segments)
+        except Exception as e:
+            self._log(f"❌ Transkript alınırken hata: {e}")
+            raise
+        
+        video_id = video_id or entry.get('video_id')
+        if self.cache and video_id:
+            await loop.run_in_executor(None, self.cache.set, video_id, entry)
+        return entry
+    
+    async def _download_subtitle_async(self, subtitle_url: str, auto: bool = True) -> Optional[Transcript]:
+        """_download_subtitle'ın httpx.AsyncClient kullanan sürümü"""
+        if not subtitle_url:
+            return None
+        
+        reader = _CaptionReader(merge_rolling=auto)
+        try:
+            async with self._async_clients()['http'].stream('GET', subtitle_url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(SUBTITLE_CHUNK_SIZE):
+                    reader.feed(chunk)
+            reader.close()
+            return self._finish_transcript(reader.builder, reader.parser)
+        except Exception as e:
+            self._log(f"⚠️  Alt yazı indirilirken hata: {e}")
+        finally:
+            reader.record()
+        
+        return None
+    
+    def _async_stage(self, stage: str) -> asyncio.Semaphore:
+        """Aşamanın eşzamanlılık semaforunu döndürür (extraction, subtitle, sentiment, ai, audio)"""
+        return self._async_state()['semaphores'][stage]
+    
+    def _async_clients(self) -> Dict[str, any]:
+        """Çalışan event loop'a ait httpx ve AsyncOpenAI istemcileri"""
+        state = self._async_state()
+        if state['http'] is None:
+            import httpx
+            state['http'] = httpx.AsyncClient(
+                timeout=10,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.async_limits['subtitle'],
+                                    max_keepalive_connections=self.async_limits['subtitle']),
+            )
+        if state['openai'] is None and self.api_key:
+            from openai import AsyncOpenAI
+            state['openai'] = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+        return state
+    
+    def _async_state(self) -> Dict[str, any]:
+        """Semaforlar ve istemciler event loop'a bağlıdır; loop değişirse yeniden oluşturulur"""
+        loop = asyncio.get_running_loop()
+        state = self._async
+        if state is None or state['loop'] is not loop:
+            state = {
+                'loop': loop,
+                'semaphores': {stage: asyncio.Semaphore(limit) for stage, limit in self.async_limits.items()},
+                'http': None,
+                'openai': None,
+            }
+            self._async = state
+        return state
+    
+    async def aclose(self):
+        """asyncio istemcilerini kapatır"""
+        state, self._async = self._async, None
+        if state is None:
+            return
+        if state['http'] is not None:
+            await state['http'].aclose()
+        if state['openai'] is not None:
+            await state['openai'].close()
+    
+    def close(self):
+        """Duygu puanlama işçi süreçlerini (varsa) ve yt-dlp örneklerini kapatır"""
+        close = getattr(self.sentiment_backend, 'close', None)
+        if close is not None:
+            close()
+        with self._ydl_lock:
+            instances, self._ydl_instances = self._ydl_instances, []
+        for ydl in instances:
+            ydl.close()
+
+
+def print_results(results: Dict[str, any], show_transcript: bool = True, file=None):
+    """
+    Analiz sonuçlarını okunabilir biçimde yazar (etkileşimli mod ve cli.py'nin terminal çıktısı)
+    
+    Args:
+        results: analyze_video çıktısı
+        show_transcript: Transkriptin ilk 4000 karakterini de göster
+        file: Yazılacak akış (varsayılan: standart çıktı)
+    """
+    print("\n" + "=" * 60, file=file)
+    print("📊 ANALİZ SONUÇLARI", file=file)
+    print("=" * 60, file=file)
+    
+    sentiment = results['sentiment']
+    print(f"\n😊 Ruh Hali: {sentiment['ruh_hali']}", file=file)
+    print(f"📈 Duygu: {sentiment['duygu']}", file=file)
+    print(f"📊 Pozitiflik Oranı: %{sentiment['yuzde']}", file=file)
+    print(f"📝 Subjektivite: {sentiment['subjectivity']:.2f}", file=file)
+    
+    if results['ai_sentiment']:
+        ai = results['ai_sentiment']
+        print(f"\n🤖 AI Analizi:", file=file)
+        print(f"   Ruh Hali: {ai['ruh_hali']}", file=file)
+        print(f"   Duygu: {ai['duygu']}", file=file)
+        print(f"   Yoğunluk: {ai['yoğunluk']}/10", file=file)
+        print(f"   Açıklama: {ai['aciklama']}", file=file)
+    
+    print(f"\n📄 Transkript Uzunluğu: {results['transcript_length']} karakter", file=file)
+    
+    if not show_transcript:
+        return
+    
+    # Transkripti otomatik göster
+    print("\n" + "=" * 60, file=file)
+    print("📝 TRANSKRİPT", file=file)
+    print("=" * 60, file=file)
+    transcript = results['transcript']
+    if len(transcript) > 2000:
+        # Uzun transkriptleri böl
+        print(transcript[:2000], file=file)
+        print("\n... (devam ediyor) ...\n", file=file)
+        print(transcript[2000:4000] if len(transcript) > 4000 else transcript[2000:], file=file)
+        if len(transcript) > 4000:
+            print(f"\n... (toplam {len(transcript)} karakter, {len(transcript) - 4000} karakter daha var) ...", file=file)
+    else:
+        print(transcript, file=file)
+    print("=" * 60, file=file)
 
 
 def main():
@@ -475,42 +1255,7 @@ def main():
             input("\n⏸️  Enter'a basın...")
             return
         
-        # Sonuçları göster
-        print("\n" + "=" * 60)
-        print("📊 ANALİZ SONUÇLARI")
-        print("=" * 60)
-        
-        sentiment = results['sentiment']
-        print(f"\n😊 Ruh Hali: {sentiment['ruh_hali']}")
-        print(f"📈 Duygu: {sentiment['duygu']}")
-        print(f"📊 Pozitiflik Oranı: %{sentiment['yuzde']}")
-        print(f"📝 Subjektivite: {sentiment['subjectivity']:.2f}")
-        
-        if results['ai_sentiment']:
-            ai = results['ai_sentiment']
-            print(f"\n🤖 AI Analizi:")
-            print(f"   Ruh Hali: {ai['ruh_hali']}")
-            print(f"   Duygu: {ai['duygu']}")
-            print(f"   Yoğunluk: {ai['yoğunluk']}/10")
-            print(f"   Açıklama: {ai['aciklama']}")
-        
-        print(f"\n📄 Transkript Uzunluğu: {results['transcript_length']} karakter")
-        
-        # Transkripti otomatik göster
-        print("\n" + "=" * 60)
-        print("📝 TRANSKRİPT")
-        print("=" * 60)
-        transcript = results['transcript']
-        if len(transcript) > 2000:
-            # Uzun transkriptleri böl
-            print(transcript[:2000])
-            print("\n... (devam ediyor) ...\n")
-            print(transcript[2000:4000] if len(transcript) > 4000 else transcript[2000:])
-            if len(transcript) > 4000:
-                print(f"\n... (toplam {len(transcript)} karakter, {len(transcript) - 4000} karakter daha var) ...")
-        else:
-            print(transcript)
-        print("=" * 60)
+        print_results(results)
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Program kullanıcı tarafından durduruldu.")
@@ -523,6 +1268,11 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 or not sys.stdin.isatty():
+        # Argüman veya boru hattı varsa etkileşimsiz komut satırı (cron, betikler)
+        from cli import main as cli_main
+        sys.exit(cli_main())
+    
     while True:
         try:
             main()
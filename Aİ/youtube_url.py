@@ -0,0 +1,60 @@
+"""
+YouTube URL yardımcıları
+Farklı URL biçimlerinden (watch, youtu.be, shorts, embed...) video ID'sini çıkarır
+"""
+import re
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+VIDEO_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+YOUTUBE_HOSTS = {
+    'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com',
+    'youtube-nocookie.com', 'www.youtube-nocookie.com',
+}
+
+# /shorts/ID, /embed/ID, /live/ID, /v/ID
+PATH_PREFIXES = ('shorts', 'embed', 'live', 'v')
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """
+    URL'den 11 karakterlik YouTube video ID'sini çıkarır
+
+    Args:
+        url: YouTube video URL'si veya doğrudan video ID'si
+
+    Returns:
+        Video ID'si, bulunamazsa None
+    """
+    if not url:
+        return None
+
+    url = url.strip()
+    if VIDEO_ID_RE.match(url):
+        return url
+
+    if '://' not in url:
+        url = 'https://' + url
+
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    parts = [part for part in parsed.path.split('/') if part]
+
+    candidate = None
+    if host == 'youtu.be':
+        candidate = parts[0] if parts else None
+    elif host in YOUTUBE_HOSTS:
+        if parts and parts[0] == 'watch':
+            candidate = parse_qs(parsed.query).get('v', [None])[0]
+        elif len(parts) >= 2 and parts[0] in PATH_PREFIXES:
+            candidate = parts[1]
+
+    if candidate and VIDEO_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+def video_url(video_id: str) -> str:
+    """Video ID'sinden standart izleme URL'si oluşturur"""
+    return f"https://www.youtube.com/watch?v={video_id}"